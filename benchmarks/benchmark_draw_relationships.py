@@ -0,0 +1,38 @@
+import csv
+from functools import cache
+from pathlib import Path
+from tempfile import mkdtemp
+
+from workspace.draw_relationships.draw_relationships import (
+    _calculate_hierarchical_positions,
+    _load_relationship_graph_csv,
+)
+
+_GROUP_COUNT = 2000
+_CHILDREN_PER_GROUP = 3
+
+
+@cache
+def _create_relationship_csv() -> Path:
+    csv_path = Path(mkdtemp()) / "relationships.csv"
+    with csv_path.open("w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(["usergroup", "subgroup"])
+        for parent_index in range(_GROUP_COUNT):
+            for child_offset in range(1, _CHILDREN_PER_GROUP + 1):
+                child_index = parent_index + child_offset
+                if child_index < _GROUP_COUNT:
+                    writer.writerow(
+                        [f"UG-{parent_index}", f"NT-{child_index}"]
+                    )
+
+    return csv_path
+
+
+def benchmark_load_relationship_graph_csv() -> None:
+    _load_relationship_graph_csv(_create_relationship_csv())
+
+
+def benchmark_calculate_hierarchical_positions() -> None:
+    graph = _load_relationship_graph_csv(_create_relationship_csv())
+    _calculate_hierarchical_positions(graph)
@@ -0,0 +1,14 @@
+from workspace.exhaustive_data_generator.exhaustive_data_generator import (
+    create_cartesian_df,
+)
+
+_COLUMN_VALUE_MAP = {
+    "status": ["active", "inactive", "vip", "banned"],
+    "priority": ["low", "middle", "high"],
+    "amount": list(range(100)),
+    "region": [f"region_{i}" for i in range(50)],
+}
+
+
+def benchmark_create_cartesian_df() -> None:
+    create_cartesian_df(_COLUMN_VALUE_MAP)
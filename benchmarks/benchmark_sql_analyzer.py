@@ -0,0 +1,101 @@
+from contextlib import redirect_stdout
+from functools import cache
+from io import StringIO
+from pathlib import Path
+from tempfile import mkdtemp
+
+from sqlglot import exp, parse_one
+
+from workspace.sql_analyzer.sql_analysis import (
+    analyze_case,
+    analyze_cte,
+    analyze_expression,
+    analyze_join,
+)
+from workspace.sql_analyzer.sql_analyzer import SQLAnalyzer
+from workspace.sql_analyzer.sql_lineage import extract_column_lineage
+from workspace.sql_analyzer.sql_parse_cache import ParseCache
+from workspace.sql_analyzer.sql_statement_stream import split_sql_statements
+
+_CTE_COUNT = 50
+_LARGE_CTE_COUNT = 1000
+_DUMP_STATEMENT_COUNT = 100_000
+
+
+def _create_sql(cte_count: int) -> str:
+    return (
+        "WITH "
+        + ",\n".join(
+            f"""
+        step_{i} AS (
+            SELECT
+                o.user_id AS id,
+                o.amount,
+                CASE
+                    WHEN u.status = 'active' AND o.amount > {i} THEN 'a'
+                    WHEN u.status = 'vip' THEN 'v'
+                    ELSE 'other'
+                END AS flag
+            FROM orders o
+            JOIN users u ON u.id = o.user_id
+            WHERE u.status IN ('active', 'vip') OR o.amount > {i}
+        )"""
+            for i in range(cte_count)
+        )
+        + "\nSELECT id, SUM(amount) AS total_amount FROM step_0 GROUP BY id"
+    )
+
+
+_SQL = _create_sql(_CTE_COUNT)
+_DUMP_SQL = (
+    b"INSERT INTO orders (id, note) VALUES (1, 'a;b', 'it''s'); -- c;\n"
+    * _DUMP_STATEMENT_COUNT
+)
+
+
+@cache
+def _parse_large_sql() -> exp.Expr:
+    return parse_one(_create_sql(_LARGE_CTE_COUNT))
+
+
+@cache
+def _open_parse_cache() -> ParseCache:
+    return ParseCache(Path(mkdtemp()) / "parse_cache.sqlite3")
+
+
+def benchmark_parse_sql() -> None:
+    SQLAnalyzer(_SQL)
+
+
+def benchmark_parse_sql_with_parse_cache() -> None:
+    SQLAnalyzer(_SQL, parse_cache=_open_parse_cache())
+
+
+def benchmark_analyze_sql() -> None:
+    analyzer = SQLAnalyzer(_SQL)
+    with redirect_stdout(StringIO()):
+        analyzer.analyze_ctes()
+        analyzer.analyze_joins()
+        analyzer.analyze_wheres()
+        analyzer.analyze_case_when()
+
+
+def benchmark_find_all_per_analysis_large_sql() -> None:
+    syntax_tree = _parse_large_sql()
+    [analyze_cte(cte) for cte in syntax_tree.find_all(exp.CTE)]
+    [analyze_join(join) for join in syntax_tree.find_all(exp.Join)]
+    [where.this.sql() for where in syntax_tree.find_all(exp.Where)]
+    [analyze_case(case) for case in syntax_tree.find_all(exp.Case)]
+
+
+def benchmark_single_pass_analysis_large_sql() -> None:
+    analyze_expression(_parse_large_sql())
+
+
+def benchmark_column_lineage_sql() -> None:
+    extract_column_lineage(parse_one(_SQL))
+
+
+def benchmark_split_sql_dump() -> None:
+    for _ in split_sql_statements(_DUMP_SQL, "postgres"):
+        pass
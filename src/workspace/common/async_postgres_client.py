@@ -0,0 +1,161 @@
+import asyncio
+from collections.abc import Sequence
+from types import TracebackType
+from typing import Self
+
+import psycopg2
+from psycopg2.extras import RealDictCursor, RealDictRow
+
+from workspace.common.async_postgres_pool import (
+    AsyncPostgresConnectionPool,
+    connect_async,
+    execute_async,
+)
+from workspace.common.postgres_settings import (
+    PostgresSettings,
+    load_postgres_settings,
+)
+
+
+class AsyncPostgresClient:
+    def __init__(
+        self,
+        settings: PostgresSettings,
+        *,
+        pool: AsyncPostgresConnectionPool | None = None,
+    ) -> None:
+        self._settings = settings
+        self._pool = pool
+        self._connection: psycopg2.extensions.connection | None = None
+        self._is_connection_broken = False
+
+    async def execute(self, sql: str, params: tuple = ()) -> None:
+        cursor = await self._execute(sql, params)
+        cursor.close()
+
+    async def executemany(self, sql: str, param_list: Sequence[tuple]) -> None:
+        for params in param_list:
+            await self.execute(sql, params)
+
+    async def fetchone(
+        self, sql: str, params: tuple = ()
+    ) -> RealDictRow | None:
+        cursor = await self._execute(sql, params)
+        try:
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+
+    async def fetchall(
+        self, sql: str, params: tuple = ()
+    ) -> list[RealDictRow]:
+        cursor = await self._execute(sql, params)
+        try:
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    async def _execute(
+        self, sql: str, params: tuple
+    ) -> psycopg2.extensions.cursor:
+        if self._connection is None:
+            raise RuntimeError(
+                "Database connection not established. "
+                "Use async context manager."
+            )
+
+        try:
+            return await execute_async(
+                self._connection, sql, params, cursor_factory=RealDictCursor
+            )
+        except asyncio.CancelledError:
+            self._is_connection_broken = True
+            self._connection.cancel()
+            raise
+
+    async def _connect(self) -> None:
+        if self._connection is not None:
+            return
+
+        if self._pool is None:
+            self._connection = await connect_async(
+                **self._settings.to_connection_params()
+            )
+        else:
+            self._connection = await self._pool.acquire()
+        self._is_connection_broken = False
+
+    async def _end_transaction(self, sql: str) -> None:
+        if self._connection is None or self._is_connection_broken:
+            return
+
+        try:
+            await self.execute(sql)
+        except psycopg2.Error:
+            self._is_connection_broken = True
+            raise
+
+    async def _close(self) -> None:
+        if self._connection is None:
+            return
+
+        connection, self._connection = self._connection, None
+        if self._pool is None:
+            connection.close()
+        else:
+            await self._pool.release(
+                connection, discard=self._is_connection_broken
+            )
+
+    async def __aenter__(self) -> Self:
+        await self._connect()
+        try:
+            await self.execute("BEGIN")
+        except BaseException:
+            self._is_connection_broken = True
+            await self._close()
+            raise
+        return self
+
+    async def __aexit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception_value: BaseException | None,
+        exception_traceback: TracebackType | None,
+    ) -> None:
+        try:
+            await self._end_transaction(
+                "ROLLBACK" if exception_type else "COMMIT"
+            )
+        finally:
+            await self._close()
+
+
+async def _how_to_use() -> None:
+    settings = load_postgres_settings()
+
+    async with AsyncPostgresConnectionPool.from_settings(
+        settings, max_size=4
+    ) as pool:
+
+        async def count_rows(table_name: str) -> RealDictRow | None:
+            async with AsyncPostgresClient(settings, pool=pool) as db:
+                return await db.fetchone(
+                    "SELECT %s AS table_name, count(*) FROM pg_class "
+                    "WHERE relname = %s",
+                    (table_name, table_name),
+                )
+
+        results = await asyncio.gather(
+            *(
+                count_rows(table_name)
+                for table_name in ("pg_class", "pg_type", "pg_proc")
+            )
+        )
+        for result in results:
+            print(result)
+        print(pool.metrics())
+
+
+if __name__ == "__main__":
+    asyncio.run(_how_to_use())
@@ -0,0 +1,307 @@
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from functools import partial
+from time import monotonic
+from types import TracebackType
+from typing import Any, Self
+
+import psycopg2
+from psycopg2.extensions import (
+    POLL_OK,
+    POLL_READ,
+    POLL_WRITE,
+    TRANSACTION_STATUS_IDLE,
+)
+
+from workspace.common.postgres_pool import PoolCounters, PoolMetrics
+from workspace.common.postgres_settings import PostgresSettings
+
+type AsyncConnectionFactory = Callable[
+    [], Awaitable[psycopg2.extensions.connection]
+]
+
+
+def _set_future_result(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+async def wait_until_ready(connection: psycopg2.extensions.connection) -> None:
+    loop = asyncio.get_running_loop()
+    while (poll_state := connection.poll()) != POLL_OK:
+        if poll_state not in (POLL_READ, POLL_WRITE):
+            raise psycopg2.OperationalError(
+                f"Unexpected connection poll state: {poll_state}"
+            )
+
+        future: asyncio.Future[None] = loop.create_future()
+        file_descriptor = connection.fileno()
+        if poll_state == POLL_READ:
+            loop.add_reader(file_descriptor, _set_future_result, future)
+        else:
+            loop.add_writer(file_descriptor, _set_future_result, future)
+        try:
+            await future
+        finally:
+            loop.remove_reader(file_descriptor)
+            loop.remove_writer(file_descriptor)
+
+
+async def connect_async(
+    **connection_params: Any,
+) -> psycopg2.extensions.connection:
+    connection = psycopg2.connect(**connection_params, async_=True)
+    try:
+        await wait_until_ready(connection)
+    except BaseException:
+        connection.close()
+        raise
+    return connection
+
+
+async def execute_async(
+    connection: psycopg2.extensions.connection,
+    sql: str,
+    params: tuple = (),
+    cursor_factory: type[psycopg2.extensions.cursor] | None = None,
+) -> psycopg2.extensions.cursor:
+    cursor = connection.cursor(cursor_factory=cursor_factory)
+    try:
+        cursor.execute(sql, params)
+        await wait_until_ready(connection)
+    except BaseException:
+        cursor.close()
+        raise
+    return cursor
+
+
+@dataclass
+class _AsyncPooledConnection:
+    connection: psycopg2.extensions.connection
+    created_at: float
+    last_used_at: float
+
+
+class AsyncPostgresConnectionPool:
+    def __init__(
+        self,
+        connection_factory: AsyncConnectionFactory,
+        *,
+        min_size: int = 1,
+        max_size: int = 10,
+        acquire_timeout_seconds: float = 30.0,
+        idle_timeout_seconds: float = 300.0,
+        max_lifetime_seconds: float = 3600.0,
+        health_check_idle_seconds: float = 5.0,
+        health_check_query: str = "SELECT 1",
+    ) -> None:
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError(
+                "Pool sizes must satisfy 0 <= min_size <= max_size and "
+                f"max_size >= 1: min_size={min_size}, max_size={max_size}"
+            )
+
+        self._connection_factory = connection_factory
+        self._min_size = min_size
+        self._max_size = max_size
+        self._acquire_timeout_seconds = acquire_timeout_seconds
+        self._idle_timeout_seconds = idle_timeout_seconds
+        self._max_lifetime_seconds = max_lifetime_seconds
+        self._health_check_idle_seconds = health_check_idle_seconds
+        self._health_check_query = health_check_query
+        self._semaphore = asyncio.Semaphore(max_size)
+        self._idle_connections: deque[_AsyncPooledConnection] = deque()
+        self._in_use_connections: dict[int, _AsyncPooledConnection] = {}
+        self._counters = PoolCounters()
+        self._closed = False
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: PostgresSettings,
+        *,
+        min_size: int = 1,
+        max_size: int = 10,
+        acquire_timeout_seconds: float = 30.0,
+        idle_timeout_seconds: float = 300.0,
+        max_lifetime_seconds: float = 3600.0,
+    ) -> Self:
+        return cls(
+            partial(connect_async, **settings.to_connection_params()),
+            min_size=min_size,
+            max_size=max_size,
+            acquire_timeout_seconds=acquire_timeout_seconds,
+            idle_timeout_seconds=idle_timeout_seconds,
+            max_lifetime_seconds=max_lifetime_seconds,
+        )
+
+    @property
+    def size(self) -> int:
+        return len(self._idle_connections) + len(self._in_use_connections)
+
+    async def open(self) -> None:
+        while self.size < self._min_size:
+            self._idle_connections.append(
+                await self._create_pooled_connection()
+            )
+
+    async def acquire(self) -> psycopg2.extensions.connection:
+        await self._acquire_permit()
+        try:
+            pooled_connection = await self._checkout()
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+        self._counters.acquire_count += 1
+        self._in_use_connections[id(pooled_connection.connection)] = (
+            pooled_connection
+        )
+        return pooled_connection.connection
+
+    async def release(
+        self,
+        connection: psycopg2.extensions.connection,
+        *,
+        discard: bool = False,
+    ) -> None:
+        pooled_connection = self._in_use_connections.pop(id(connection), None)
+        if pooled_connection is None:
+            raise ValueError("Connection was not acquired from this pool.")
+
+        if (
+            self._closed
+            or discard
+            or not self._is_returnable(pooled_connection)
+        ):
+            self._close_connection(pooled_connection)
+        else:
+            pooled_connection.last_used_at = monotonic()
+            self._idle_connections.append(pooled_connection)
+            self._prune_idle_connections()
+        self._semaphore.release()
+
+    def metrics(self) -> PoolMetrics:
+        return self._counters.to_metrics(
+            len(self._idle_connections), len(self._in_use_connections)
+        )
+
+    async def close(self) -> None:
+        self._closed = True
+        while self._idle_connections:
+            self._close_connection(self._idle_connections.popleft())
+
+    async def _acquire_permit(self) -> None:
+        if self._closed:
+            raise RuntimeError("Connection pool has been closed.")
+
+        wait_start_time = monotonic()
+        must_wait = self._semaphore.locked()
+        try:
+            async with asyncio.timeout(self._acquire_timeout_seconds):
+                await self._semaphore.acquire()
+        except TimeoutError:
+            self._counters.acquire_timeout_count += 1
+            raise TimeoutError(
+                "Timed out waiting for a pooled connection after "
+                f"{self._acquire_timeout_seconds} seconds."
+            ) from None
+
+        if must_wait:
+            self._counters.record_wait(monotonic() - wait_start_time)
+
+    async def _checkout(self) -> _AsyncPooledConnection:
+        while self._idle_connections:
+            pooled_connection = self._idle_connections.pop()
+            try:
+                is_reusable = await self._is_reusable(pooled_connection)
+            except BaseException:
+                self._close_connection(pooled_connection)
+                raise
+            if is_reusable:
+                return pooled_connection
+            self._close_connection(pooled_connection)
+
+        return await self._create_pooled_connection()
+
+    async def _create_pooled_connection(self) -> _AsyncPooledConnection:
+        connection = await self._connection_factory()
+        created_at = monotonic()
+        self._counters.created_count += 1
+        return _AsyncPooledConnection(
+            connection=connection,
+            created_at=created_at,
+            last_used_at=created_at,
+        )
+
+    def _has_exceeded_lifetime(
+        self, pooled_connection: _AsyncPooledConnection
+    ) -> bool:
+        return (
+            monotonic() - pooled_connection.created_at
+            >= self._max_lifetime_seconds
+        )
+
+    async def _is_reusable(
+        self, pooled_connection: _AsyncPooledConnection
+    ) -> bool:
+        if pooled_connection.connection.closed or self._has_exceeded_lifetime(
+            pooled_connection
+        ):
+            return False
+        if (
+            monotonic() - pooled_connection.last_used_at
+            < self._health_check_idle_seconds
+        ):
+            return True
+
+        try:
+            cursor = await execute_async(
+                pooled_connection.connection, self._health_check_query
+            )
+            cursor.close()
+        except psycopg2.Error:
+            self._counters.health_check_failure_count += 1
+            return False
+        return True
+
+    def _is_returnable(
+        self, pooled_connection: _AsyncPooledConnection
+    ) -> bool:
+        connection = pooled_connection.connection
+        return (
+            not connection.closed
+            and not connection.isexecuting()
+            and connection.get_transaction_status() == TRANSACTION_STATUS_IDLE
+            and not self._has_exceeded_lifetime(pooled_connection)
+        )
+
+    def _prune_idle_connections(self) -> None:
+        while self._idle_connections and self.size > self._min_size:
+            oldest_idle_connection = self._idle_connections[0]
+            if (
+                monotonic() - oldest_idle_connection.last_used_at
+                < self._idle_timeout_seconds
+            ):
+                return
+            self._close_connection(self._idle_connections.popleft())
+
+    def _close_connection(
+        self, pooled_connection: _AsyncPooledConnection
+    ) -> None:
+        self._counters.closed_count += 1
+        pooled_connection.connection.close()
+
+    async def __aenter__(self) -> Self:
+        await self.open()
+        return self
+
+    async def __aexit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception_value: BaseException | None,
+        exception_traceback: TracebackType | None,
+    ) -> None:
+        await self.close()
@@ -0,0 +1,457 @@
+import argparse
+import gc
+import importlib.util
+import json
+import platform
+import subprocess
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from inspect import getmembers, isfunction
+from math import sqrt
+from pathlib import Path
+from statistics import NormalDist, fmean, median, stdev
+from types import ModuleType
+from typing import Any
+
+from workspace.common.measure_performance import (
+    CallMeasurement,
+    measure_performance,
+)
+
+_DEFAULT_RESULTS_DIR = Path(".benchmarks")
+_BENCHMARK_FILE_PATTERN = "benchmark_*.py"
+_BENCHMARK_FUNCTION_PREFIX = "benchmark_"
+_COMPARED_METRIC_NAMES = ("wall_seconds", "cpu_seconds")
+_ROUND_DIGITS = 6
+_UNKNOWN_COMMIT = "unknown"
+_DIRTY_COMMIT_SUFFIX = "-dirty"
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    name: str
+    function: Callable[[], object]
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    name: str
+    samples: dict[str, list[float]]
+
+    def summarize(self) -> dict[str, dict[str, float]]:
+        return {
+            metric_name: _summarize_samples(metric_samples)
+            for metric_name, metric_samples in self.samples.items()
+        }
+
+
+@dataclass(frozen=True)
+class BenchmarkComparison:
+    name: str
+    metric_name: str
+    baseline_median: float
+    current_median: float
+    change_ratio: float
+    p_value: float
+    verdict: str
+
+
+def _summarize_samples(samples: Sequence[float]) -> dict[str, float]:
+    return {
+        "median": round(median(samples), _ROUND_DIGITS),
+        "mean": round(fmean(samples), _ROUND_DIGITS),
+        "stdev": round(stdev(samples), _ROUND_DIGITS)
+        if len(samples) > 1
+        else 0.0,
+        "min": round(min(samples), _ROUND_DIGITS),
+        "max": round(max(samples), _ROUND_DIGITS),
+    }
+
+
+def _import_benchmark_module(benchmark_file_path: Path) -> ModuleType:
+    module_name = f"_benchmark_{benchmark_file_path.stem}"
+    module_spec = importlib.util.spec_from_file_location(
+        module_name, benchmark_file_path
+    )
+    if module_spec is None or module_spec.loader is None:
+        raise ImportError(
+            f"Cannot import benchmark file: {benchmark_file_path}"
+        )
+
+    benchmark_module = importlib.util.module_from_spec(module_spec)
+    module_spec.loader.exec_module(benchmark_module)
+    return benchmark_module
+
+
+def _find_benchmark_files(paths: Iterable[Path]) -> list[Path]:
+    benchmark_file_paths: list[Path] = []
+    for path in paths:
+        if path.is_dir():
+            benchmark_file_paths.extend(
+                sorted(path.rglob(_BENCHMARK_FILE_PATTERN))
+            )
+        else:
+            benchmark_file_paths.append(path)
+
+    return benchmark_file_paths
+
+
+def discover_benchmarks(paths: Iterable[Path]) -> list[BenchmarkCase]:
+    benchmark_cases: list[BenchmarkCase] = []
+    for benchmark_file_path in _find_benchmark_files(paths):
+        benchmark_module = _import_benchmark_module(benchmark_file_path)
+        for function_name, function in getmembers(
+            benchmark_module, isfunction
+        ):
+            if not function_name.startswith(_BENCHMARK_FUNCTION_PREFIX):
+                continue
+            if function.__module__ != benchmark_module.__name__:
+                continue
+            benchmark_cases.append(
+                BenchmarkCase(
+                    name=f"{benchmark_file_path.stem}.{function_name}",
+                    function=function,
+                )
+            )
+
+    return benchmark_cases
+
+
+def _extract_timing_samples(measurement: CallMeasurement) -> dict[str, float]:
+    return {
+        "wall_seconds": measurement.elapsed_wall_seconds,
+        "cpu_seconds": measurement.cpu_seconds,
+    }
+
+
+def _extract_memory_samples(measurement: CallMeasurement) -> dict[str, float]:
+    metric_samples: dict[str, float] = {
+        metric_name: float(metric_value)
+        for metric_name, metric_value in (
+            measurement.process_metrics.memory_info.items()
+        )
+    }
+    if measurement.process_metrics.io_counters is not None:
+        metric_samples.update(
+            {
+                f"io_{metric_name}": float(metric_value)
+                for metric_name, metric_value in (
+                    measurement.process_metrics.io_counters.items()
+                )
+            }
+        )
+    if measurement.tracemalloc_metrics is not None:
+        metric_samples.update(
+            {
+                f"tracemalloc_{metric_name}": metric_value
+                for metric_name, metric_value in (
+                    measurement.tracemalloc_metrics.items()
+                )
+            }
+        )
+
+    return metric_samples
+
+
+def _collect_samples(
+    function: Callable[[], object],
+    repetitions: int,
+    extract_samples: Callable[[CallMeasurement], dict[str, float]],
+    *,
+    enable_tracemalloc: bool,
+    enable_unique_set_size: bool,
+) -> dict[str, list[float]]:
+    measurements: list[CallMeasurement] = []
+    measured_function = measure_performance(
+        enable_tracemalloc=enable_tracemalloc,
+        enable_unique_set_size=enable_unique_set_size,
+        measurement_handler=measurements.append,
+    )(function)
+    for _ in range(repetitions):
+        gc.collect()
+        measured_function()
+
+    samples: dict[str, list[float]] = {}
+    for measurement in measurements:
+        for metric_name, metric_value in extract_samples(measurement).items():
+            samples.setdefault(metric_name, []).append(metric_value)
+
+    return samples
+
+
+def run_benchmark(
+    benchmark_case: BenchmarkCase,
+    *,
+    warmup_rounds: int,
+    repetitions: int,
+    memory_repetitions: int = 1,
+    enable_tracemalloc: bool = False,
+) -> BenchmarkResult:
+    if repetitions < 1:
+        raise ValueError(f"repetitions must be positive: {repetitions}")
+    if memory_repetitions < 0:
+        raise ValueError(
+            f"memory_repetitions must not be negative: {memory_repetitions}"
+        )
+
+    for _ in range(warmup_rounds):
+        benchmark_case.function()
+
+    samples = _collect_samples(
+        benchmark_case.function,
+        repetitions,
+        _extract_timing_samples,
+        enable_tracemalloc=False,
+        enable_unique_set_size=False,
+    )
+    samples.update(
+        _collect_samples(
+            benchmark_case.function,
+            memory_repetitions,
+            _extract_memory_samples,
+            enable_tracemalloc=enable_tracemalloc,
+            enable_unique_set_size=True,
+        )
+    )
+
+    return BenchmarkResult(name=benchmark_case.name, samples=samples)
+
+
+def _run_git(repository_dir: Path, *git_arguments: str) -> str:
+    completed_process = subprocess.run(
+        ["git", *git_arguments],
+        cwd=repository_dir,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return completed_process.stdout.strip()
+
+
+def get_git_commit(repository_dir: Path) -> str:
+    try:
+        commit = _run_git(repository_dir, "rev-parse", "HEAD")
+        working_tree_status = _run_git(repository_dir, "status", "--porcelain")
+    except (OSError, subprocess.CalledProcessError):
+        return _UNKNOWN_COMMIT
+    return f"{commit}{_DIRTY_COMMIT_SUFFIX}" if working_tree_status else commit
+
+
+def save_results(
+    benchmark_results: Sequence[BenchmarkResult],
+    results_dir: Path,
+    commit: str,
+) -> Path:
+    results_payload = {
+        "commit": commit,
+        "created_at": datetime.now(UTC).isoformat(),
+        "python_version": platform.python_version(),
+        "benchmarks": {
+            benchmark_result.name: {
+                "summary": benchmark_result.summarize(),
+                "samples": benchmark_result.samples,
+            }
+            for benchmark_result in benchmark_results
+        },
+    }
+
+    results_dir.mkdir(parents=True, exist_ok=True)
+    results_path = results_dir / f"{commit}.json"
+    results_path.write_text(
+        json.dumps(results_payload, indent=2), encoding="utf-8"
+    )
+    return results_path
+
+
+def load_results(results_path: Path) -> list[BenchmarkResult]:
+    results_payload: dict[str, Any] = json.loads(
+        results_path.read_text(encoding="utf-8")
+    )
+    return [
+        BenchmarkResult(name=name, samples=benchmark_payload["samples"])
+        for name, benchmark_payload in results_payload["benchmarks"].items()
+    ]
+
+
+def _rank_with_ties(values: Sequence[float]) -> tuple[list[float], float]:
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    tie_correction = 0.0
+    start_index = 0
+    while start_index < len(order):
+        end_index = start_index
+        while (
+            end_index + 1 < len(order)
+            and values[order[end_index + 1]] == values[order[start_index]]
+        ):
+            end_index += 1
+        average_rank = (start_index + end_index) / 2 + 1
+        for sorted_index in range(start_index, end_index + 1):
+            ranks[order[sorted_index]] = average_rank
+        tie_count = end_index - start_index + 1
+        tie_correction += tie_count**3 - tie_count
+        start_index = end_index + 1
+
+    return ranks, tie_correction
+
+
+def mann_whitney_u_p_value(
+    baseline_samples: Sequence[float], current_samples: Sequence[float]
+) -> float:
+    baseline_count = len(baseline_samples)
+    current_count = len(current_samples)
+    total_count = baseline_count + current_count
+    if baseline_count == 0 or current_count == 0:
+        raise ValueError("Both sample groups must be non-empty.")
+
+    ranks, tie_correction = _rank_with_ties(
+        [*baseline_samples, *current_samples]
+    )
+    baseline_u = (
+        sum(ranks[:baseline_count]) - baseline_count * (baseline_count + 1) / 2
+    )
+    mean_u = baseline_count * current_count / 2
+    variance_u = (
+        baseline_count
+        * current_count
+        / 12
+        * (
+            total_count
+            + 1
+            - tie_correction / (total_count * (total_count - 1))
+        )
+    )
+    if variance_u <= 0:
+        return 1.0
+
+    z_score = max(abs(baseline_u - mean_u) - 0.5, 0.0) / sqrt(variance_u)
+    return min(2 * (1 - NormalDist().cdf(z_score)), 1.0)
+
+
+def _decide_verdict(
+    change_ratio: float,
+    p_value: float,
+    significance_level: float,
+    minimum_change_ratio: float,
+) -> str:
+    if p_value >= significance_level or abs(change_ratio) < (
+        minimum_change_ratio
+    ):
+        return "unchanged"
+
+    return "regressed" if change_ratio > 0 else "improved"
+
+
+def _compare_metric(
+    name: str,
+    metric_name: str,
+    baseline_samples: Sequence[float],
+    current_samples: Sequence[float],
+    significance_level: float,
+    minimum_change_ratio: float,
+) -> BenchmarkComparison:
+    baseline_median = median(baseline_samples)
+    current_median = median(current_samples)
+    change_ratio = (
+        (current_median - baseline_median) / baseline_median
+        if baseline_median
+        else 0.0
+    )
+    p_value = mann_whitney_u_p_value(baseline_samples, current_samples)
+
+    return BenchmarkComparison(
+        name=name,
+        metric_name=metric_name,
+        baseline_median=baseline_median,
+        current_median=current_median,
+        change_ratio=change_ratio,
+        p_value=p_value,
+        verdict=_decide_verdict(
+            change_ratio, p_value, significance_level, minimum_change_ratio
+        ),
+    )
+
+
+def compare_to_baseline(
+    current_results: Sequence[BenchmarkResult],
+    baseline_results: Sequence[BenchmarkResult],
+    *,
+    significance_level: float = 0.05,
+    minimum_change_ratio: float = 0.05,
+) -> list[BenchmarkComparison]:
+    baseline_samples_by_name = {
+        baseline_result.name: baseline_result.samples
+        for baseline_result in baseline_results
+    }
+
+    return [
+        _compare_metric(
+            current_result.name,
+            metric_name,
+            baseline_samples_by_name[current_result.name][metric_name],
+            current_result.samples[metric_name],
+            significance_level,
+            minimum_change_ratio,
+        )
+        for current_result in current_results
+        if current_result.name in baseline_samples_by_name
+        for metric_name in _COMPARED_METRIC_NAMES
+    ]
+
+
+def _print_comparisons(comparisons: Sequence[BenchmarkComparison]) -> None:
+    for comparison in comparisons:
+        print(
+            f"{comparison.verdict:>9} {comparison.name} "
+            f"[{comparison.metric_name}] "
+            f"{comparison.baseline_median:.6f} -> "
+            f"{comparison.current_median:.6f} "
+            f"({comparison.change_ratio:+.1%}, p={comparison.p_value:.4f})"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("paths", type=Path, nargs="+")
+    parser.add_argument(
+        "--results-dir", type=Path, default=_DEFAULT_RESULTS_DIR
+    )
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--warmup-rounds", type=int, default=3)
+    parser.add_argument("--repetitions", type=int, default=20)
+    parser.add_argument("--memory-repetitions", type=int, default=1)
+    parser.add_argument("--enable-tracemalloc", action="store_true")
+    parser.add_argument("--significance-level", type=float, default=0.05)
+    args = parser.parse_args()
+
+    benchmark_results = [
+        run_benchmark(
+            benchmark_case,
+            warmup_rounds=args.warmup_rounds,
+            repetitions=args.repetitions,
+            memory_repetitions=args.memory_repetitions,
+            enable_tracemalloc=args.enable_tracemalloc,
+        )
+        for benchmark_case in discover_benchmarks(args.paths)
+    ]
+    results_path = save_results(
+        benchmark_results, args.results_dir, get_git_commit(Path.cwd())
+    )
+    print(f"Saved benchmark results: {results_path}")
+
+    if args.baseline is None:
+        return
+
+    comparisons = compare_to_baseline(
+        benchmark_results,
+        load_results(args.baseline),
+        significance_level=args.significance_level,
+    )
+    _print_comparisons(comparisons)
+    if any(comparison.verdict == "regressed" for comparison in comparisons):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
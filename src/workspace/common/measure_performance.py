@@ -1,20 +1,55 @@
 import json
 import logging
+import os
 import tracemalloc
-from collections.abc import Callable
+from collections.abc import Callable, Coroutine, Generator
+from contextvars import Token
 from dataclasses import dataclass
-from functools import wraps
-from time import perf_counter, process_time
-from typing import Any, ParamSpec, Protocol, TypeVar, cast
+from functools import lru_cache, wraps
+from inspect import iscoroutinefunction
+from itertools import count
+from pathlib import Path
+from random import random
+from threading import get_native_id
+from time import perf_counter, process_time, thread_time
+from typing import Any, Literal, ParamSpec, Protocol, TypeVar, cast, get_args
 
 import psutil
 
+from workspace.common.performance_trace import (
+    PerformanceSpan,
+    TraceHandler,
+    close_span,
+    has_current_span,
+    open_span,
+)
+from workspace.common.resource_sampler import (
+    ResourceSampler,
+    ResourceSamplingReport,
+)
+
 _BYTES_PER_MIB = 1024**2
 _ROUND_DIGITS = 3
+_CONTAMINATION_CPU_TOLERANCE_SECONDS = 0.001
+_THREAD_IO_FIELD_NAMES = {
+    "read_bytes": "read_bytes",
+    "write_bytes": "write_bytes",
+    "syscr": "read_count",
+    "syscw": "write_count",
+}
+_CONTAMINATION_IO_METRIC_NAMES = ("read_mib", "write_mib")
+_ALLOCATION_SITE_TRACEBACK_FRAME_LIMIT = 10
+_ALLOCATION_SITE_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
 _LOGGER = logging.getLogger(__name__)
 
 Parameters = ParamSpec("Parameters")
 ReturnType = TypeVar("ReturnType")
+AllocationSiteGroupBy = Literal["filename", "lineno", "traceback"]
 
 
 class ProcessMemoryInfo(Protocol):
@@ -42,12 +77,35 @@ class ProcessSnapshot:
     process_io_counters: ProcessIOCounters | None
 
 
+@dataclass(frozen=True)
+class ThreadIOCounters:
+    read_bytes: int
+    write_bytes: int
+    read_count: int
+    write_count: int
+
+
+@dataclass(frozen=True)
+class ThreadSnapshot:
+    native_thread_id: int
+    thread_io_counters: ThreadIOCounters | None
+
+
 @dataclass(frozen=True)
 class ProcessMetrics:
     memory_info: dict[str, float]
     io_counters: dict[str, float | int] | None
 
 
+@dataclass(frozen=True)
+class ThreadMetrics:
+    native_thread_id: int
+    cpu_seconds: float
+    io_counters: dict[str, float | int] | None
+    other_threads_cpu_seconds: float
+    is_process_wide_contaminated: bool
+
+
 @dataclass(frozen=True)
 class TracemallocState:
     is_tracing: bool
@@ -55,6 +113,60 @@ class TracemallocState:
     initial_peak_bytes: int
 
 
+@dataclass(frozen=True)
+class MeasurementStart:
+    start_time: float
+    start_cpu_time: float
+    start_thread_cpu_time: float
+    process_snapshot: ProcessSnapshot
+    thread_snapshot: ThreadSnapshot
+    tracemalloc_state: TracemallocState | None
+    allocation_site_snapshot: tracemalloc.Snapshot | None
+    resource_sampler: ResourceSampler | None
+    span: PerformanceSpan | None
+    span_token: Token[PerformanceSpan | None] | None
+
+
+@dataclass
+class CoroutineTiming:
+    running_wall_seconds: float = 0.0
+    running_cpu_seconds: float = 0.0
+    step_count: int = 0
+
+    def record_step(self, wall_seconds: float, cpu_seconds: float) -> None:
+        self.running_wall_seconds += wall_seconds
+        self.running_cpu_seconds += cpu_seconds
+        self.step_count += 1
+
+
+@dataclass(frozen=True)
+class CallMeasurement:
+    function_name: str
+    status: str
+    elapsed_wall_seconds: float
+    cpu_seconds: float
+    process_metrics: ProcessMetrics
+    tracemalloc_metrics: dict[str, float] | None
+    suspended_seconds: float | None = None
+    thread_metrics: ThreadMetrics | None = None
+    allocation_sites: dict[str, list[dict[str, Any]]] | None = None
+    resource_sampling: ResourceSamplingReport | None = None
+
+
+MeasurementHandler = Callable[[CallMeasurement], None]
+
+
+@dataclass(frozen=True)
+class MeasurementOptions:
+    enable_tracemalloc: bool
+    enable_unique_set_size: bool
+    measurement_handler: MeasurementHandler
+    trace_handler: TraceHandler | None
+    top_allocation_site_count: int = 0
+    allocation_site_group_by: AllocationSiteGroupBy = "lineno"
+    resource_sampling_interval_seconds: float | None = None
+
+
 def _call_psutil_process_method_safely[PsutilResult](
     process_method: Callable[[], PsutilResult],
 ) -> PsutilResult | None:
@@ -66,28 +178,45 @@ def _call_psutil_process_method_safely[PsutilResult](
         return None
 
 
-def _capture_process_snapshot() -> ProcessSnapshot:
-    psutil_process = psutil.Process()
+@lru_cache(maxsize=1)
+def _get_psutil_process(process_id: int) -> psutil.Process:
+    return psutil.Process()
 
-    process_memory_info = _call_psutil_process_method_safely(
-        cast(Callable[[], ProcessMemoryInfo], psutil_process.memory_info)
-    )
-    resident_set_size_bytes = (
-        process_memory_info.rss if process_memory_info else 0
-    )
 
+def _capture_unique_set_size_bytes(
+    psutil_process: psutil.Process,
+) -> float | None:
     process_memory_full_info = _call_psutil_process_method_safely(
         cast(
             Callable[[], ProcessMemoryFullInfo],
             psutil_process.memory_full_info,
         )
     )
-    unique_set_size_bytes = (
+    return (
         float(process_memory_full_info.uss)
         if process_memory_full_info is not None
         else None
     )
 
+
+def _capture_process_snapshot(
+    *, include_unique_set_size: bool
+) -> ProcessSnapshot:
+    psutil_process = _get_psutil_process(os.getpid())
+
+    process_memory_info = _call_psutil_process_method_safely(
+        cast(Callable[[], ProcessMemoryInfo], psutil_process.memory_info)
+    )
+    resident_set_size_bytes = (
+        process_memory_info.rss if process_memory_info else 0
+    )
+
+    unique_set_size_bytes = (
+        _capture_unique_set_size_bytes(psutil_process)
+        if include_unique_set_size
+        else None
+    )
+
     process_io_counters = _call_psutil_process_method_safely(
         cast(
             Callable[[], ProcessIOCounters],
@@ -131,19 +260,13 @@ def _build_psutil_memory_metrics(
     return psutil_memory_metrics
 
 
-def _build_io_metrics(
-    before_process_snapshot: ProcessSnapshot,
-    after_process_snapshot: ProcessSnapshot,
+def _build_io_counter_deltas(
+    before_io_counters: ProcessIOCounters | ThreadIOCounters | None,
+    after_io_counters: ProcessIOCounters | ThreadIOCounters | None,
 ) -> dict[str, float | int] | None:
-    if (
-        before_process_snapshot.process_io_counters is None
-        or after_process_snapshot.process_io_counters is None
-    ):
+    if before_io_counters is None or after_io_counters is None:
         return None
 
-    before_io_counters = before_process_snapshot.process_io_counters
-    after_io_counters = after_process_snapshot.process_io_counters
-
     return {
         "read_mib": round(
             (after_io_counters.read_bytes - before_io_counters.read_bytes)
@@ -164,6 +287,16 @@ def _build_io_metrics(
     }
 
 
+def _build_io_metrics(
+    before_process_snapshot: ProcessSnapshot,
+    after_process_snapshot: ProcessSnapshot,
+) -> dict[str, float | int] | None:
+    return _build_io_counter_deltas(
+        before_process_snapshot.process_io_counters,
+        after_process_snapshot.process_io_counters,
+    )
+
+
 def _build_process_metrics(
     before_snapshot: ProcessSnapshot, after_snapshot: ProcessSnapshot
 ) -> ProcessMetrics:
@@ -178,6 +311,78 @@ def _build_process_metrics(
     )
 
 
+def _capture_thread_io_counters(
+    native_thread_id: int,
+) -> ThreadIOCounters | None:
+    thread_io_path = Path(f"/proc/self/task/{native_thread_id}/io")
+    try:
+        thread_io_text = thread_io_path.read_text()
+    except OSError as exception:
+        _LOGGER.debug(f"Failed to read {thread_io_path}: {exception}")
+        return None
+
+    thread_io_values: dict[str, int] = {}
+    for thread_io_line in thread_io_text.splitlines():
+        field_name, _, field_value = thread_io_line.partition(":")
+        if field_name in _THREAD_IO_FIELD_NAMES:
+            thread_io_values[_THREAD_IO_FIELD_NAMES[field_name]] = int(
+                field_value
+            )
+
+    return ThreadIOCounters(**thread_io_values)
+
+
+def _capture_thread_snapshot() -> ThreadSnapshot:
+    native_thread_id = get_native_id()
+    return ThreadSnapshot(
+        native_thread_id=native_thread_id,
+        thread_io_counters=_capture_thread_io_counters(native_thread_id),
+    )
+
+
+def _is_process_io_contaminated(
+    process_io_metrics: dict[str, float | int] | None,
+    thread_io_metrics: dict[str, float | int] | None,
+) -> bool:
+    if process_io_metrics is None or thread_io_metrics is None:
+        return False
+
+    return any(
+        process_io_metrics[metric_name] != thread_io_metrics[metric_name]
+        for metric_name in _CONTAMINATION_IO_METRIC_NAMES
+    )
+
+
+def _build_thread_metrics(
+    before_thread_snapshot: ThreadSnapshot,
+    after_thread_snapshot: ThreadSnapshot,
+    thread_cpu_seconds: float,
+    process_cpu_seconds: float,
+    process_metrics: ProcessMetrics,
+) -> ThreadMetrics:
+    thread_io_metrics = _build_io_counter_deltas(
+        before_thread_snapshot.thread_io_counters,
+        after_thread_snapshot.thread_io_counters,
+    )
+    other_threads_cpu_seconds = max(
+        process_cpu_seconds - thread_cpu_seconds, 0.0
+    )
+    is_process_wide_contaminated = (
+        other_threads_cpu_seconds > _CONTAMINATION_CPU_TOLERANCE_SECONDS
+        or _is_process_io_contaminated(
+            process_metrics.io_counters, thread_io_metrics
+        )
+    )
+
+    return ThreadMetrics(
+        native_thread_id=after_thread_snapshot.native_thread_id,
+        cpu_seconds=thread_cpu_seconds,
+        io_counters=thread_io_metrics,
+        other_threads_cpu_seconds=other_threads_cpu_seconds,
+        is_process_wide_contaminated=is_process_wide_contaminated,
+    )
+
+
 def _initialize_tracemalloc_capture() -> TracemallocState:
     is_tracing = tracemalloc.is_tracing()
     if not is_tracing:
@@ -222,115 +427,563 @@ def _finalize_tracemalloc_capture(
     return metrics
 
 
-def _create_log_payload(
+def _capture_allocation_site_snapshot(
+    allocation_site_group_by: AllocationSiteGroupBy,
+) -> tracemalloc.Snapshot:
+    if not tracemalloc.is_tracing():
+        traceback_frame_limit = (
+            _ALLOCATION_SITE_TRACEBACK_FRAME_LIMIT
+            if allocation_site_group_by == "traceback"
+            else 1
+        )
+        tracemalloc.start(traceback_frame_limit)
+
+    return tracemalloc.take_snapshot().filter_traces(
+        _ALLOCATION_SITE_SNAPSHOT_FILTERS
+    )
+
+
+def _format_allocation_site(
+    statistic_diff: tracemalloc.StatisticDiff,
+    allocation_site_group_by: AllocationSiteGroupBy,
+) -> dict[str, Any]:
+    most_recent_frame = statistic_diff.traceback[-1]
+    site = (
+        most_recent_frame.filename
+        if allocation_site_group_by == "filename"
+        else f"{most_recent_frame.filename}:{most_recent_frame.lineno}"
+    )
+    allocation_site: dict[str, Any] = {
+        "site": site,
+        "size_delta_bytes": statistic_diff.size_diff,
+        "count_delta": statistic_diff.count_diff,
+        "size_bytes": statistic_diff.size,
+        "count": statistic_diff.count,
+    }
+    if allocation_site_group_by == "traceback":
+        allocation_site["traceback"] = [
+            f"{frame.filename}:{frame.lineno}"
+            for frame in statistic_diff.traceback
+        ]
+
+    return allocation_site
+
+
+def _build_allocation_site_report(
+    before_snapshot: tracemalloc.Snapshot,
+    top_allocation_site_count: int,
+    allocation_site_group_by: AllocationSiteGroupBy,
+) -> dict[str, list[dict[str, Any]]]:
+    after_snapshot = tracemalloc.take_snapshot().filter_traces(
+        _ALLOCATION_SITE_SNAPSHOT_FILTERS
+    )
+    statistic_diffs = after_snapshot.compare_to(
+        before_snapshot, allocation_site_group_by
+    )
+
+    top_by_size = sorted(
+        (
+            statistic_diff
+            for statistic_diff in statistic_diffs
+            if statistic_diff.size_diff > 0
+        ),
+        key=lambda statistic_diff: statistic_diff.size_diff,
+        reverse=True,
+    )[:top_allocation_site_count]
+    top_by_count = sorted(
+        (
+            statistic_diff
+            for statistic_diff in statistic_diffs
+            if statistic_diff.count_diff > 0
+        ),
+        key=lambda statistic_diff: statistic_diff.count_diff,
+        reverse=True,
+    )[:top_allocation_site_count]
+
+    return {
+        "by_size": [
+            _format_allocation_site(statistic_diff, allocation_site_group_by)
+            for statistic_diff in top_by_size
+        ],
+        "by_count": [
+            _format_allocation_site(statistic_diff, allocation_site_group_by)
+            for statistic_diff in top_by_count
+        ],
+    }
+
+
+def _start_measurement(
+    wrapped_function_name: str,
+    measurement_options: MeasurementOptions,
+) -> MeasurementStart:
+    start_time = perf_counter()
+    start_cpu_time = process_time()
+    start_thread_cpu_time = thread_time()
+
+    process_snapshot = _capture_process_snapshot(
+        include_unique_set_size=measurement_options.enable_unique_set_size
+    )
+    thread_snapshot = _capture_thread_snapshot()
+    allocation_site_snapshot: tracemalloc.Snapshot | None = None
+    if measurement_options.top_allocation_site_count > 0:
+        allocation_site_snapshot = _capture_allocation_site_snapshot(
+            measurement_options.allocation_site_group_by
+        )
+    tracemalloc_state: TracemallocState | None = None
+    if measurement_options.enable_tracemalloc:
+        tracemalloc_state = _initialize_tracemalloc_capture()
+    resource_sampler: ResourceSampler | None = None
+    if measurement_options.resource_sampling_interval_seconds is not None:
+        resource_sampler = ResourceSampler(
+            interval_seconds=(
+                measurement_options.resource_sampling_interval_seconds
+            )
+        )
+        resource_sampler.start()
+    span, span_token = (
+        open_span(wrapped_function_name, start_time)
+        if measurement_options.trace_handler is not None or has_current_span()
+        else (None, None)
+    )
+
+    return MeasurementStart(
+        start_time=start_time,
+        start_cpu_time=start_cpu_time,
+        start_thread_cpu_time=start_thread_cpu_time,
+        process_snapshot=process_snapshot,
+        thread_snapshot=thread_snapshot,
+        tracemalloc_state=tracemalloc_state,
+        allocation_site_snapshot=allocation_site_snapshot,
+        resource_sampler=resource_sampler,
+        span=span,
+        span_token=span_token,
+    )
+
+
+def _finish_measurement(
     wrapped_function_name: str,
     status: str,
-    before_process_snapshot: ProcessSnapshot,
-    after_process_snapshot: ProcessSnapshot,
-    tracemalloc_state: TracemallocState | None,
-    start_time: float,
-    start_cpu_time: float,
-) -> dict[str, Any]:
-    elapsed_time = perf_counter() - start_time
-    elapsed_cpu_time = process_time() - start_cpu_time
+    measurement_start: MeasurementStart,
+    measurement_options: MeasurementOptions,
+    coroutine_timing: CoroutineTiming | None = None,
+) -> CallMeasurement:
+    resource_sampling: ResourceSamplingReport | None = None
+    if measurement_start.resource_sampler is not None:
+        resource_sampling = measurement_start.resource_sampler.stop()
+
+    after_process_snapshot = _capture_process_snapshot(
+        include_unique_set_size=measurement_options.enable_unique_set_size
+    )
+    after_thread_snapshot = _capture_thread_snapshot()
+    elapsed_time = perf_counter() - measurement_start.start_time
+    elapsed_cpu_time = process_time() - measurement_start.start_cpu_time
+    process_cpu_time = elapsed_cpu_time
+    thread_cpu_time = thread_time() - measurement_start.start_thread_cpu_time
+
+    suspended_seconds: float | None = None
+    if coroutine_timing is not None:
+        elapsed_cpu_time = coroutine_timing.running_cpu_seconds
+        thread_cpu_time = coroutine_timing.running_cpu_seconds
+        suspended_seconds = max(
+            elapsed_time - coroutine_timing.running_wall_seconds, 0.0
+        )
+
+    tracemalloc_metrics: dict[str, float] | None = None
+    if measurement_start.tracemalloc_state is not None:
+        tracemalloc_metrics = _finalize_tracemalloc_capture(
+            measurement_start.tracemalloc_state
+        )
+
+    allocation_sites: dict[str, list[dict[str, Any]]] | None = None
+    if measurement_start.allocation_site_snapshot is not None:
+        allocation_sites = _build_allocation_site_report(
+            measurement_start.allocation_site_snapshot,
+            measurement_options.top_allocation_site_count,
+            measurement_options.allocation_site_group_by,
+        )
+
+    process_metrics = _build_process_metrics(
+        measurement_start.process_snapshot, after_process_snapshot
+    )
+
+    return CallMeasurement(
+        function_name=wrapped_function_name,
+        status=status,
+        elapsed_wall_seconds=elapsed_time,
+        cpu_seconds=elapsed_cpu_time,
+        process_metrics=process_metrics,
+        tracemalloc_metrics=tracemalloc_metrics,
+        suspended_seconds=suspended_seconds,
+        thread_metrics=_build_thread_metrics(
+            measurement_start.thread_snapshot,
+            after_thread_snapshot,
+            thread_cpu_time,
+            process_cpu_time,
+            process_metrics,
+        ),
+        allocation_sites=allocation_sites,
+        resource_sampling=resource_sampling,
+    )
+
+
+def _close_measurement_span(
+    measurement: CallMeasurement,
+    measurement_start: MeasurementStart,
+    measurement_options: MeasurementOptions,
+) -> None:
+    if measurement_start.span is None or measurement_start.span_token is None:
+        return
+
+    span_cpu_seconds = (
+        measurement.thread_metrics.cpu_seconds
+        if measurement.thread_metrics is not None
+        else measurement.cpu_seconds
+    )
+    span_allocated_mib = (
+        measurement.tracemalloc_metrics.get("allocated_delta_mib")
+        if measurement.tracemalloc_metrics is not None
+        else None
+    )
+    close_span(
+        measurement_start.span,
+        measurement_start.span_token,
+        status=measurement.status,
+        wall_seconds=measurement.elapsed_wall_seconds,
+        cpu_seconds=span_cpu_seconds,
+        allocated_mib=span_allocated_mib,
+    )
+    if (
+        measurement_start.span.parent is None
+        and measurement_options.trace_handler is not None
+    ):
+        measurement_options.trace_handler(measurement_start.span)
+
+
+def _report_measurement(
+    measurement: CallMeasurement,
+    measurement_start: MeasurementStart,
+    measurement_options: MeasurementOptions,
+) -> None:
+    _close_measurement_span(
+        measurement, measurement_start, measurement_options
+    )
+    measurement_options.measurement_handler(measurement)
+
+
+def _create_log_payload(measurement: CallMeasurement) -> dict[str, Any]:
+    elapsed_time = measurement.elapsed_wall_seconds
+    elapsed_cpu_time = measurement.cpu_seconds
     io_wait_seconds = max(elapsed_time - elapsed_cpu_time, 0.0)
 
     cpu_utilization_percent = (
         (elapsed_cpu_time / elapsed_time * 100.0) if elapsed_time else 0.0
     )
 
-    process_metrics = _build_process_metrics(
-        before_process_snapshot, after_process_snapshot
-    )
-
     processing_time_payload = {
         "elapsed_wall_seconds": round(elapsed_time, _ROUND_DIGITS),
         "cpu_seconds": round(elapsed_cpu_time, _ROUND_DIGITS),
         "io_wait_seconds": round(io_wait_seconds, _ROUND_DIGITS),
     }
+    if measurement.suspended_seconds is not None:
+        processing_time_payload["suspended_seconds"] = round(
+            measurement.suspended_seconds, _ROUND_DIGITS
+        )
 
     io_payload: dict[str, float | int | str] = {}
-    if process_metrics.io_counters is not None:
-        io_payload.update(process_metrics.io_counters)
+    if measurement.process_metrics.io_counters is not None:
+        io_payload.update(measurement.process_metrics.io_counters)
 
     if not io_payload:
         io_payload["metrics"] = "unavailable"
 
-    memory_payload: dict[str, dict[str, float]] = {
-        "psutil": process_metrics.memory_info
+    log_payload = {
+        "function": measurement.function_name,
+        "status": measurement.status,
+        "processing_time": processing_time_payload,
+        "cpu": {"utilization_percent": round(cpu_utilization_percent, 1)},
+        "memory": _create_memory_log_payload(measurement),
+        "io": io_payload,
+    }
+    if measurement.resource_sampling is not None:
+        log_payload["resource_sampling"] = (
+            measurement.resource_sampling.to_dict()
+        )
+    if measurement.thread_metrics is not None:
+        log_payload.update(
+            _create_thread_log_payload(measurement.thread_metrics)
+        )
+
+    return log_payload
+
+
+def _create_memory_log_payload(
+    measurement: CallMeasurement,
+) -> dict[str, dict[str, Any]]:
+    memory_payload: dict[str, dict[str, Any]] = {
+        "psutil": measurement.process_metrics.memory_info
     }
 
-    if tracemalloc_state is not None:
-        tracemalloc_metrics = _finalize_tracemalloc_capture(tracemalloc_state)
-        if tracemalloc_metrics is not None:
-            memory_payload["python"] = tracemalloc_metrics
+    if measurement.tracemalloc_metrics is not None:
+        memory_payload["python"] = measurement.tracemalloc_metrics
+
+    if measurement.allocation_sites is not None:
+        memory_payload["allocation_sites"] = measurement.allocation_sites
+
+    return memory_payload
+
+
+def _create_thread_log_payload(
+    thread_metrics: ThreadMetrics,
+) -> dict[str, dict[str, Any]]:
+    thread_io_payload: dict[str, float | int] | str = (
+        thread_metrics.io_counters
+        if thread_metrics.io_counters is not None
+        else "unavailable"
+    )
 
     return {
-        "function": wrapped_function_name,
-        "status": status,
-        "processing_time": processing_time_payload,
-        "cpu": {"utilization_percent": round(cpu_utilization_percent, 1)},
-        "memory": memory_payload,
-        "io": io_payload,
+        "thread": {
+            "native_id": thread_metrics.native_thread_id,
+            "cpu_seconds": round(thread_metrics.cpu_seconds, _ROUND_DIGITS),
+            "io": thread_io_payload,
+        },
+        "attribution": {
+            "process_wide_contaminated": (
+                thread_metrics.is_process_wide_contaminated
+            ),
+            "other_threads_cpu_seconds": round(
+                thread_metrics.other_threads_cpu_seconds, _ROUND_DIGITS
+            ),
+        },
     }
 
 
+def log_call_measurement(measurement: CallMeasurement) -> None:
+    if not _LOGGER.isEnabledFor(logging.DEBUG):
+        return
+
+    structured_log_payload = json.dumps(
+        _create_log_payload(measurement), indent=2
+    )
+    _LOGGER.debug(structured_log_payload)
+
+
+def _create_call_sampler(
+    sample_rate: float, sample_every_n_calls: int
+) -> Callable[[], bool]:
+    if not 0.0 < sample_rate <= 1.0:
+        raise ValueError(
+            f"sample_rate must be in the range (0, 1]: {sample_rate}"
+        )
+    if sample_every_n_calls < 1:
+        raise ValueError(
+            "sample_every_n_calls must be a positive integer: "
+            f"{sample_every_n_calls}"
+        )
+    if sample_rate < 1.0 and sample_every_n_calls > 1:
+        raise ValueError(
+            "sample_rate and sample_every_n_calls cannot be combined."
+        )
+
+    if sample_every_n_calls > 1:
+        call_counter = count()
+        return lambda: next(call_counter) % sample_every_n_calls == 0
+
+    if sample_rate < 1.0:
+        return lambda: random() < sample_rate
+
+    return lambda: True
+
+
+class _TimedCoroutine[ReturnType]:
+    def __init__(
+        self,
+        coroutine: Coroutine[Any, Any, ReturnType],
+        coroutine_timing: CoroutineTiming,
+    ) -> None:
+        self._coroutine = coroutine
+        self._coroutine_timing = coroutine_timing
+
+    def __await__(self) -> Generator[Any, Any, ReturnType]:
+        send_value: Any = None
+        thrown_exception: BaseException | None = None
+        while True:
+            try:
+                yielded_value = self._step(send_value, thrown_exception)
+            except StopIteration as stop_iteration:
+                return cast(ReturnType, stop_iteration.value)
+
+            try:
+                send_value = yield yielded_value
+                thrown_exception = None
+            except GeneratorExit:
+                self._coroutine.close()
+                raise
+            except BaseException as exception:
+                send_value = None
+                thrown_exception = exception
+
+    def _step(
+        self, send_value: Any, thrown_exception: BaseException | None
+    ) -> Any:
+        step_start_time = perf_counter()
+        step_start_cpu_time = thread_time()
+        try:
+            if thrown_exception is None:
+                return self._coroutine.send(send_value)
+            return self._coroutine.throw(thrown_exception)
+        finally:
+            self._coroutine_timing.record_step(
+                perf_counter() - step_start_time,
+                thread_time() - step_start_cpu_time,
+            )
+
+
+def _wrap_function[**Parameters, ReturnType](
+    function_to_wrap: Callable[Parameters, ReturnType],
+    should_sample_call: Callable[[], bool],
+    measurement_options: MeasurementOptions,
+) -> Callable[Parameters, ReturnType]:
+    @wraps(function_to_wrap)
+    def wrapper(
+        *wrapped_function_args: Parameters.args,
+        **wrapped_function_kwargs: Parameters.kwargs,
+    ) -> ReturnType:
+        if not should_sample_call():
+            return function_to_wrap(
+                *wrapped_function_args, **wrapped_function_kwargs
+            )
+
+        measurement_start = _start_measurement(
+            function_to_wrap.__name__, measurement_options
+        )
+        status = "error"
+        try:
+            return_value = function_to_wrap(
+                *wrapped_function_args, **wrapped_function_kwargs
+            )
+            status = "success"
+            return return_value
+        finally:
+            _report_measurement(
+                _finish_measurement(
+                    function_to_wrap.__name__,
+                    status,
+                    measurement_start,
+                    measurement_options,
+                ),
+                measurement_start,
+                measurement_options,
+            )
+
+    return wrapper
+
+
+def _wrap_coroutine_function[**Parameters, ReturnType](
+    function_to_wrap: Callable[Parameters, Coroutine[Any, Any, ReturnType]],
+    should_sample_call: Callable[[], bool],
+    measurement_options: MeasurementOptions,
+) -> Callable[Parameters, Coroutine[Any, Any, ReturnType]]:
+    @wraps(function_to_wrap)
+    async def wrapper(
+        *wrapped_function_args: Parameters.args,
+        **wrapped_function_kwargs: Parameters.kwargs,
+    ) -> ReturnType:
+        if not should_sample_call():
+            return await function_to_wrap(
+                *wrapped_function_args, **wrapped_function_kwargs
+            )
+
+        measurement_start = _start_measurement(
+            function_to_wrap.__name__, measurement_options
+        )
+        coroutine_timing = CoroutineTiming()
+        status = "error"
+        try:
+            return_value = await _TimedCoroutine(
+                function_to_wrap(
+                    *wrapped_function_args, **wrapped_function_kwargs
+                ),
+                coroutine_timing,
+            )
+            status = "success"
+            return return_value
+        finally:
+            _report_measurement(
+                _finish_measurement(
+                    function_to_wrap.__name__,
+                    status,
+                    measurement_start,
+                    measurement_options,
+                    coroutine_timing,
+                ),
+                measurement_start,
+                measurement_options,
+            )
+
+    return wrapper
+
+
+def _validate_allocation_site_options(
+    top_allocation_site_count: int,
+    allocation_site_group_by: AllocationSiteGroupBy,
+) -> None:
+    if top_allocation_site_count < 0:
+        raise ValueError(
+            "top_allocation_site_count must not be negative: "
+            f"{top_allocation_site_count}"
+        )
+    if allocation_site_group_by not in get_args(AllocationSiteGroupBy):
+        raise ValueError(
+            "allocation_site_group_by must be one of "
+            f"{get_args(AllocationSiteGroupBy)}: {allocation_site_group_by}"
+        )
+
+
 def measure_performance[**Parameters, ReturnType](
     *,
     enable_tracemalloc: bool,
+    enable_unique_set_size: bool = False,
+    sample_rate: float = 1.0,
+    sample_every_n_calls: int = 1,
+    measurement_handler: MeasurementHandler = log_call_measurement,
+    trace_handler: TraceHandler | None = None,
+    top_allocation_site_count: int = 0,
+    allocation_site_group_by: AllocationSiteGroupBy = "lineno",
+    resource_sampling_interval_seconds: float | None = None,
 ) -> Callable[
     [Callable[Parameters, ReturnType]], Callable[Parameters, ReturnType]
 ]:
+    should_sample_call = _create_call_sampler(
+        sample_rate, sample_every_n_calls
+    )
+    _validate_allocation_site_options(
+        top_allocation_site_count, allocation_site_group_by
+    )
+    measurement_options = MeasurementOptions(
+        enable_tracemalloc=enable_tracemalloc,
+        enable_unique_set_size=enable_unique_set_size,
+        measurement_handler=measurement_handler,
+        trace_handler=trace_handler,
+        top_allocation_site_count=top_allocation_site_count,
+        allocation_site_group_by=allocation_site_group_by,
+        resource_sampling_interval_seconds=resource_sampling_interval_seconds,
+    )
+
     def decorator(
         function_to_wrap: Callable[Parameters, ReturnType],
     ) -> Callable[Parameters, ReturnType]:
-        @wraps(function_to_wrap)
-        def wrapper(
-            *wrapped_function_args: Parameters.args,
-            **wrapped_function_kwargs: Parameters.kwargs,
-        ) -> ReturnType:
-            start_time = perf_counter()
-            start_cpu_time = process_time()
-
-            before_process_snapshot = _capture_process_snapshot()
-            tracemalloc_state: TracemallocState | None = None
-            if enable_tracemalloc:
-                tracemalloc_state = _initialize_tracemalloc_capture()
+        if iscoroutinefunction(function_to_wrap):
+            return cast(
+                Callable[Parameters, ReturnType],
+                _wrap_coroutine_function(
+                    function_to_wrap, should_sample_call, measurement_options
+                ),
+            )
 
-            try:
-                return_value = function_to_wrap(
-                    *wrapped_function_args, **wrapped_function_kwargs
-                )
-            except BaseException:
-                after_process_snapshot = _capture_process_snapshot()
-                log_payload = _create_log_payload(
-                    function_to_wrap.__name__,
-                    "error",
-                    before_process_snapshot,
-                    after_process_snapshot,
-                    tracemalloc_state,
-                    start_time,
-                    start_cpu_time,
-                )
-                structured_log_payload = json.dumps(log_payload, indent=2)
-                _LOGGER.debug(structured_log_payload)
-                raise
-            else:
-                after_process_snapshot = _capture_process_snapshot()
-                log_payload = _create_log_payload(
-                    function_to_wrap.__name__,
-                    "success",
-                    before_process_snapshot,
-                    after_process_snapshot,
-                    tracemalloc_state,
-                    start_time,
-                    start_cpu_time,
-                )
-                structured_log_payload = json.dumps(log_payload, indent=2)
-                _LOGGER.debug(structured_log_payload)
-                return return_value
-
-        return wrapper
+        return _wrap_function(
+            function_to_wrap, should_sample_call, measurement_options
+        )
 
     return decorator
 
@@ -344,7 +997,7 @@ if __name__ == "__main__":  # pragma: no cover
 
     logging.basicConfig(level=logging.DEBUG)
 
-    @measure_performance(enable_tracemalloc=True)
+    @measure_performance(enable_tracemalloc=True, enable_unique_set_size=True)
     def test_function(rows: int = 500000) -> pd.DataFrame:
         temp_df = pd.DataFrame(
             {
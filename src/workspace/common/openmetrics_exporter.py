@@ -0,0 +1,246 @@
+import os
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from threading import Thread
+
+from workspace.common.performance_metrics import (
+    FunctionMetrics,
+    PerformanceMetricsRegistry,
+)
+
+OPENMETRICS_CONTENT_TYPE = (
+    "application/openmetrics-text; version=1.0.0; charset=utf-8"
+)
+DEFAULT_LATENCY_BUCKET_UPPER_BOUNDS = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+    10.0,
+    60.0,
+)
+_BYTES_PER_MIB = 1024**2
+_METRIC_PREFIX = "measure_performance"
+_IO_COUNTER_METRICS = {
+    "read_mib": ("io_read_bytes", _BYTES_PER_MIB),
+    "write_mib": ("io_write_bytes", _BYTES_PER_MIB),
+    "read_operations": ("io_read_operations", 1),
+    "write_operations": ("io_write_operations", 1),
+}
+
+
+def _escape_label_value(label_value: str) -> str:
+    return (
+        label_value.replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+    )
+
+
+def _format_labels(**labels: str) -> str:
+    formatted_labels = ",".join(
+        f'{label_name}="{_escape_label_value(label_value)}"'
+        for label_name, label_value in labels.items()
+    )
+    return f"{{{formatted_labels}}}"
+
+
+def _format_bucket_upper_bound(upper_bound: float) -> str:
+    return repr(float(upper_bound))
+
+
+def _render_metric_family_header(
+    metric_name: str, metric_type: str, help_text: str, unit: str = ""
+) -> Iterator[str]:
+    yield f"# TYPE {metric_name} {metric_type}"
+    if unit:
+        yield f"# UNIT {metric_name} {unit}"
+    yield f"# HELP {metric_name} {help_text}"
+
+
+def _render_latency_histogram(
+    function_metrics_list: list[FunctionMetrics],
+    bucket_upper_bounds: tuple[float, ...],
+) -> Iterator[str]:
+    metric_name = f"{_METRIC_PREFIX}_call_duration_seconds"
+    yield from _render_metric_family_header(
+        metric_name,
+        "histogram",
+        "Wall-clock duration of measured calls.",
+        "seconds",
+    )
+    for function_metrics in function_metrics_list:
+        cumulative_counts = (
+            function_metrics.latency_histogram.cumulative_counts(
+                bucket_upper_bounds
+            )
+        )
+        for upper_bound, cumulative_count in zip(
+            bucket_upper_bounds, cumulative_counts, strict=True
+        ):
+            labels = _format_labels(
+                function=function_metrics.function_name,
+                le=_format_bucket_upper_bound(upper_bound),
+            )
+            yield f"{metric_name}_bucket{labels} {cumulative_count}"
+
+        labels = _format_labels(
+            function=function_metrics.function_name, le="+Inf"
+        )
+        yield f"{metric_name}_bucket{labels} {function_metrics.count}"
+        labels = _format_labels(function=function_metrics.function_name)
+        yield f"{metric_name}_count{labels} {function_metrics.count}"
+        yield f"{metric_name}_sum{labels} {function_metrics.wall_seconds_sum}"
+
+
+def _render_call_counters(
+    function_metrics_list: list[FunctionMetrics],
+) -> Iterator[str]:
+    calls_metric_name = f"{_METRIC_PREFIX}_calls"
+    yield from _render_metric_family_header(
+        calls_metric_name, "counter", "Number of measured calls by status."
+    )
+    for function_metrics in function_metrics_list:
+        for status, status_count in (
+            ("success", function_metrics.count - function_metrics.error_count),
+            ("error", function_metrics.error_count),
+        ):
+            labels = _format_labels(
+                function=function_metrics.function_name, status=status
+            )
+            yield f"{calls_metric_name}_total{labels} {status_count}"
+
+    cpu_metric_name = f"{_METRIC_PREFIX}_cpu_seconds"
+    yield from _render_metric_family_header(
+        cpu_metric_name,
+        "counter",
+        "CPU time consumed by measured calls.",
+        "seconds",
+    )
+    for function_metrics in function_metrics_list:
+        labels = _format_labels(function=function_metrics.function_name)
+        yield (
+            f"{cpu_metric_name}_total{labels} "
+            f"{function_metrics.cpu_seconds_sum}"
+        )
+
+
+def _render_resource_metrics(
+    function_metrics_list: list[FunctionMetrics],
+) -> Iterator[str]:
+    memory_metric_name = f"{_METRIC_PREFIX}_resident_set_size_delta_bytes"
+    yield from _render_metric_family_header(
+        memory_metric_name,
+        "gauge",
+        "Sum of resident set size deltas across measured calls.",
+        "bytes",
+    )
+    for function_metrics in function_metrics_list:
+        labels = _format_labels(function=function_metrics.function_name)
+        memory_delta_bytes = round(
+            function_metrics.resident_set_size_delta_mib_sum * _BYTES_PER_MIB
+        )
+        yield f"{memory_metric_name}{labels} {memory_delta_bytes}"
+
+    for io_name, (metric_suffix, scale) in _IO_COUNTER_METRICS.items():
+        io_metric_name = f"{_METRIC_PREFIX}_{metric_suffix}"
+        yield from _render_metric_family_header(
+            io_metric_name,
+            "counter",
+            f"Process IO {metric_suffix.removeprefix('io_')} during calls.",
+        )
+        for function_metrics in function_metrics_list:
+            if io_name not in function_metrics.io_sums:
+                continue
+            labels = _format_labels(function=function_metrics.function_name)
+            io_value = round(function_metrics.io_sums[io_name] * scale)
+            yield f"{io_metric_name}_total{labels} {io_value}"
+
+
+def render_openmetrics(
+    registry: PerformanceMetricsRegistry,
+    bucket_upper_bounds: tuple[float, ...] = (
+        DEFAULT_LATENCY_BUCKET_UPPER_BOUNDS
+    ),
+) -> str:
+    function_metrics_list = sorted(
+        registry.collect(),
+        key=lambda function_metrics: function_metrics.function_name,
+    )
+    lines = [
+        *_render_latency_histogram(function_metrics_list, bucket_upper_bounds),
+        *_render_call_counters(function_metrics_list),
+        *_render_resource_metrics(function_metrics_list),
+        "# EOF",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(
+    registry: PerformanceMetricsRegistry, output_path: Path
+) -> None:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with NamedTemporaryFile(
+        "w",
+        encoding="utf-8",
+        dir=output_path.parent,
+        prefix=f".{output_path.name}.",
+        delete=False,
+    ) as temporary_file:
+        temporary_file.write(render_openmetrics(registry))
+        temporary_path = Path(temporary_file.name)
+
+    try:
+        temporary_path.chmod(0o644)
+        os.replace(temporary_path, output_path)
+    except BaseException:
+        temporary_path.unlink(missing_ok=True)
+        raise
+
+
+def _create_request_handler(
+    registry: PerformanceMetricsRegistry,
+) -> type[BaseHTTPRequestHandler]:
+    class OpenMetricsRequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+
+            response_body = render_openmetrics(registry).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(response_body)))
+            self.end_headers()
+            self.wfile.write(response_body)
+
+        def log_message(self, format: str, *args: object) -> None:
+            return None
+
+    return OpenMetricsRequestHandler
+
+
+def start_http_server(
+    registry: PerformanceMetricsRegistry,
+    *,
+    host: str = "127.0.0.1",
+    port: int = 9464,
+) -> ThreadingHTTPServer:
+    http_server = ThreadingHTTPServer(
+        (host, port), _create_request_handler(registry)
+    )
+    http_server.daemon_threads = True
+    Thread(
+        target=http_server.serve_forever,
+        name="openmetrics-exporter",
+        daemon=True,
+    ).start()
+    return http_server
@@ -0,0 +1,304 @@
+import atexit
+import json
+import logging
+from collections.abc import Sequence
+from math import ceil
+from threading import Lock, local
+from time import monotonic
+from typing import Any
+from weakref import finalize
+
+from workspace.common.measure_performance import CallMeasurement
+
+_NANOSECONDS_PER_SECOND = 1_000_000_000
+_MANTISSA_BITS = 7
+_MANTISSA_BUCKET_COUNT = 1 << _MANTISSA_BITS
+_ROUND_DIGITS = 6
+_SUMMARY_PERCENTILES = (50.0, 95.0, 99.0)
+_LOGGER = logging.getLogger(__name__)
+
+
+class LatencyHistogram:
+    def __init__(self) -> None:
+        self._bucket_counts: dict[int, int] = {}
+        self._count = 0
+        self._max_nanoseconds = 0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def max_seconds(self) -> float:
+        return self._max_nanoseconds / _NANOSECONDS_PER_SECOND
+
+    def record(self, seconds: float) -> None:
+        nanoseconds = max(int(seconds * _NANOSECONDS_PER_SECOND), 0)
+        bucket_index = _to_bucket_index(nanoseconds)
+        self._bucket_counts[bucket_index] = (
+            self._bucket_counts.get(bucket_index, 0) + 1
+        )
+        self._count += 1
+        self._max_nanoseconds = max(self._max_nanoseconds, nanoseconds)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for bucket_index, bucket_count in other._bucket_counts.items():
+            self._bucket_counts[bucket_index] = (
+                self._bucket_counts.get(bucket_index, 0) + bucket_count
+            )
+        self._count += other._count
+        self._max_nanoseconds = max(
+            self._max_nanoseconds, other._max_nanoseconds
+        )
+
+    def percentile(self, percentile: float) -> float:
+        if not 0.0 <= percentile <= 100.0:
+            raise ValueError(
+                f"percentile must be in the range [0, 100]: {percentile}"
+            )
+        if self._count == 0:
+            return 0.0
+
+        target_rank = max(ceil(self._count * percentile / 100.0), 1)
+        cumulative_count = 0
+        for bucket_index in sorted(self._bucket_counts):
+            cumulative_count += self._bucket_counts[bucket_index]
+            if cumulative_count >= target_rank:
+                nanoseconds = min(
+                    _from_bucket_index(bucket_index), self._max_nanoseconds
+                )
+                return nanoseconds / _NANOSECONDS_PER_SECOND
+
+        return self.max_seconds
+
+    def cumulative_counts(self, upper_bounds: Sequence[float]) -> list[int]:
+        sorted_bucket_items = sorted(self._bucket_counts.items())
+        cumulative_counts: list[int] = []
+        for upper_bound in upper_bounds:
+            upper_bound_nanoseconds = upper_bound * _NANOSECONDS_PER_SECOND
+            cumulative_counts.append(
+                sum(
+                    bucket_count
+                    for bucket_index, bucket_count in sorted_bucket_items
+                    if _bucket_upper_edge(bucket_index)
+                    <= upper_bound_nanoseconds
+                )
+            )
+
+        return cumulative_counts
+
+
+def _to_bucket_index(nanoseconds: int) -> int:
+    exponent = max(nanoseconds.bit_length() - _MANTISSA_BITS, 0)
+    mantissa = nanoseconds >> exponent
+    return exponent * _MANTISSA_BUCKET_COUNT + mantissa
+
+
+def _from_bucket_index(bucket_index: int) -> int:
+    exponent, mantissa = divmod(bucket_index, _MANTISSA_BUCKET_COUNT)
+    return (mantissa << exponent) + ((1 << exponent) >> 1)
+
+
+def _bucket_upper_edge(bucket_index: int) -> int:
+    exponent, mantissa = divmod(bucket_index, _MANTISSA_BUCKET_COUNT)
+    return ((mantissa + 1) << exponent) - 1
+
+
+class FunctionMetrics:
+    def __init__(self, function_name: str) -> None:
+        self.function_name = function_name
+        self.count = 0
+        self.error_count = 0
+        self.wall_seconds_sum = 0.0
+        self.cpu_seconds_sum = 0.0
+        self.resident_set_size_delta_mib_sum = 0.0
+        self.io_sums: dict[str, float] = {}
+        self.latency_histogram = LatencyHistogram()
+        self._lock = Lock()
+
+    def record(self, measurement: CallMeasurement) -> None:
+        io_counters = measurement.process_metrics.io_counters or {}
+        resident_set_size_delta_mib = (
+            measurement.process_metrics.memory_info.get(
+                "resident_set_size_delta_mib", 0.0
+            )
+        )
+
+        with self._lock:
+            self.count += 1
+            if measurement.status == "error":
+                self.error_count += 1
+            self.wall_seconds_sum += measurement.elapsed_wall_seconds
+            self.cpu_seconds_sum += measurement.cpu_seconds
+            self.resident_set_size_delta_mib_sum += resident_set_size_delta_mib
+            for io_name, io_value in io_counters.items():
+                self.io_sums[io_name] = self.io_sums.get(io_name, 0) + io_value
+            self.latency_histogram.record(measurement.elapsed_wall_seconds)
+
+    def merge(self, other: "FunctionMetrics") -> None:
+        with other._lock:
+            self.count += other.count
+            self.error_count += other.error_count
+            self.wall_seconds_sum += other.wall_seconds_sum
+            self.cpu_seconds_sum += other.cpu_seconds_sum
+            self.resident_set_size_delta_mib_sum += (
+                other.resident_set_size_delta_mib_sum
+            )
+            for io_name, io_value in other.io_sums.items():
+                self.io_sums[io_name] = self.io_sums.get(io_name, 0) + io_value
+            self.latency_histogram.merge(other.latency_histogram)
+
+    def summarize(self) -> dict[str, Any]:
+        with self._lock:
+            latency_payload = {
+                f"p{percentile:g}": round(
+                    self.latency_histogram.percentile(percentile),
+                    _ROUND_DIGITS,
+                )
+                for percentile in _SUMMARY_PERCENTILES
+            }
+            latency_payload["max"] = round(
+                self.latency_histogram.max_seconds, _ROUND_DIGITS
+            )
+
+            return {
+                "function": self.function_name,
+                "count": self.count,
+                "error_count": self.error_count,
+                "wall_seconds_sum": round(
+                    self.wall_seconds_sum, _ROUND_DIGITS
+                ),
+                "cpu_seconds_sum": round(self.cpu_seconds_sum, _ROUND_DIGITS),
+                "latency_seconds": latency_payload,
+                "resident_set_size_delta_mib_sum": round(
+                    self.resident_set_size_delta_mib_sum, _ROUND_DIGITS
+                ),
+                "io_sums": {
+                    io_name: round(io_value, _ROUND_DIGITS)
+                    for io_name, io_value in self.io_sums.items()
+                },
+            }
+
+
+class _ThreadShardOwner:
+    def __init__(self, shard: dict[str, FunctionMetrics]) -> None:
+        self.shard = shard
+
+
+class PerformanceMetricsRegistry:
+    def __init__(
+        self,
+        *,
+        flush_interval_seconds: float | None = 60.0,
+        flush_at_exit: bool = True,
+    ) -> None:
+        if flush_interval_seconds is not None and flush_interval_seconds <= 0:
+            raise ValueError(
+                "flush_interval_seconds must be positive: "
+                f"{flush_interval_seconds}"
+            )
+
+        self._thread_local = local()
+        self._thread_shards: list[dict[str, FunctionMetrics]] = []
+        self._retired_function_metrics: dict[str, FunctionMetrics] = {}
+        self._thread_shards_lock = Lock()
+        self._flush_lock = Lock()
+        self._flush_interval_seconds = flush_interval_seconds
+        self._next_flush_time = (
+            monotonic() + flush_interval_seconds
+            if flush_interval_seconds is not None
+            else None
+        )
+
+        if flush_at_exit:
+            atexit.register(self.flush)
+
+    def record(self, measurement: CallMeasurement) -> None:
+        thread_shard = self._get_thread_shard()
+        function_metrics = thread_shard.get(measurement.function_name)
+        if function_metrics is None:
+            function_metrics = thread_shard.setdefault(
+                measurement.function_name,
+                FunctionMetrics(measurement.function_name),
+            )
+
+        function_metrics.record(measurement)
+
+        if self._next_flush_time is not None and (
+            monotonic() >= self._next_flush_time
+        ):
+            self._flush_on_interval()
+
+    def collect(self) -> list[FunctionMetrics]:
+        merged_function_metrics: dict[str, FunctionMetrics] = {}
+        with self._thread_shards_lock:
+            thread_shards = list(self._thread_shards)
+            _merge_thread_shard(
+                merged_function_metrics, self._retired_function_metrics
+            )
+
+        for thread_shard in thread_shards:
+            _merge_thread_shard(merged_function_metrics, thread_shard)
+
+        return list(merged_function_metrics.values())
+
+    def summarize(self) -> list[dict[str, Any]]:
+        return [
+            function_metrics.summarize() for function_metrics in self.collect()
+        ]
+
+    def flush(self) -> None:
+        for summary in self.summarize():
+            _LOGGER.info(json.dumps(summary, separators=(",", ":")))
+
+    def _get_thread_shard(self) -> dict[str, FunctionMetrics]:
+        thread_shard: dict[str, FunctionMetrics] | None = getattr(
+            self._thread_local, "shard", None
+        )
+        if thread_shard is None:
+            thread_shard = {}
+            self._thread_local.shard = thread_shard
+            self._thread_local.shard_owner = _ThreadShardOwner(thread_shard)
+            finalize(
+                self._thread_local.shard_owner,
+                self._retire_thread_shard,
+                thread_shard,
+            )
+            with self._thread_shards_lock:
+                self._thread_shards.append(thread_shard)
+
+        return thread_shard
+
+    def _retire_thread_shard(
+        self, thread_shard: dict[str, FunctionMetrics]
+    ) -> None:
+        with self._thread_shards_lock:
+            self._thread_shards = [
+                live_thread_shard
+                for live_thread_shard in self._thread_shards
+                if live_thread_shard is not thread_shard
+            ]
+            _merge_thread_shard(self._retired_function_metrics, thread_shard)
+
+    def _flush_on_interval(self) -> None:
+        if not self._flush_lock.acquire(blocking=False):
+            return
+
+        try:
+            if self._flush_interval_seconds is None:
+                return
+            self._next_flush_time = monotonic() + self._flush_interval_seconds
+            self.flush()
+        finally:
+            self._flush_lock.release()
+
+
+def _merge_thread_shard(
+    merged_function_metrics: dict[str, FunctionMetrics],
+    thread_shard: dict[str, FunctionMetrics],
+) -> None:
+    for function_metrics in list(thread_shard.values()):
+        merged_function_metrics.setdefault(
+            function_metrics.function_name,
+            FunctionMetrics(function_metrics.function_name),
+        ).merge(function_metrics)
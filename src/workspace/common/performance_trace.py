@@ -0,0 +1,199 @@
+import json
+import logging
+import os
+from collections.abc import Callable, Iterable
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock, get_native_id
+from typing import Any
+
+_MICROSECONDS_PER_SECOND = 1_000_000
+_ROUND_DIGITS = 6
+_CHROME_TRACE_CATEGORY = "measure_performance"
+_LOGGER = logging.getLogger(__name__)
+
+_CURRENT_SPAN: ContextVar["PerformanceSpan | None"] = ContextVar(
+    "current_performance_span", default=None
+)
+
+
+@dataclass
+class PerformanceSpan:
+    name: str
+    start_time: float
+    native_thread_id: int
+    parent: "PerformanceSpan | None" = field(default=None, repr=False)
+    children: list["PerformanceSpan"] = field(default_factory=list)
+    status: str = "running"
+    inclusive_wall_seconds: float = 0.0
+    inclusive_cpu_seconds: float = 0.0
+    inclusive_allocated_mib: float | None = None
+
+    @property
+    def exclusive_wall_seconds(self) -> float:
+        return max(
+            self.inclusive_wall_seconds
+            - sum(child.inclusive_wall_seconds for child in self.children),
+            0.0,
+        )
+
+    @property
+    def exclusive_cpu_seconds(self) -> float:
+        return max(
+            self.inclusive_cpu_seconds
+            - sum(child.inclusive_cpu_seconds for child in self.children),
+            0.0,
+        )
+
+    @property
+    def exclusive_allocated_mib(self) -> float | None:
+        if self.inclusive_allocated_mib is None:
+            return None
+
+        return self.inclusive_allocated_mib - sum(
+            child.inclusive_allocated_mib or 0.0 for child in self.children
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "status": self.status,
+            "inclusive": {
+                "wall_seconds": round(
+                    self.inclusive_wall_seconds, _ROUND_DIGITS
+                ),
+                "cpu_seconds": round(
+                    self.inclusive_cpu_seconds, _ROUND_DIGITS
+                ),
+                "allocated_mib": _round_optional(self.inclusive_allocated_mib),
+            },
+            "exclusive": {
+                "wall_seconds": round(
+                    self.exclusive_wall_seconds, _ROUND_DIGITS
+                ),
+                "cpu_seconds": round(
+                    self.exclusive_cpu_seconds, _ROUND_DIGITS
+                ),
+                "allocated_mib": _round_optional(self.exclusive_allocated_mib),
+            },
+            "children": [child.to_dict() for child in self.children],
+        }
+
+
+TraceHandler = Callable[[PerformanceSpan], None]
+
+
+def _round_optional(value: float | None) -> float | None:
+    if value is None:
+        return None
+
+    return round(value, _ROUND_DIGITS)
+
+
+def has_current_span() -> bool:
+    return _CURRENT_SPAN.get() is not None
+
+
+def open_span(
+    name: str, start_time: float
+) -> tuple[PerformanceSpan, Token["PerformanceSpan | None"]]:
+    parent_span = _CURRENT_SPAN.get()
+    span = PerformanceSpan(
+        name=name,
+        start_time=start_time,
+        native_thread_id=get_native_id(),
+        parent=parent_span,
+    )
+    if parent_span is not None:
+        parent_span.children.append(span)
+
+    return span, _CURRENT_SPAN.set(span)
+
+
+def close_span(
+    span: PerformanceSpan,
+    span_token: Token["PerformanceSpan | None"],
+    *,
+    status: str,
+    wall_seconds: float,
+    cpu_seconds: float,
+    allocated_mib: float | None,
+) -> None:
+    span.status = status
+    span.inclusive_wall_seconds = wall_seconds
+    span.inclusive_cpu_seconds = cpu_seconds
+    span.inclusive_allocated_mib = allocated_mib
+    _CURRENT_SPAN.reset(span_token)
+
+
+def log_trace_tree(root_span: PerformanceSpan) -> None:
+    if not _LOGGER.isEnabledFor(logging.DEBUG):
+        return
+
+    _LOGGER.debug(json.dumps(root_span.to_dict(), indent=2))
+
+
+def _iter_spans(span: PerformanceSpan) -> Iterable[PerformanceSpan]:
+    yield span
+    for child_span in span.children:
+        yield from _iter_spans(child_span)
+
+
+def create_chrome_trace_events(
+    root_span: PerformanceSpan,
+) -> list[dict[str, Any]]:
+    process_id = os.getpid()
+    return [
+        {
+            "name": span.name,
+            "cat": _CHROME_TRACE_CATEGORY,
+            "ph": "X",
+            "ts": round(span.start_time * _MICROSECONDS_PER_SECOND, 3),
+            "dur": round(
+                span.inclusive_wall_seconds * _MICROSECONDS_PER_SECOND, 3
+            ),
+            "pid": process_id,
+            "tid": span.native_thread_id,
+            "args": {
+                "status": span.status,
+                "inclusive_cpu_seconds": round(
+                    span.inclusive_cpu_seconds, _ROUND_DIGITS
+                ),
+                "exclusive_wall_seconds": round(
+                    span.exclusive_wall_seconds, _ROUND_DIGITS
+                ),
+                "exclusive_cpu_seconds": round(
+                    span.exclusive_cpu_seconds, _ROUND_DIGITS
+                ),
+                "inclusive_allocated_mib": _round_optional(
+                    span.inclusive_allocated_mib
+                ),
+                "exclusive_allocated_mib": _round_optional(
+                    span.exclusive_allocated_mib
+                ),
+            },
+        }
+        for span in _iter_spans(root_span)
+    ]
+
+
+class ChromeTraceRecorder:
+    def __init__(self) -> None:
+        self._trace_events: list[dict[str, Any]] = []
+        self._lock = Lock()
+
+    def record(self, root_span: PerformanceSpan) -> None:
+        trace_events = create_chrome_trace_events(root_span)
+        with self._lock:
+            self._trace_events.extend(trace_events)
+
+    def write(self, output_path: Path) -> None:
+        with self._lock:
+            chrome_trace = {
+                "traceEvents": list(self._trace_events),
+                "displayTimeUnit": "ms",
+            }
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps(chrome_trace), encoding="utf-8")
@@ -0,0 +1,183 @@
+from collections.abc import Iterator
+from tempfile import SpooledTemporaryFile
+from typing import IO, Any
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from psycopg2.extensions import encodings
+
+DEFAULT_ARROW_BLOCK_SIZE_BYTES = 16 * 1024**2
+DEFAULT_SPOOL_MAX_SIZE_BYTES = 64 * 1024**2
+_COPY_CHUNK_SIZE_BYTES = 1024**2
+_POSTGRES_NUMERIC_OID = 1700
+_DECIMAL128_MAX_PRECISION = 38
+_DECIMAL256_MAX_PRECISION = 76
+_POSTGRES_OID_ARROW_TYPES: dict[int, pa.DataType] = {
+    16: pa.bool_(),
+    20: pa.int64(),
+    21: pa.int16(),
+    23: pa.int32(),
+    26: pa.int64(),
+    700: pa.float32(),
+    701: pa.float64(),
+    1082: pa.date32(),
+    1083: pa.time64("us"),
+    1114: pa.timestamp("us"),
+    1184: pa.timestamp("us", tz="UTC"),
+}
+
+
+def _numeric_arrow_type(
+    precision: int | None, scale: int | None
+) -> pa.DataType:
+    if precision is None or scale is None or not 0 <= scale <= precision:
+        return pa.string()
+    if precision <= _DECIMAL128_MAX_PRECISION:
+        return pa.decimal128(precision, scale)
+    if precision <= _DECIMAL256_MAX_PRECISION:
+        return pa.decimal256(precision, scale)
+    return pa.string()
+
+
+def _column_arrow_type(column: Any) -> pa.DataType:
+    if column.type_code == _POSTGRES_NUMERIC_OID:
+        return _numeric_arrow_type(column.precision, column.scale)
+    return _POSTGRES_OID_ARROW_TYPES.get(column.type_code, pa.string())
+
+
+def describe_arrow_schema(cursor: Any, sql: str, params: tuple) -> pa.Schema:
+    cursor.execute(f"SELECT * FROM ({sql}) AS _described LIMIT 0", params)
+    return pa.schema(
+        [
+            pa.field(column.name, _column_arrow_type(column))
+            for column in cursor.description
+        ]
+    )
+
+
+def _copy_query_to_file(
+    cursor: Any,
+    sql: str,
+    params: tuple,
+    text_encoding: str,
+    output_file: IO[bytes],
+) -> None:
+    bound_sql = cursor.mogrify(sql, params).decode(text_encoding)
+    cursor.copy_expert(
+        f"COPY ({bound_sql}) TO STDOUT WITH (FORMAT csv)",
+        output_file,
+        size=_COPY_CHUNK_SIZE_BYTES,
+    )
+
+
+def _csv_column_type(arrow_type: pa.DataType) -> pa.DataType:
+    return pa.string() if pa.types.is_decimal256(arrow_type) else arrow_type
+
+
+def _open_csv_reader(
+    spool_file: IO[bytes],
+    schema: pa.Schema,
+    text_encoding: str,
+    block_size_bytes: int,
+) -> pa_csv.CSVStreamingReader:
+    return pa_csv.open_csv(
+        spool_file,
+        read_options=pa_csv.ReadOptions(
+            column_names=schema.names,
+            block_size=block_size_bytes,
+            encoding=text_encoding,
+        ),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={
+                field.name: _csv_column_type(field.type) for field in schema
+            },
+            true_values=["t"],
+            false_values=["f"],
+            null_values=[""],
+            strings_can_be_null=True,
+            quoted_strings_can_be_null=False,
+        ),
+    )
+
+
+def _iter_described_arrow_batches(
+    cursor: Any,
+    sql: str,
+    params: tuple,
+    schema: pa.Schema,
+    block_size_bytes: int,
+    spool_max_size_bytes: int,
+) -> Iterator[pa.RecordBatch]:
+    text_encoding = encodings[cursor.connection.encoding]
+    with SpooledTemporaryFile(max_size=spool_max_size_bytes) as spool_file:
+        _copy_query_to_file(cursor, sql, params, text_encoding, spool_file)
+        if spool_file.tell() == 0:
+            return
+        spool_file.seek(0)
+        for record_batch in _open_csv_reader(
+            spool_file, schema, text_encoding, block_size_bytes
+        ):
+            yield (
+                record_batch
+                if record_batch.schema == schema
+                else record_batch.cast(schema)
+            )
+
+
+def iter_arrow_batches(
+    cursor: Any,
+    sql: str,
+    params: tuple = (),
+    *,
+    block_size_bytes: int = DEFAULT_ARROW_BLOCK_SIZE_BYTES,
+    spool_max_size_bytes: int = DEFAULT_SPOOL_MAX_SIZE_BYTES,
+) -> Iterator[pa.RecordBatch]:
+    return _iter_described_arrow_batches(
+        cursor,
+        sql,
+        params,
+        describe_arrow_schema(cursor, sql, params),
+        block_size_bytes,
+        spool_max_size_bytes,
+    )
+
+
+def fetch_arrow_table(
+    cursor: Any,
+    sql: str,
+    params: tuple = (),
+    *,
+    block_size_bytes: int = DEFAULT_ARROW_BLOCK_SIZE_BYTES,
+    spool_max_size_bytes: int = DEFAULT_SPOOL_MAX_SIZE_BYTES,
+) -> pa.Table:
+    schema = describe_arrow_schema(cursor, sql, params)
+    return pa.Table.from_batches(
+        _iter_described_arrow_batches(
+            cursor,
+            sql,
+            params,
+            schema,
+            block_size_bytes,
+            spool_max_size_bytes,
+        ),
+        schema=schema,
+    )
+
+
+def iter_dataframes(
+    cursor: Any,
+    sql: str,
+    params: tuple = (),
+    *,
+    block_size_bytes: int = DEFAULT_ARROW_BLOCK_SIZE_BYTES,
+    spool_max_size_bytes: int = DEFAULT_SPOOL_MAX_SIZE_BYTES,
+) -> Iterator[pd.DataFrame]:
+    for record_batch in iter_arrow_batches(
+        cursor,
+        sql,
+        params,
+        block_size_bytes=block_size_bytes,
+        spool_max_size_bytes=spool_max_size_bytes,
+    ):
+        yield record_batch.to_pandas()
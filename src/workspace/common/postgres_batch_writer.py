@@ -0,0 +1,398 @@
+import time
+from collections.abc import Generator, Sequence
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import partial
+from itertools import groupby
+from threading import Condition, Lock, Thread
+from types import TracebackType
+from typing import Self
+
+import psycopg2
+from psycopg2.extras import execute_batch
+
+from workspace.common.performance_metrics import LatencyHistogram
+from workspace.common.postgres_pool import ConnectionFactory
+from workspace.common.postgres_result_cache import ResultCache
+from workspace.common.postgres_settings import PostgresSettings
+
+DEFAULT_MAX_BATCH_ROWS = 1000
+DEFAULT_MAX_BATCH_DELAY_SECONDS = 0.05
+_RETRYABLE_SQLSTATES = frozenset({"40001", "40P01"})
+_EXECUTE_BATCH_PAGE_SIZE = 100
+
+
+@dataclass(frozen=True)
+class BatchCommit:
+    unit_count: int
+    statement_count: int
+    row_count: int
+    attempt_count: int
+    elapsed_seconds: float
+
+
+@dataclass(frozen=True)
+class BatchWriterMetrics:
+    batch_count: int
+    unit_count: int
+    row_count: int
+    retry_count: int
+    failed_batch_count: int
+    failed_unit_count: int
+    pending_row_count: int
+    batch_latency_p50_seconds: float
+    batch_latency_p95_seconds: float
+    batch_latency_max_seconds: float
+
+
+@dataclass(frozen=True)
+class _BatchStatement:
+    sql: str
+    param_list: tuple[tuple, ...]
+
+
+@dataclass(frozen=True)
+class _PendingUnit:
+    statements: tuple[_BatchStatement, ...]
+    future: Future[BatchCommit | None]
+
+
+class BatchUnit:
+    def __init__(self) -> None:
+        self.statements: list[_BatchStatement] = []
+        self.future: Future[BatchCommit | None] = Future()
+
+    def execute(self, sql: str, params: tuple = ()) -> None:
+        self.statements.append(_BatchStatement(sql, (params,)))
+
+    def executemany(self, sql: str, param_list: Sequence[tuple]) -> None:
+        if param_list:
+            self.statements.append(_BatchStatement(sql, tuple(param_list)))
+
+
+def _count_rows(statements: Sequence[_BatchStatement]) -> int:
+    return sum(len(statement.param_list) for statement in statements)
+
+
+def _coalesce_statements(
+    statements: Sequence[_BatchStatement],
+) -> list[_BatchStatement]:
+    return [
+        _BatchStatement(
+            sql,
+            tuple(
+                params
+                for statement in grouped_statements
+                for params in statement.param_list
+            ),
+        )
+        for sql, grouped_statements in groupby(
+            statements, key=lambda statement: statement.sql
+        )
+    ]
+
+
+class BatchingWriter:
+    def __init__(
+        self,
+        connection_factory: ConnectionFactory,
+        *,
+        max_batch_rows: int = DEFAULT_MAX_BATCH_ROWS,
+        max_batch_delay_seconds: float = DEFAULT_MAX_BATCH_DELAY_SECONDS,
+        max_retries: int = 3,
+        retry_backoff_seconds: float = 0.01,
+        result_cache: ResultCache | None = None,
+    ) -> None:
+        if max_batch_rows < 1:
+            raise ValueError(
+                f"max_batch_rows must be positive: {max_batch_rows}"
+            )
+        if max_batch_delay_seconds <= 0:
+            raise ValueError(
+                "max_batch_delay_seconds must be positive: "
+                f"{max_batch_delay_seconds}"
+            )
+        if max_retries < 0:
+            raise ValueError(
+                f"max_retries must not be negative: {max_retries}"
+            )
+
+        self._connection_factory = connection_factory
+        self._max_batch_rows = max_batch_rows
+        self._max_batch_delay_seconds = max_batch_delay_seconds
+        self._max_retries = max_retries
+        self._retry_backoff_seconds = retry_backoff_seconds
+        self._result_cache = result_cache
+        self._connection: psycopg2.extensions.connection | None = None
+        self._condition = Condition()
+        self._flush_lock = Lock()
+        self._pending_units: list[_PendingUnit] = []
+        self._pending_row_count = 0
+        self._oldest_pending_at: float | None = None
+        self._flusher: Thread | None = None
+        self._closed = False
+        self._batch_latency_histogram = LatencyHistogram()
+        self._batch_count = 0
+        self._unit_count = 0
+        self._row_count = 0
+        self._retry_count = 0
+        self._failed_batch_count = 0
+        self._failed_unit_count = 0
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: PostgresSettings,
+        *,
+        max_batch_rows: int = DEFAULT_MAX_BATCH_ROWS,
+        max_batch_delay_seconds: float = DEFAULT_MAX_BATCH_DELAY_SECONDS,
+        max_retries: int = 3,
+        result_cache: ResultCache | None = None,
+    ) -> Self:
+        return cls(
+            partial(psycopg2.connect, **settings.to_connection_params()),
+            max_batch_rows=max_batch_rows,
+            max_batch_delay_seconds=max_batch_delay_seconds,
+            max_retries=max_retries,
+            result_cache=result_cache,
+        )
+
+    @contextmanager
+    def unit(self) -> Generator[BatchUnit]:
+        batch_unit = BatchUnit()
+        try:
+            yield batch_unit
+        except BaseException:
+            batch_unit.future.cancel()
+            raise
+        self.submit(batch_unit)
+
+    def submit(self, batch_unit: BatchUnit) -> Future[BatchCommit | None]:
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Batching writer is closed.")
+            if not batch_unit.future.set_running_or_notify_cancel():
+                return batch_unit.future
+            if not batch_unit.statements:
+                batch_unit.future.set_result(None)
+                return batch_unit.future
+
+            self._pending_units.append(
+                _PendingUnit(tuple(batch_unit.statements), batch_unit.future)
+            )
+            self._pending_row_count += _count_rows(batch_unit.statements)
+            if self._oldest_pending_at is None:
+                self._oldest_pending_at = time.monotonic()
+            self._ensure_flusher()
+            self._condition.notify_all()
+            is_batch_full = self._pending_row_count >= self._max_batch_rows
+
+        if is_batch_full:
+            self.flush()
+        return batch_unit.future
+
+    def flush(self) -> list[BatchCommit]:
+        return self._flush_pending()
+
+    def metrics(self) -> BatchWriterMetrics:
+        with self._condition:
+            return BatchWriterMetrics(
+                batch_count=self._batch_count,
+                unit_count=self._unit_count,
+                row_count=self._row_count,
+                retry_count=self._retry_count,
+                failed_batch_count=self._failed_batch_count,
+                failed_unit_count=self._failed_unit_count,
+                pending_row_count=self._pending_row_count,
+                batch_latency_p50_seconds=(
+                    self._batch_latency_histogram.percentile(50.0)
+                ),
+                batch_latency_p95_seconds=(
+                    self._batch_latency_histogram.percentile(95.0)
+                ),
+                batch_latency_max_seconds=(
+                    self._batch_latency_histogram.max_seconds
+                ),
+            )
+
+    def close(self) -> None:
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            flusher, self._flusher = self._flusher, None
+            self._condition.notify_all()
+
+        if flusher is not None:
+            flusher.join()
+        try:
+            self.flush()
+        finally:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is not None:
+            return
+
+        self._flusher = Thread(
+            target=self._run_flusher, name="batching-writer", daemon=True
+        )
+        self._flusher.start()
+
+    def _run_flusher(self) -> None:
+        while self._wait_for_due_batch():
+            self._flush_pending()
+
+    def _wait_for_due_batch(self) -> bool:
+        with self._condition:
+            while not self._closed:
+                if self._oldest_pending_at is None:
+                    self._condition.wait()
+                    continue
+
+                remaining_seconds = (
+                    self._oldest_pending_at
+                    + self._max_batch_delay_seconds
+                    - time.monotonic()
+                )
+                if remaining_seconds <= 0:
+                    return True
+                self._condition.wait(remaining_seconds)
+            return False
+
+    def _flush_pending(self) -> list[BatchCommit]:
+        with self._flush_lock:
+            with self._condition:
+                pending_units, self._pending_units = self._pending_units, []
+                self._pending_row_count = 0
+                self._oldest_pending_at = None
+            return self._commit_units(pending_units)
+
+    def _commit_units(
+        self, pending_units: Sequence[_PendingUnit]
+    ) -> list[BatchCommit]:
+        if not pending_units:
+            return []
+
+        try:
+            batch_commit = self._commit_batch(pending_units)
+        except Exception as error:
+            self._record_failed_batch(pending_units, error)
+            if len(pending_units) == 1:
+                return []
+            middle_index = len(pending_units) // 2
+            return [
+                *self._commit_units(pending_units[:middle_index]),
+                *self._commit_units(pending_units[middle_index:]),
+            ]
+
+        self._record_batch_commit(batch_commit)
+        for pending_unit in pending_units:
+            pending_unit.future.set_result(batch_commit)
+        return [batch_commit]
+
+    def _record_failed_batch(
+        self, pending_units: Sequence[_PendingUnit], error: Exception
+    ) -> None:
+        with self._condition:
+            self._failed_batch_count += 1
+            if len(pending_units) == 1:
+                self._failed_unit_count += 1
+        if len(pending_units) == 1:
+            pending_units[0].future.set_exception(error)
+
+    def _record_batch_commit(self, batch_commit: BatchCommit) -> None:
+        with self._condition:
+            self._batch_count += 1
+            self._unit_count += batch_commit.unit_count
+            self._row_count += batch_commit.row_count
+            self._retry_count += batch_commit.attempt_count - 1
+            self._batch_latency_histogram.record(batch_commit.elapsed_seconds)
+
+    def _commit_batch(
+        self, pending_units: Sequence[_PendingUnit]
+    ) -> BatchCommit:
+        statements = _coalesce_statements(
+            [
+                statement
+                for pending_unit in pending_units
+                for statement in pending_unit.statements
+            ]
+        )
+        started_at = time.perf_counter()
+        attempt_count = 1
+        while not self._try_execute_batch(statements, attempt_count):
+            time.sleep(self._retry_backoff_seconds * 2 ** (attempt_count - 1))
+            attempt_count += 1
+        self._invalidate_written_tables(statements)
+
+        return BatchCommit(
+            unit_count=len(pending_units),
+            statement_count=len(statements),
+            row_count=_count_rows(statements),
+            attempt_count=attempt_count,
+            elapsed_seconds=time.perf_counter() - started_at,
+        )
+
+    def _try_execute_batch(
+        self, statements: Sequence[_BatchStatement], attempt_count: int
+    ) -> bool:
+        try:
+            self._execute_batch(statements)
+        except Exception as error:
+            self._reset_connection()
+            if (
+                not isinstance(error, psycopg2.Error)
+                or error.pgcode not in _RETRYABLE_SQLSTATES
+                or attempt_count > self._max_retries
+            ):
+                raise
+            return False
+        return True
+
+    def _execute_batch(self, statements: Sequence[_BatchStatement]) -> None:
+        if self._connection is None:
+            self._connection = self._connection_factory()
+
+        with self._connection.cursor() as cursor:
+            for statement in statements:
+                execute_batch(
+                    cursor,
+                    statement.sql,
+                    statement.param_list,
+                    page_size=_EXECUTE_BATCH_PAGE_SIZE,
+                )
+        self._connection.commit()
+
+    def _invalidate_written_tables(
+        self, statements: Sequence[_BatchStatement]
+    ) -> None:
+        if self._result_cache is None:
+            return
+
+        for sql in {statement.sql for statement in statements}:
+            self._result_cache.invalidate_written_tables(sql)
+
+    def _reset_connection(self) -> None:
+        if self._connection is None:
+            return
+
+        try:
+            self._connection.rollback()
+        except psycopg2.Error:
+            self._connection.close()
+            self._connection = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception_value: BaseException | None,
+        exception_traceback: TracebackType | None,
+    ) -> None:
+        self.close()
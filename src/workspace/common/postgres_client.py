@@ -1,30 +1,88 @@
-from collections.abc import Generator, Sequence
+from collections.abc import Callable, Generator, Sequence
 from contextlib import contextmanager
+from itertools import count
+from time import perf_counter
 from types import TracebackType
-from typing import Self
+from typing import Any, Literal, Self
 
+import pandas as pd
 import psycopg2
-from psycopg2.extras import RealDictCursor, RealDictRow
+import pyarrow as pa
+from psycopg2.extras import NamedTupleCursor, RealDictCursor, RealDictRow
 
+from workspace.common.postgres_arrow import (
+    DEFAULT_ARROW_BLOCK_SIZE_BYTES,
+    fetch_arrow_table,
+    iter_arrow_batches,
+    iter_dataframes,
+)
+from workspace.common.postgres_copy import (
+    DEFAULT_COPY_CHUNK_SIZE_BYTES,
+    DEFAULT_VALUES_PAGE_SIZE,
+    BulkLoadMethod,
+    BulkLoadResult,
+    BulkLoadSource,
+    CopyFormat,
+    bulk_load,
+)
+from workspace.common.postgres_pool import PostgresConnectionPool
+from workspace.common.postgres_query_stats import (
+    QueryExecution,
+    QueryStatisticsRecorder,
+)
+from workspace.common.postgres_result_cache import (
+    ResultCache,
+    ResultCacheStats,
+)
 from workspace.common.postgres_settings import (
     PostgresSettings,
     load_postgres_settings,
 )
+from workspace.common.postgres_statement_cache import (
+    PreparedStatementCache,
+    PreparedStatementCacheStats,
+    get_statement_cache,
+)
+
+type RowType = Literal["tuple", "namedtuple", "dict"]
+
+DEFAULT_STREAM_ITERSIZE = 2000
+_ROW_TYPE_CURSOR_FACTORIES: dict[
+    RowType, type[psycopg2.extensions.cursor] | None
+] = {
+    "tuple": None,
+    "namedtuple": NamedTupleCursor,
+    "dict": RealDictCursor,
+}
+_SERVER_SIDE_CURSOR_IDS = count()
+_EXPLAIN_SAVEPOINT_NAME = "workspace_explain"
 
 
 class PostgresClient:
-    def __init__(self, settings: PostgresSettings) -> None:
+    def __init__(
+        self,
+        settings: PostgresSettings,
+        *,
+        pool: PostgresConnectionPool | None = None,
+        prepared_statement_cache_size: int = 0,
+        query_recorder: QueryStatisticsRecorder | None = None,
+        result_cache: ResultCache | None = None,
+    ) -> None:
         self._settings = settings
+        self._pool = pool
+        self._prepared_statement_cache_size = prepared_statement_cache_size
+        self._query_recorder = query_recorder
+        self._result_cache = result_cache
         self._connection: psycopg2.extensions.connection | None = None
+        self._has_uncommitted_writes = False
+        if prepared_statement_cache_size < 0:
+            raise ValueError(
+                "prepared_statement_cache_size must not be negative: "
+                f"{prepared_statement_cache_size}"
+            )
 
     def _connection_params(self) -> dict[str, str | int]:
-        return {
-            "dbname": self._settings.postgres_db_name,
-            "user": self._settings.postgres_user,
-            "password": self._settings.postgres_password,
-            "host": self._settings.postgres_host,
-            "port": self._settings.postgres_port,
-        }
+        return self._settings.to_connection_params()
 
     def execute(self, sql: str, params: tuple = ()) -> None:
         if self._connection is None:
@@ -32,8 +90,13 @@ class PostgresClient:
                 "Database connection not established. Use context manager."
             )
 
-        with self._cursor() as cursor:
-            cursor.execute(sql, params)
+        self._has_uncommitted_writes = True
+        with (
+            self._cursor() as cursor,
+            self._instrument(cursor, sql, params),
+        ):
+            self._execute_statement(cursor, sql, params)
+        self._invalidate_written_tables(sql)
 
     def executemany(self, sql: str, param_list: Sequence[tuple]) -> None:
         if self._connection is None:
@@ -41,8 +104,14 @@ class PostgresClient:
                 "Database connection not established. Use context manager."
             )
 
-        with self._cursor() as cursor:
-            cursor.executemany(sql, param_list)
+        self._has_uncommitted_writes = True
+        with self._cursor() as cursor, self._instrument(cursor, sql):
+            statement_cache = self._get_statement_cache()
+            if statement_cache is None or not param_list:
+                cursor.executemany(sql, param_list)
+            else:
+                statement_cache.executemany(cursor, sql, param_list)
+        self._invalidate_written_tables(sql)
 
     def fetchone(self, sql: str, params: tuple = ()) -> RealDictRow | None:
         if self._connection is None:
@@ -50,9 +119,9 @@ class PostgresClient:
                 "Database connection not established. Use context manager."
             )
 
-        with self._cursor() as cursor:
-            cursor.execute(sql, params)
-            return cursor.fetchone()
+        return self._fetch_through_cache(
+            "fetchone", sql, params, self._fetchone
+        )
 
     def fetchall(self, sql: str, params: tuple = ()) -> list[RealDictRow]:
         if self._connection is None:
@@ -60,36 +129,276 @@ class PostgresClient:
                 "Database connection not established. Use context manager."
             )
 
-        with self._cursor() as cursor:
+        return self._fetch_through_cache(
+            "fetchall", sql, params, self._fetchall
+        )
+
+    def invalidate_result_cache(self, *table_names: str) -> int:
+        if self._result_cache is None:
+            return 0
+        return self._result_cache.invalidate(table_names)
+
+    def result_cache_stats(self) -> ResultCacheStats | None:
+        if self._result_cache is None:
+            return None
+        return self._result_cache.stats()
+
+    def prepared_statement_cache_stats(
+        self,
+    ) -> PreparedStatementCacheStats | None:
+        statement_cache = self._get_statement_cache()
+        if statement_cache is None:
+            return None
+        return statement_cache.stats()
+
+    def stream(
+        self,
+        sql: str,
+        params: tuple = (),
+        *,
+        itersize: int = DEFAULT_STREAM_ITERSIZE,
+        row_type: RowType = "tuple",
+    ) -> Generator[Any]:
+        with self._server_side_cursor(itersize, row_type) as cursor:
+            cursor.execute(sql, params)
+            yield from cursor
+
+    def stream_batches(
+        self,
+        sql: str,
+        params: tuple = (),
+        *,
+        batch_size: int = DEFAULT_STREAM_ITERSIZE,
+        row_type: RowType = "tuple",
+    ) -> Generator[list[Any]]:
+        with self._server_side_cursor(batch_size, row_type) as cursor:
             cursor.execute(sql, params)
+            while batch := cursor.fetchmany(batch_size):
+                yield batch
+
+    def fetch_arrow(self, sql: str, params: tuple = ()) -> pa.Table:
+        with self._cursor(cursor_factory=None) as cursor:
+            return fetch_arrow_table(cursor, sql, params)
+
+    def fetch_dataframe(self, sql: str, params: tuple = ()) -> pd.DataFrame:
+        return self.fetch_arrow(sql, params).to_pandas()
+
+    def iter_arrow(
+        self,
+        sql: str,
+        params: tuple = (),
+        *,
+        block_size_bytes: int = DEFAULT_ARROW_BLOCK_SIZE_BYTES,
+    ) -> Generator[pa.RecordBatch]:
+        with self._cursor(cursor_factory=None) as cursor:
+            yield from iter_arrow_batches(
+                cursor, sql, params, block_size_bytes=block_size_bytes
+            )
+
+    def iter_dataframes(
+        self,
+        sql: str,
+        params: tuple = (),
+        *,
+        block_size_bytes: int = DEFAULT_ARROW_BLOCK_SIZE_BYTES,
+    ) -> Generator[pd.DataFrame]:
+        with self._cursor(cursor_factory=None) as cursor:
+            yield from iter_dataframes(
+                cursor, sql, params, block_size_bytes=block_size_bytes
+            )
+
+    def bulk_load(
+        self,
+        table_name: str,
+        source: BulkLoadSource,
+        *,
+        columns: Sequence[str] | None = None,
+        method: BulkLoadMethod = "copy",
+        copy_format: CopyFormat = "csv",
+        chunk_size_bytes: int = DEFAULT_COPY_CHUNK_SIZE_BYTES,
+        page_size: int = DEFAULT_VALUES_PAGE_SIZE,
+    ) -> BulkLoadResult:
+        self._has_uncommitted_writes = True
+        with self._cursor(cursor_factory=None) as cursor:
+            bulk_load_result = bulk_load(
+                cursor,
+                table_name,
+                source,
+                columns=columns,
+                method=method,
+                copy_format=copy_format,
+                chunk_size_bytes=chunk_size_bytes,
+                page_size=page_size,
+            )
+        self.invalidate_result_cache(table_name)
+        return bulk_load_result
+
+    def _fetchone(self, sql: str, params: tuple) -> RealDictRow | None:
+        with (
+            self._cursor() as cursor,
+            self._instrument(cursor, sql, params),
+        ):
+            self._execute_statement(cursor, sql, params)
+            return cursor.fetchone()
+
+    def _fetchall(self, sql: str, params: tuple) -> list[RealDictRow]:
+        with (
+            self._cursor() as cursor,
+            self._instrument(cursor, sql, params),
+        ):
+            self._execute_statement(cursor, sql, params)
             return cursor.fetchall()
 
+    def _fetch_through_cache(
+        self,
+        kind: str,
+        sql: str,
+        params: tuple,
+        fetch: Callable[[str, tuple], Any],
+    ) -> Any:
+        if self._result_cache is None:
+            return fetch(sql, params)
+        return self._result_cache.get_or_load(
+            kind,
+            sql,
+            params,
+            lambda: fetch(sql, params),
+            store_result=not self._has_uncommitted_writes,
+        )
+
+    def _invalidate_written_tables(self, sql: str) -> None:
+        if self._result_cache is not None:
+            self._result_cache.invalidate_written_tables(sql)
+
+    def _get_statement_cache(self) -> PreparedStatementCache | None:
+        if self._connection is None or not self._prepared_statement_cache_size:
+            return None
+        return get_statement_cache(
+            self._connection, self._prepared_statement_cache_size
+        )
+
+    def _execute_statement(
+        self, cursor: psycopg2.extensions.cursor, sql: str, params: tuple
+    ) -> None:
+        statement_cache = self._get_statement_cache()
+        if statement_cache is None or not params:
+            cursor.execute(sql, params)
+        else:
+            statement_cache.execute(cursor, sql, params)
+
+    @contextmanager
+    def _instrument(
+        self,
+        cursor: psycopg2.extensions.cursor,
+        sql: str,
+        params: tuple | None = None,
+    ) -> Generator[None]:
+        if self._query_recorder is None:
+            yield
+            return
+
+        status = "error"
+        started_at = perf_counter()
+        try:
+            yield
+            status = "success"
+        finally:
+            query_execution = QueryExecution(
+                sql=sql,
+                status=status,
+                elapsed_seconds=perf_counter() - started_at,
+                row_count=max(cursor.rowcount, 0),
+                query_text_bytes=len(cursor.query or b""),
+            )
+            self._query_recorder.record(
+                query_execution,
+                explain=(
+                    None
+                    if params is None
+                    else lambda: self._explain(sql, params)
+                ),
+            )
+
+    def _explain(self, sql: str, params: tuple) -> str | None:
+        if self._connection is None or (
+            self._connection.get_transaction_status()
+            == psycopg2.extensions.TRANSACTION_STATUS_INERROR
+        ):
+            return None
+
+        # EXPLAIN ANALYZE runs the statement a second time.
+        with self._cursor(cursor_factory=None) as cursor:
+            cursor.execute(f"SAVEPOINT {_EXPLAIN_SAVEPOINT_NAME}")
+            try:
+                cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {sql}", params)
+                return "\n".join(row[0] for row in cursor.fetchall())
+            finally:
+                cursor.execute(
+                    f"ROLLBACK TO SAVEPOINT {_EXPLAIN_SAVEPOINT_NAME}"
+                )
+
     def _connect(self) -> None:
-        if self._connection is None:
+        if self._connection is not None:
+            return
+
+        if self._pool is None:
             self._connection = psycopg2.connect(**self._connection_params())
+        else:
+            self._connection = self._pool.acquire()
+
+    @contextmanager
+    def _cursor(
+        self,
+        cursor_factory: type[psycopg2.extensions.cursor] | None = (
+            RealDictCursor
+        ),
+    ) -> Generator[psycopg2.extensions.cursor]:
+        if self._connection is None:
+            raise RuntimeError(
+                "Database connection not established. Use context manager."
+            )
+
+        with self._connection.cursor(cursor_factory=cursor_factory) as cursor:
+            yield cursor
 
     @contextmanager
-    def _cursor(self) -> Generator[psycopg2.extensions.cursor]:
+    def _server_side_cursor(
+        self, itersize: int, row_type: RowType
+    ) -> Generator[psycopg2.extensions.cursor]:
         if self._connection is None:
             raise RuntimeError(
                 "Database connection not established. Use context manager."
             )
+        if itersize < 1:
+            raise ValueError(f"itersize must be positive: {itersize}")
 
-        with self._connection.cursor(cursor_factory=RealDictCursor) as cursor:
+        with self._connection.cursor(
+            name=f"workspace_stream_{next(_SERVER_SIDE_CURSOR_IDS)}",
+            cursor_factory=_ROW_TYPE_CURSOR_FACTORIES[row_type],
+        ) as cursor:
+            cursor.itersize = itersize
             yield cursor
 
     def _commit(self) -> None:
         if self._connection:
             self._connection.commit()
+            self._has_uncommitted_writes = False
 
     def _rollback(self) -> None:
         if self._connection:
             self._connection.rollback()
+            self._has_uncommitted_writes = False
 
     def _close(self) -> None:
-        if self._connection:
-            self._connection.close()
-            self._connection = None
+        if self._connection is None:
+            return
+
+        connection, self._connection = self._connection, None
+        self._has_uncommitted_writes = False
+        if self._pool is None:
+            connection.close()
+        else:
+            self._pool.release(connection)
 
     def __del__(self) -> None:
         self._close()
@@ -104,11 +413,13 @@ class PostgresClient:
         exception_value: BaseException | None,
         exception_traceback: TracebackType | None,
     ) -> None:
-        if exception_type:
-            self._rollback()
-        else:
-            self._commit()
-        self._close()
+        try:
+            if exception_type:
+                self._rollback()
+            else:
+                self._commit()
+        finally:
+            self._close()
 
 
 def _how_to_use() -> None:
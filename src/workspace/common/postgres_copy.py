@@ -0,0 +1,363 @@
+import csv
+import json
+import struct
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from datetime import UTC, date, datetime
+from io import StringIO
+from itertools import batched
+from time import perf_counter
+from typing import IO, Any, Literal
+from uuid import UUID
+
+import pandas as pd
+from psycopg2.extensions import encodings
+from psycopg2.extras import execute_values
+
+type CopyFormat = Literal["csv", "binary"]
+type BulkLoadMethod = Literal["copy", "values"]
+type BulkLoadSource = (
+    Iterable[Sequence[Any]] | pd.DataFrame | IO[bytes] | IO[str]
+)
+type _BinaryFieldEncoder = Callable[[Any], bytes]
+
+DEFAULT_COPY_CHUNK_SIZE_BYTES = 1024**2
+DEFAULT_VALUES_PAGE_SIZE = 1000
+_DATAFRAME_ROW_BATCH_SIZE = 10_000
+_BINARY_COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+_BINARY_COPY_TRAILER = struct.pack("!h", -1)
+_BINARY_NULL_FIELD = struct.pack("!i", -1)
+_POSTGRES_EPOCH_DATE = date(2000, 1, 1)
+_POSTGRES_EPOCH_DATETIME = datetime(2000, 1, 1, tzinfo=UTC)
+_COLUMN_TYPE_NAMES_SQL = """
+SELECT attname, atttypid::regtype::text
+FROM pg_attribute
+WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped
+ORDER BY attnum
+"""
+
+
+@dataclass(frozen=True)
+class BulkLoadResult:
+    row_count: int
+    elapsed_seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        if self.elapsed_seconds <= 0.0:
+            return 0.0
+        return self.row_count / self.elapsed_seconds
+
+
+class _CopyChunkReader:
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = chunks
+
+    def read(self, size: int = -1) -> bytes:
+        return next(self._chunks, b"")
+
+
+def _quote_identifier(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _quote_table_name(table_name: str) -> str:
+    return ".".join(
+        _quote_identifier(name_part) for name_part in table_name.split(".")
+    )
+
+
+def _format_column_list(columns: Sequence[str] | None) -> str:
+    if columns is None:
+        return ""
+    return " (" + ", ".join(map(_quote_identifier, columns)) + ")"
+
+
+def _create_copy_sql(
+    table_name: str,
+    columns: Sequence[str] | None,
+    copy_format: CopyFormat,
+) -> str:
+    return (
+        f"COPY {_quote_table_name(table_name)}"
+        f"{_format_column_list(columns)} FROM STDIN "
+        f"WITH (FORMAT {copy_format})"
+    )
+
+
+def _encode_timestamp(value: datetime) -> bytes:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    elapsed = value - _POSTGRES_EPOCH_DATETIME
+    return struct.pack(
+        "!q",
+        (elapsed.days * 86_400 + elapsed.seconds) * 1_000_000
+        + elapsed.microseconds,
+    )
+
+
+def _encode_date(value: date) -> bytes:
+    if isinstance(value, datetime):
+        value = value.date()
+    return struct.pack("!i", (value - _POSTGRES_EPOCH_DATE).days)
+
+
+def _encode_uuid(value: UUID | str) -> bytes:
+    return (value if isinstance(value, UUID) else UUID(value)).bytes
+
+
+def _create_binary_field_encoders(
+    text_encoding: str,
+) -> dict[str, _BinaryFieldEncoder]:
+    def encode_text(value: Any) -> bytes:
+        return str(value).encode(text_encoding)
+
+    def encode_json(value: Any) -> bytes:
+        return json.dumps(value).encode(text_encoding)
+
+    return {
+        "smallint": struct.Struct("!h").pack,
+        "integer": struct.Struct("!i").pack,
+        "bigint": struct.Struct("!q").pack,
+        "real": struct.Struct("!f").pack,
+        "double precision": struct.Struct("!d").pack,
+        "boolean": struct.Struct("!?").pack,
+        "text": encode_text,
+        "character varying": encode_text,
+        "character": encode_text,
+        "bytea": bytes,
+        "date": _encode_date,
+        "timestamp without time zone": _encode_timestamp,
+        "timestamp with time zone": _encode_timestamp,
+        "uuid": _encode_uuid,
+        "json": encode_json,
+        "jsonb": lambda value: b"\x01" + encode_json(value),
+    }
+
+
+def _select_binary_field_encoders(
+    column_type_names: Sequence[str], text_encoding: str
+) -> list[_BinaryFieldEncoder]:
+    binary_field_encoders = _create_binary_field_encoders(text_encoding)
+    unsupported_type_names = sorted(
+        set(column_type_names) - binary_field_encoders.keys()
+    )
+    if unsupported_type_names:
+        raise ValueError(
+            "Binary COPY does not support column types "
+            f"{unsupported_type_names}. Use copy_format='csv' instead."
+        )
+
+    return [
+        binary_field_encoders[column_type_name]
+        for column_type_name in column_type_names
+    ]
+
+
+def _encode_binary_row(
+    row: Sequence[Any], field_encoders: Sequence[_BinaryFieldEncoder]
+) -> bytes:
+    encoded_fields = [struct.pack("!h", len(field_encoders))]
+    for value, encode_field in zip(row, field_encoders, strict=True):
+        if value is None:
+            encoded_fields.append(_BINARY_NULL_FIELD)
+            continue
+        encoded_field = encode_field(value)
+        encoded_fields.append(struct.pack("!i", len(encoded_field)))
+        encoded_fields.append(encoded_field)
+
+    return b"".join(encoded_fields)
+
+
+def _iter_binary_copy_chunks(
+    rows: Iterable[Sequence[Any]],
+    field_encoders: Sequence[_BinaryFieldEncoder],
+    chunk_size_bytes: int = DEFAULT_COPY_CHUNK_SIZE_BYTES,
+) -> Iterator[bytes]:
+    buffer = bytearray(_BINARY_COPY_HEADER)
+    for row in rows:
+        buffer += _encode_binary_row(row, field_encoders)
+        if len(buffer) >= chunk_size_bytes:
+            yield bytes(buffer)
+            buffer.clear()
+
+    buffer += _BINARY_COPY_TRAILER
+    yield bytes(buffer)
+
+
+def _to_csv_field(value: Any) -> Any:
+    if isinstance(value, bytes | bytearray | memoryview):
+        return "\\x" + bytes(value).hex()
+    if isinstance(value, dict | list):
+        return json.dumps(value)
+    return value
+
+
+def _iter_csv_copy_chunks(
+    rows: Iterable[Sequence[Any]],
+    text_encoding: str = "utf-8",
+    chunk_size_bytes: int = DEFAULT_COPY_CHUNK_SIZE_BYTES,
+) -> Iterator[bytes]:
+    buffer = StringIO()
+    csv_writer = csv.writer(
+        buffer, quoting=csv.QUOTE_NOTNULL, lineterminator="\n"
+    )
+    for row in rows:
+        csv_writer.writerow([_to_csv_field(value) for value in row])
+        if buffer.tell() >= chunk_size_bytes:
+            yield buffer.getvalue().encode(text_encoding)
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode(text_encoding)
+
+
+def _iter_dataframe_rows(
+    dataframe: pd.DataFrame,
+) -> Iterator[tuple[Any, ...]]:
+    for start_index in range(0, len(dataframe), _DATAFRAME_ROW_BATCH_SIZE):
+        row_batch = dataframe.iloc[
+            start_index : start_index + _DATAFRAME_ROW_BATCH_SIZE
+        ]
+        yield from (
+            row_batch.astype(object)
+            .where(row_batch.notna(), None)
+            .itertuples(index=False, name=None)
+        )
+
+
+def _fetch_column_type_names(
+    cursor: Any, table_name: str, columns: Sequence[str] | None
+) -> list[str]:
+    cursor.execute(_COLUMN_TYPE_NAMES_SQL, (_quote_table_name(table_name),))
+    column_type_names: dict[str, str] = dict(cursor.fetchall())
+    selected_columns = (
+        list(column_type_names) if columns is None else list(columns)
+    )
+    unknown_columns = [
+        column
+        for column in selected_columns
+        if column not in column_type_names
+    ]
+    if unknown_columns:
+        raise ValueError(
+            f"Unknown columns for table {table_name}: {unknown_columns}"
+        )
+
+    return [column_type_names[column] for column in selected_columns]
+
+
+def _iter_copy_chunks(
+    cursor: Any,
+    table_name: str,
+    rows: Iterable[Sequence[Any]],
+    columns: Sequence[str] | None,
+    copy_format: CopyFormat,
+    chunk_size_bytes: int,
+) -> Iterator[bytes]:
+    text_encoding = encodings[cursor.connection.encoding]
+    if copy_format == "csv":
+        return _iter_csv_copy_chunks(rows, text_encoding, chunk_size_bytes)
+
+    field_encoders = _select_binary_field_encoders(
+        _fetch_column_type_names(cursor, table_name, columns), text_encoding
+    )
+    return _iter_binary_copy_chunks(rows, field_encoders, chunk_size_bytes)
+
+
+def _resolve_rows(
+    source: BulkLoadSource, columns: Sequence[str] | None
+) -> tuple[Iterable[Sequence[Any]], Sequence[str] | None]:
+    if isinstance(source, pd.DataFrame):
+        dataframe_columns = [str(column) for column in source.columns]
+        return _iter_dataframe_rows(source), columns or dataframe_columns
+    return source, columns
+
+
+def _copy_from_source(
+    cursor: Any,
+    table_name: str,
+    source: BulkLoadSource,
+    columns: Sequence[str] | None,
+    copy_format: CopyFormat,
+    chunk_size_bytes: int,
+) -> int:
+    if hasattr(source, "read"):
+        copy_file: Any = source
+    else:
+        rows, columns = _resolve_rows(source, columns)
+        copy_file = _CopyChunkReader(
+            _iter_copy_chunks(
+                cursor,
+                table_name,
+                rows,
+                columns,
+                copy_format,
+                chunk_size_bytes,
+            )
+        )
+
+    cursor.copy_expert(
+        _create_copy_sql(table_name, columns, copy_format),
+        copy_file,
+        size=chunk_size_bytes,
+    )
+    return int(cursor.rowcount)
+
+
+def _insert_values_from_source(
+    cursor: Any,
+    table_name: str,
+    source: BulkLoadSource,
+    columns: Sequence[str] | None,
+    page_size: int,
+) -> int:
+    if hasattr(source, "read"):
+        raise ValueError(
+            "method='values' requires an iterable of rows or a DataFrame."
+        )
+
+    rows, columns = _resolve_rows(source, columns)
+    insert_sql = (
+        f"INSERT INTO {_quote_table_name(table_name)}"
+        f"{_format_column_list(columns)} VALUES %s"
+    )
+    row_count = 0
+    for page in batched(rows, page_size, strict=False):
+        execute_values(cursor, insert_sql, page, page_size=page_size)
+        row_count += len(page)
+
+    return row_count
+
+
+def bulk_load(
+    cursor: Any,
+    table_name: str,
+    source: BulkLoadSource,
+    *,
+    columns: Sequence[str] | None = None,
+    method: BulkLoadMethod = "copy",
+    copy_format: CopyFormat = "csv",
+    chunk_size_bytes: int = DEFAULT_COPY_CHUNK_SIZE_BYTES,
+    page_size: int = DEFAULT_VALUES_PAGE_SIZE,
+) -> BulkLoadResult:
+    if chunk_size_bytes < 1 or page_size < 1:
+        raise ValueError(
+            "chunk_size_bytes and page_size must be positive: "
+            f"chunk_size_bytes={chunk_size_bytes}, page_size={page_size}"
+        )
+
+    start_time = perf_counter()
+    if method == "copy":
+        row_count = _copy_from_source(
+            cursor, table_name, source, columns, copy_format, chunk_size_bytes
+        )
+    else:
+        row_count = _insert_values_from_source(
+            cursor, table_name, source, columns, page_size
+        )
+
+    return BulkLoadResult(
+        row_count=row_count, elapsed_seconds=perf_counter() - start_time
+    )
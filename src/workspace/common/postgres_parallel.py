@@ -0,0 +1,337 @@
+from collections.abc import Generator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from math import ceil
+from queue import Full, Queue
+from threading import Event
+from time import perf_counter
+from typing import Any
+
+import pandas as pd
+import pyarrow as pa
+from psycopg2.extensions import encodings
+
+from workspace.common.postgres_arrow import (
+    DEFAULT_ARROW_BLOCK_SIZE_BYTES,
+    describe_arrow_schema,
+    iter_arrow_batches,
+)
+from workspace.common.postgres_pool import PostgresConnectionPool
+
+PARTITION_PLACEHOLDER = "{partition}"
+DEFAULT_MAX_PENDING_BATCHES = 8
+_QUEUE_PUT_TIMEOUT_SECONDS = 0.1
+_RELATION_PAGE_COUNT_SQL = (
+    "SELECT ceil(pg_relation_size(%s::regclass)::numeric / "
+    "current_setting('block_size')::int)::bigint"
+)
+
+
+@dataclass(frozen=True)
+class QueryPartition:
+    predicate: str
+    params: tuple = ()
+
+
+@dataclass(frozen=True)
+class PartitionTiming:
+    partition_index: int
+    predicate: str
+    row_count: int
+    batch_count: int
+    elapsed_seconds: float
+
+
+@dataclass(frozen=True)
+class _PartitionBatch:
+    partition_index: int
+    record_batch: pa.RecordBatch | None
+
+
+def key_range_partitions(
+    column: str, lower: int, upper: int, partition_count: int
+) -> list[QueryPartition]:
+    if partition_count < 1:
+        raise ValueError(
+            f"partition_count must be positive: {partition_count}"
+        )
+    if lower > upper:
+        raise ValueError(f"lower must not exceed upper: {lower} > {upper}")
+
+    step = max(ceil((upper - lower + 1) / partition_count), 1)
+    bounds = list(range(lower + step, upper + 1, step))[: partition_count - 1]
+    if not bounds:
+        return [QueryPartition("TRUE")]
+
+    return [
+        QueryPartition(f"{column} < %s OR {column} IS NULL", (bounds[0],)),
+        *(
+            QueryPartition(f"{column} >= %s AND {column} < %s", (start, end))
+            for start, end in zip(bounds, bounds[1:], strict=False)
+        ),
+        QueryPartition(f"{column} >= %s", (bounds[-1],)),
+    ]
+
+
+def hash_partitions(column: str, partition_count: int) -> list[QueryPartition]:
+    if partition_count < 1:
+        raise ValueError(
+            f"partition_count must be positive: {partition_count}"
+        )
+
+    return [
+        QueryPartition(
+            f"mod(coalesce(hashtext({column}::text), 0) & 2147483647, "
+            f"{partition_count}) = %s",
+            (partition_index,),
+        )
+        for partition_index in range(partition_count)
+    ]
+
+
+def ctid_partitions(
+    page_count: int, partition_count: int
+) -> list[QueryPartition]:
+    if partition_count < 1:
+        raise ValueError(
+            f"partition_count must be positive: {partition_count}"
+        )
+
+    step = max(ceil(page_count / partition_count), 1)
+    bounds = list(range(step, page_count, step))[: partition_count - 1]
+    if not bounds:
+        return [QueryPartition("TRUE")]
+
+    tids = [f"({bound},0)" for bound in bounds]
+    return [
+        QueryPartition("ctid < %s::tid", (tids[0],)),
+        *(
+            QueryPartition("ctid >= %s::tid AND ctid < %s::tid", (start, end))
+            for start, end in zip(tids, tids[1:], strict=False)
+        ),
+        QueryPartition("ctid >= %s::tid", (tids[-1],)),
+    ]
+
+
+def _render_partition_sql(
+    cursor: Any, sql: str, partition: QueryPartition
+) -> str:
+    text_encoding = encodings[cursor.connection.encoding]
+    predicate = cursor.mogrify(partition.predicate, partition.params).decode(
+        text_encoding
+    )
+    return sql.replace(
+        PARTITION_PLACEHOLDER, f"({predicate.replace('%', '%%')})"
+    )
+
+
+class ParallelQueryExecutor:
+    def __init__(
+        self,
+        pool: PostgresConnectionPool,
+        *,
+        max_workers: int = 4,
+        max_pending_batches: int = DEFAULT_MAX_PENDING_BATCHES,
+        block_size_bytes: int = DEFAULT_ARROW_BLOCK_SIZE_BYTES,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be positive: {max_workers}")
+        if max_pending_batches < 1:
+            raise ValueError(
+                f"max_pending_batches must be positive: {max_pending_batches}"
+            )
+
+        self._pool = pool
+        self._max_workers = max_workers
+        self._max_pending_batches = max_pending_batches
+        self._block_size_bytes = block_size_bytes
+        self._partition_timings: list[PartitionTiming] = []
+
+    @property
+    def partition_timings(self) -> list[PartitionTiming]:
+        return list(self._partition_timings)
+
+    def count_relation_pages(self, table_name: str) -> int:
+        connection = self._pool.acquire()
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(_RELATION_PAGE_COUNT_SQL, (table_name,))
+                (page_count,) = cursor.fetchone()
+            connection.rollback()
+        finally:
+            self._pool.release(connection)
+        return page_count
+
+    def iter_arrow(
+        self,
+        sql: str,
+        partitions: Sequence[QueryPartition],
+        params: tuple = (),
+    ) -> Generator[pa.RecordBatch]:
+        if PARTITION_PLACEHOLDER not in sql:
+            raise ValueError(
+                f"sql must contain the {PARTITION_PLACEHOLDER} placeholder."
+            )
+        if not partitions:
+            raise ValueError("partitions must not be empty.")
+
+        self._partition_timings = []
+        batch_queue: Queue[_PartitionBatch] = Queue(self._max_pending_batches)
+        cancel_event = Event()
+        executor = ThreadPoolExecutor(self._max_workers)
+        try:
+            futures = [
+                executor.submit(
+                    self._run_partition,
+                    sql,
+                    params,
+                    partition_index,
+                    partition,
+                    batch_queue,
+                    cancel_event,
+                )
+                for partition_index, partition in enumerate(partitions)
+            ]
+            yield from self._drain_batches(batch_queue, futures)
+        finally:
+            cancel_event.set()
+            executor.shutdown(cancel_futures=True)
+
+    def fetch_arrow(
+        self,
+        sql: str,
+        partitions: Sequence[QueryPartition],
+        params: tuple = (),
+    ) -> pa.Table:
+        record_batches = list(self.iter_arrow(sql, partitions, params))
+        if record_batches:
+            return pa.Table.from_batches(record_batches)
+        return self._describe_empty_table(sql, partitions[0], params)
+
+    def fetch_dataframe(
+        self,
+        sql: str,
+        partitions: Sequence[QueryPartition],
+        params: tuple = (),
+    ) -> pd.DataFrame:
+        return self.fetch_arrow(sql, partitions, params).to_pandas()
+
+    def _drain_batches(
+        self,
+        batch_queue: Queue[_PartitionBatch],
+        futures: Sequence[Future[PartitionTiming]],
+    ) -> Generator[pa.RecordBatch]:
+        running_partition_count = len(futures)
+        while running_partition_count:
+            partition_batch = batch_queue.get()
+            if partition_batch.record_batch is not None:
+                yield partition_batch.record_batch
+                continue
+
+            running_partition_count -= 1
+            self._partition_timings.append(
+                futures[partition_batch.partition_index].result()
+            )
+        self._partition_timings.sort(
+            key=lambda partition_timing: partition_timing.partition_index
+        )
+
+    def _run_partition(
+        self,
+        sql: str,
+        params: tuple,
+        partition_index: int,
+        partition: QueryPartition,
+        batch_queue: Queue[_PartitionBatch],
+        cancel_event: Event,
+    ) -> PartitionTiming:
+        started_at = perf_counter()
+        row_count, batch_count = 0, 0
+        try:
+            if not cancel_event.is_set():
+                row_count, batch_count = self._stream_partition(
+                    sql,
+                    params,
+                    partition_index,
+                    partition,
+                    batch_queue,
+                    cancel_event,
+                )
+        finally:
+            _put_until_cancelled(
+                batch_queue,
+                _PartitionBatch(partition_index, None),
+                cancel_event,
+            )
+
+        return PartitionTiming(
+            partition_index=partition_index,
+            predicate=partition.predicate,
+            row_count=row_count,
+            batch_count=batch_count,
+            elapsed_seconds=perf_counter() - started_at,
+        )
+
+    def _stream_partition(
+        self,
+        sql: str,
+        params: tuple,
+        partition_index: int,
+        partition: QueryPartition,
+        batch_queue: Queue[_PartitionBatch],
+        cancel_event: Event,
+    ) -> tuple[int, int]:
+        row_count, batch_count = 0, 0
+        connection = self._pool.acquire()
+        try:
+            with connection.cursor() as cursor:
+                for record_batch in iter_arrow_batches(
+                    cursor,
+                    _render_partition_sql(cursor, sql, partition),
+                    params,
+                    block_size_bytes=self._block_size_bytes,
+                ):
+                    row_count += record_batch.num_rows
+                    batch_count += 1
+                    if not _put_until_cancelled(
+                        batch_queue,
+                        _PartitionBatch(partition_index, record_batch),
+                        cancel_event,
+                    ):
+                        break
+            connection.rollback()
+        finally:
+            self._pool.release(connection)
+        return row_count, batch_count
+
+    def _describe_empty_table(
+        self, sql: str, partition: QueryPartition, params: tuple
+    ) -> pa.Table:
+        connection = self._pool.acquire()
+        try:
+            with connection.cursor() as cursor:
+                schema = describe_arrow_schema(
+                    cursor,
+                    _render_partition_sql(cursor, sql, partition),
+                    params,
+                )
+            connection.rollback()
+        finally:
+            self._pool.release(connection)
+        return schema.empty_table()
+
+
+def _put_until_cancelled(
+    batch_queue: Queue[_PartitionBatch],
+    partition_batch: _PartitionBatch,
+    cancel_event: Event,
+) -> bool:
+    while not cancel_event.is_set():
+        try:
+            batch_queue.put(
+                partition_batch, timeout=_QUEUE_PUT_TIMEOUT_SECONDS
+            )
+        except Full:
+            continue
+        return True
+    return False
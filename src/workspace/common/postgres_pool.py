@@ -0,0 +1,316 @@
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
+from threading import Condition
+from time import monotonic
+from types import TracebackType
+from typing import Self
+
+import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+from workspace.common.postgres_settings import PostgresSettings
+
+type ConnectionFactory = Callable[[], psycopg2.extensions.connection]
+
+
+@dataclass(frozen=True)
+class PoolMetrics:
+    size: int
+    idle_count: int
+    in_use_count: int
+    acquire_count: int
+    wait_count: int
+    wait_seconds_sum: float
+    max_wait_seconds: float
+    acquire_timeout_count: int
+    created_count: int
+    closed_count: int
+    health_check_failure_count: int
+
+
+@dataclass
+class _PooledConnection:
+    connection: psycopg2.extensions.connection
+    created_at: float
+    last_used_at: float
+
+
+@dataclass
+class PoolCounters:
+    acquire_count: int = 0
+    wait_count: int = 0
+    wait_seconds_sum: float = 0.0
+    max_wait_seconds: float = 0.0
+    acquire_timeout_count: int = 0
+    created_count: int = 0
+    closed_count: int = 0
+    health_check_failure_count: int = 0
+
+    def record_wait(self, wait_seconds: float) -> None:
+        if wait_seconds <= 0.0:
+            return
+
+        self.wait_count += 1
+        self.wait_seconds_sum += wait_seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+    def to_metrics(
+        self, idle_count: int, in_use_count: int, pending_count: int = 0
+    ) -> PoolMetrics:
+        return PoolMetrics(
+            size=idle_count + in_use_count + pending_count,
+            idle_count=idle_count,
+            in_use_count=in_use_count,
+            acquire_count=self.acquire_count,
+            wait_count=self.wait_count,
+            wait_seconds_sum=self.wait_seconds_sum,
+            max_wait_seconds=self.max_wait_seconds,
+            acquire_timeout_count=self.acquire_timeout_count,
+            created_count=self.created_count,
+            closed_count=self.closed_count,
+            health_check_failure_count=self.health_check_failure_count,
+        )
+
+
+class PostgresConnectionPool:
+    def __init__(
+        self,
+        connection_factory: ConnectionFactory,
+        *,
+        min_size: int = 1,
+        max_size: int = 10,
+        acquire_timeout_seconds: float = 30.0,
+        idle_timeout_seconds: float = 300.0,
+        max_lifetime_seconds: float = 3600.0,
+        health_check_idle_seconds: float = 5.0,
+        health_check_query: str = "SELECT 1",
+    ) -> None:
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError(
+                "Pool sizes must satisfy 0 <= min_size <= max_size and "
+                f"max_size >= 1: min_size={min_size}, max_size={max_size}"
+            )
+
+        self._connection_factory = connection_factory
+        self._min_size = min_size
+        self._max_size = max_size
+        self._acquire_timeout_seconds = acquire_timeout_seconds
+        self._idle_timeout_seconds = idle_timeout_seconds
+        self._max_lifetime_seconds = max_lifetime_seconds
+        self._health_check_idle_seconds = health_check_idle_seconds
+        self._health_check_query = health_check_query
+        self._condition = Condition()
+        self._idle_connections: deque[_PooledConnection] = deque()
+        self._in_use_connections: dict[int, _PooledConnection] = {}
+        self._pending_count = 0
+        self._counters = PoolCounters()
+        self._closed = False
+
+        for _ in range(min_size):
+            self._idle_connections.append(self._create_pooled_connection())
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: PostgresSettings,
+        *,
+        min_size: int = 1,
+        max_size: int = 10,
+        acquire_timeout_seconds: float = 30.0,
+        idle_timeout_seconds: float = 300.0,
+        max_lifetime_seconds: float = 3600.0,
+    ) -> Self:
+        return cls(
+            partial(psycopg2.connect, **settings.to_connection_params()),
+            min_size=min_size,
+            max_size=max_size,
+            acquire_timeout_seconds=acquire_timeout_seconds,
+            idle_timeout_seconds=idle_timeout_seconds,
+            max_lifetime_seconds=max_lifetime_seconds,
+        )
+
+    @property
+    def size(self) -> int:
+        return (
+            len(self._idle_connections)
+            + len(self._in_use_connections)
+            + self._pending_count
+        )
+
+    def acquire(self) -> psycopg2.extensions.connection:
+        acquire_start_time = monotonic()
+        while True:
+            pooled_connection = self._checkout(acquire_start_time)
+            try:
+                if pooled_connection is None:
+                    pooled_connection = self._create_pooled_connection()
+                elif not self._is_reusable(pooled_connection):
+                    self._discard(pooled_connection)
+                    pooled_connection = None
+            finally:
+                self._finish_checkout(pooled_connection)
+
+            if pooled_connection is not None:
+                return pooled_connection.connection
+
+    def release(
+        self,
+        connection: psycopg2.extensions.connection,
+        *,
+        discard: bool = False,
+    ) -> None:
+        with self._condition:
+            pooled_connection = self._in_use_connections.pop(
+                id(connection), None
+            )
+        if pooled_connection is None:
+            raise ValueError("Connection was not acquired from this pool.")
+
+        if discard or not self._is_returnable(pooled_connection):
+            self._discard(pooled_connection)
+            return
+
+        with self._condition:
+            if self._closed:
+                self._close_connection(pooled_connection)
+                return
+            pooled_connection.last_used_at = monotonic()
+            self._idle_connections.append(pooled_connection)
+            self._prune_idle_connections()
+            self._condition.notify()
+
+    def metrics(self) -> PoolMetrics:
+        with self._condition:
+            return self._counters.to_metrics(
+                len(self._idle_connections),
+                len(self._in_use_connections),
+                self._pending_count,
+            )
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            while self._idle_connections:
+                self._close_connection(self._idle_connections.popleft())
+            self._condition.notify_all()
+
+    def _checkout(self, acquire_start_time: float) -> _PooledConnection | None:
+        deadline = acquire_start_time + self._acquire_timeout_seconds
+        wait_start_time = monotonic()
+        wait_seconds = 0.0
+        with self._condition:
+            self._prune_idle_connections()
+            while True:
+                if self._closed:
+                    raise RuntimeError("Connection pool has been closed.")
+                if self._idle_connections or self.size < self._max_size:
+                    break
+                remaining_seconds = deadline - monotonic()
+                if remaining_seconds <= 0:
+                    self._counters.acquire_timeout_count += 1
+                    raise TimeoutError(
+                        "Timed out waiting for a pooled connection after "
+                        f"{self._acquire_timeout_seconds} seconds."
+                    )
+                self._condition.wait(remaining_seconds)
+                wait_seconds = monotonic() - wait_start_time
+
+            self._counters.record_wait(wait_seconds)
+            self._pending_count += 1
+            if self._idle_connections:
+                return self._idle_connections.pop()
+            return None
+
+    def _finish_checkout(
+        self, pooled_connection: _PooledConnection | None
+    ) -> None:
+        with self._condition:
+            self._pending_count -= 1
+            if pooled_connection is None:
+                self._condition.notify()
+                return
+
+            self._counters.acquire_count += 1
+            self._in_use_connections[id(pooled_connection.connection)] = (
+                pooled_connection
+            )
+
+    def _create_pooled_connection(self) -> _PooledConnection:
+        connection = self._connection_factory()
+        created_at = monotonic()
+        with self._condition:
+            self._counters.created_count += 1
+        return _PooledConnection(
+            connection=connection,
+            created_at=created_at,
+            last_used_at=created_at,
+        )
+
+    def _has_exceeded_lifetime(
+        self, pooled_connection: _PooledConnection
+    ) -> bool:
+        return (
+            monotonic() - pooled_connection.created_at
+            >= self._max_lifetime_seconds
+        )
+
+    def _is_reusable(self, pooled_connection: _PooledConnection) -> bool:
+        if pooled_connection.connection.closed or self._has_exceeded_lifetime(
+            pooled_connection
+        ):
+            return False
+        if (
+            monotonic() - pooled_connection.last_used_at
+            < self._health_check_idle_seconds
+        ):
+            return True
+
+        try:
+            with pooled_connection.connection.cursor() as cursor:
+                cursor.execute(self._health_check_query)
+            pooled_connection.connection.rollback()
+        except psycopg2.Error:
+            with self._condition:
+                self._counters.health_check_failure_count += 1
+            return False
+        return True
+
+    def _is_returnable(self, pooled_connection: _PooledConnection) -> bool:
+        connection = pooled_connection.connection
+        return (
+            not connection.closed
+            and connection.get_transaction_status() == TRANSACTION_STATUS_IDLE
+            and not self._has_exceeded_lifetime(pooled_connection)
+        )
+
+    def _prune_idle_connections(self) -> None:
+        while self._idle_connections and self.size > self._min_size:
+            oldest_idle_connection = self._idle_connections[0]
+            if (
+                monotonic() - oldest_idle_connection.last_used_at
+                < self._idle_timeout_seconds
+            ):
+                return
+            self._close_connection(self._idle_connections.popleft())
+
+    def _discard(self, pooled_connection: _PooledConnection) -> None:
+        with self._condition:
+            self._close_connection(pooled_connection)
+            self._condition.notify()
+
+    def _close_connection(self, pooled_connection: _PooledConnection) -> None:
+        self._counters.closed_count += 1
+        pooled_connection.connection.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception_value: BaseException | None,
+        exception_traceback: TracebackType | None,
+    ) -> None:
+        self.close()
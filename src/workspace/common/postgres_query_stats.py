@@ -0,0 +1,187 @@
+import json
+import logging
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from threading import Lock
+from typing import Any
+
+from workspace.common.performance_metrics import LatencyHistogram
+
+_ROUND_DIGITS = 6
+_SUMMARY_PERCENTILES = (50.0, 95.0, 99.0)
+_STRING_LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'")
+_COMMENT_PATTERN = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_PLACEHOLDER_PATTERN = re.compile(
+    r"%\([^)]*\)s|%s|\$\d+|\b\d+(?:\.\d+)?(?:e[+-]?\d+)?\b", re.IGNORECASE
+)
+_VALUE_LIST_PATTERN = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_REPEATED_VALUE_LIST_PATTERN = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_EXPLAINABLE_SQL_PATTERN = re.compile(r"^\s*(?:select|values)\b", re.I)
+_LOGGER = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1024)
+def fingerprint_sql(sql: str) -> str:
+    normalized_sql = _STRING_LITERAL_PATTERN.sub("?", sql)
+    normalized_sql = _COMMENT_PATTERN.sub(" ", normalized_sql)
+    normalized_sql = _PLACEHOLDER_PATTERN.sub("?", normalized_sql)
+    normalized_sql = _VALUE_LIST_PATTERN.sub("(?)", normalized_sql)
+    normalized_sql = _REPEATED_VALUE_LIST_PATTERN.sub("(?)", normalized_sql)
+    return _WHITESPACE_PATTERN.sub(" ", normalized_sql).strip().lower()
+
+
+@dataclass(frozen=True)
+class QueryExecution:
+    sql: str
+    status: str
+    elapsed_seconds: float
+    row_count: int
+    query_text_bytes: int
+
+    @property
+    def fingerprint(self) -> str:
+        return fingerprint_sql(self.sql)
+
+
+class QueryStatistics:
+    def __init__(self, fingerprint: str) -> None:
+        self.fingerprint = fingerprint
+        self.count = 0
+        self.error_count = 0
+        self.elapsed_seconds_sum = 0.0
+        self.row_count_sum = 0
+        self.query_text_bytes_sum = 0
+        self.latency_histogram = LatencyHistogram()
+
+    def record(self, query_execution: QueryExecution) -> None:
+        self.count += 1
+        if query_execution.status == "error":
+            self.error_count += 1
+        self.elapsed_seconds_sum += query_execution.elapsed_seconds
+        self.row_count_sum += query_execution.row_count
+        self.query_text_bytes_sum += query_execution.query_text_bytes
+        self.latency_histogram.record(query_execution.elapsed_seconds)
+
+    def summarize(self) -> dict[str, Any]:
+        latency_payload = {
+            f"p{percentile:g}": round(
+                self.latency_histogram.percentile(percentile), _ROUND_DIGITS
+            )
+            for percentile in _SUMMARY_PERCENTILES
+        }
+        latency_payload["max"] = round(
+            self.latency_histogram.max_seconds, _ROUND_DIGITS
+        )
+
+        return {
+            "fingerprint": self.fingerprint,
+            "count": self.count,
+            "error_count": self.error_count,
+            "elapsed_seconds_sum": round(
+                self.elapsed_seconds_sum, _ROUND_DIGITS
+            ),
+            "latency_seconds": latency_payload,
+            "row_count_sum": self.row_count_sum,
+            "query_text_bytes_sum": self.query_text_bytes_sum,
+        }
+
+
+class QueryStatisticsRecorder:
+    def __init__(
+        self,
+        *,
+        slow_query_threshold_seconds: float | None = None,
+        explain_slow_queries: bool = False,
+    ) -> None:
+        if (
+            slow_query_threshold_seconds is not None
+            and slow_query_threshold_seconds < 0
+        ):
+            raise ValueError(
+                "slow_query_threshold_seconds must not be negative: "
+                f"{slow_query_threshold_seconds}"
+            )
+
+        self._slow_query_threshold_seconds = slow_query_threshold_seconds
+        self._explain_slow_queries = explain_slow_queries
+        self._query_statistics: dict[str, QueryStatistics] = {}
+        self._lock = Lock()
+
+    def record(
+        self,
+        query_execution: QueryExecution,
+        explain: Callable[[], str | None] | None = None,
+    ) -> None:
+        fingerprint = query_execution.fingerprint
+        with self._lock:
+            query_statistics = self._query_statistics.get(fingerprint)
+            if query_statistics is None:
+                query_statistics = self._query_statistics.setdefault(
+                    fingerprint, QueryStatistics(fingerprint)
+                )
+            query_statistics.record(query_execution)
+
+        if self._is_slow(query_execution):
+            self._log_slow_query(query_execution, explain)
+
+    def summarize(self) -> list[dict[str, Any]]:
+        with self._lock:
+            query_statistics_list = sorted(
+                self._query_statistics.values(),
+                key=lambda query_statistics: (
+                    query_statistics.elapsed_seconds_sum
+                ),
+                reverse=True,
+            )
+            return [
+                query_statistics.summarize()
+                for query_statistics in query_statistics_list
+            ]
+
+    def flush(self) -> None:
+        for summary in self.summarize():
+            _LOGGER.info(json.dumps(summary, separators=(",", ":")))
+
+    def _is_slow(self, query_execution: QueryExecution) -> bool:
+        return (
+            self._slow_query_threshold_seconds is not None
+            and query_execution.elapsed_seconds
+            >= self._slow_query_threshold_seconds
+        )
+
+    def _log_slow_query(
+        self,
+        query_execution: QueryExecution,
+        explain: Callable[[], str | None] | None,
+    ) -> None:
+        slow_query_payload: dict[str, Any] = {
+            "fingerprint": query_execution.fingerprint,
+            "sql": query_execution.sql,
+            "status": query_execution.status,
+            "elapsed_seconds": round(
+                query_execution.elapsed_seconds, _ROUND_DIGITS
+            ),
+            "row_count": query_execution.row_count,
+        }
+        if (
+            self._explain_slow_queries
+            and explain is not None
+            and query_execution.status == "success"
+            and _EXPLAINABLE_SQL_PATTERN.match(query_execution.sql)
+        ):
+            slow_query_payload.update(_explain_safely(explain))
+
+        _LOGGER.warning(json.dumps(slow_query_payload, indent=2))
+
+
+def _explain_safely(explain: Callable[[], str | None]) -> dict[str, str]:
+    try:
+        plan = explain()
+    except Exception as error:
+        _LOGGER.warning("Failed to explain slow query.", exc_info=True)
+        return {"plan_error": f"{type(error).__name__}: {error}"}
+
+    return {} if plan is None else {"plan": plan}
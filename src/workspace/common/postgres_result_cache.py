@@ -0,0 +1,380 @@
+import copy
+import hashlib
+import pickle
+import re
+import sqlite3
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable, Generator, Iterable
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Any, Protocol
+
+DEFAULT_RESULT_CACHE_MAX_SIZE = 1024
+DEFAULT_ACCESS_TIME_RESOLUTION_SECONDS = 1.0
+_MISSING = object()
+_TABLE_REFERENCE_PATTERN = re.compile(
+    r"\b(?:from|join|into|update|table)\s+"
+    r'((?:"[^"]+"|\w+)(?:\s*\.\s*(?:"[^"]+"|\w+))*)',
+    re.IGNORECASE,
+)
+_READ_ONLY_SQL_PATTERN = re.compile(r"^\s*(?:select|values|show)\b", re.I)
+_SQLITE_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS result_cache (
+    cache_key TEXT PRIMARY KEY,
+    payload BLOB NOT NULL,
+    expires_at REAL,
+    accessed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS result_cache_tag (
+    tag TEXT NOT NULL,
+    cache_key TEXT NOT NULL,
+    PRIMARY KEY (tag, cache_key)
+);
+CREATE INDEX IF NOT EXISTS result_cache_tag_cache_key
+ON result_cache_tag (cache_key);
+"""
+_SQLITE_EVICT_SQL = """
+DELETE FROM result_cache WHERE cache_key IN (
+    SELECT cache_key FROM result_cache
+    ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+)
+RETURNING cache_key
+"""
+
+
+@dataclass(frozen=True)
+class ResultCacheStats:
+    size: int
+    hit_count: int
+    miss_count: int
+    eviction_count: int
+    expiration_count: int
+    invalidation_count: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookup_count = self.hit_count + self.miss_count
+        return self.hit_count / lookup_count if lookup_count else 0.0
+
+
+@dataclass(frozen=True)
+class _ResultCacheEntry:
+    value: Any
+    expires_at: float | None
+    tags: frozenset[str]
+
+
+class _ResultStore(Protocol):
+    eviction_count: int
+    expiration_count: int
+
+    def get(self, cache_key: str, now: float) -> Any: ...
+
+    def put(
+        self,
+        cache_key: str,
+        value: Any,
+        expires_at: float | None,
+        tags: frozenset[str],
+    ) -> None: ...
+
+    def invalidate(self, tags: frozenset[str]) -> int: ...
+
+    def clear(self) -> None: ...
+
+    def size(self) -> int: ...
+
+    def close(self) -> None: ...
+
+
+def _normalize_table_name(table_reference: str) -> str:
+    table_name = table_reference.split(".")[-1].strip()
+    if table_name.startswith('"'):
+        return table_name.strip('"')
+    return table_name.lower()
+
+
+def extract_table_tags(sql: str) -> frozenset[str]:
+    return frozenset(
+        _normalize_table_name(table_reference)
+        for table_reference in _TABLE_REFERENCE_PATTERN.findall(sql)
+    )
+
+
+def _create_cache_key(kind: str, sql: str, params: Any) -> str:
+    return hashlib.sha256(repr((kind, sql, params)).encode()).hexdigest()
+
+
+class _MemoryResultStore:
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._entries: OrderedDict[str, _ResultCacheEntry] = OrderedDict()
+        self._cache_keys_by_tag: defaultdict[str, set[str]] = defaultdict(set)
+        self.eviction_count = 0
+        self.expiration_count = 0
+
+    def get(self, cache_key: str, now: float) -> Any:
+        entry = self._entries.get(cache_key)
+        if entry is None:
+            return _MISSING
+        if entry.expires_at is not None and entry.expires_at <= now:
+            self._remove(cache_key)
+            self.expiration_count += 1
+            return _MISSING
+
+        self._entries.move_to_end(cache_key)
+        return copy.deepcopy(entry.value)
+
+    def put(
+        self,
+        cache_key: str,
+        value: Any,
+        expires_at: float | None,
+        tags: frozenset[str],
+    ) -> None:
+        self._remove(cache_key)
+        while len(self._entries) >= self._max_size:
+            self._remove(next(iter(self._entries)))
+            self.eviction_count += 1
+
+        self._entries[cache_key] = _ResultCacheEntry(
+            copy.deepcopy(value), expires_at, tags
+        )
+        for tag in tags:
+            self._cache_keys_by_tag[tag].add(cache_key)
+
+    def invalidate(self, tags: frozenset[str]) -> int:
+        cache_keys = set().union(
+            *(self._cache_keys_by_tag.get(tag, ()) for tag in tags)
+        )
+        for cache_key in cache_keys:
+            self._remove(cache_key)
+        return len(cache_keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._cache_keys_by_tag.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+    def close(self) -> None:
+        self.clear()
+
+    def _remove(self, cache_key: str) -> None:
+        entry = self._entries.pop(cache_key, None)
+        if entry is None:
+            return
+
+        for tag in entry.tags:
+            tagged_cache_keys = self._cache_keys_by_tag[tag]
+            tagged_cache_keys.discard(cache_key)
+            if not tagged_cache_keys:
+                del self._cache_keys_by_tag[tag]
+
+
+class _SqliteResultStore:
+    def __init__(
+        self, path: Path, max_size: int, access_time_resolution_seconds: float
+    ) -> None:
+        self._max_size = max_size
+        self._access_time_resolution_seconds = access_time_resolution_seconds
+        self._connection = sqlite3.connect(
+            path, timeout=30.0, check_same_thread=False, autocommit=True
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SQLITE_SCHEMA_SQL)
+        self.eviction_count = 0
+        self.expiration_count = 0
+
+    def get(self, cache_key: str, now: float) -> Any:
+        row = self._connection.execute(
+            "SELECT payload, expires_at, accessed_at FROM result_cache "
+            "WHERE cache_key = ?",
+            (cache_key,),
+        ).fetchone()
+        if row is None:
+            return _MISSING
+
+        payload, expires_at, accessed_at = row
+        if expires_at is not None and expires_at <= now:
+            self._connection.execute(
+                "DELETE FROM result_cache WHERE cache_key = ?", (cache_key,)
+            )
+            self._delete_tags([(cache_key,)])
+            self.expiration_count += 1
+            return _MISSING
+
+        if now - accessed_at >= self._access_time_resolution_seconds:
+            self._connection.execute(
+                "UPDATE result_cache SET accessed_at = ? WHERE cache_key = ?",
+                (now, cache_key),
+            )
+        return pickle.loads(payload)
+
+    def put(
+        self,
+        cache_key: str,
+        value: Any,
+        expires_at: float | None,
+        tags: frozenset[str],
+    ) -> None:
+        with self._immediate_transaction():
+            self._connection.execute(
+                "INSERT OR REPLACE INTO result_cache "
+                "(cache_key, payload, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (cache_key, pickle.dumps(value), expires_at, time.time()),
+            )
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO result_cache_tag (tag, cache_key) "
+                "VALUES (?, ?)",
+                [(tag, cache_key) for tag in tags],
+            )
+            evicted_rows = self._connection.execute(
+                _SQLITE_EVICT_SQL, (self._max_size,)
+            ).fetchall()
+            self._delete_tags(evicted_rows)
+            self.eviction_count += len(evicted_rows)
+
+    def invalidate(self, tags: frozenset[str]) -> int:
+        placeholders = ", ".join(["?"] * len(tags))
+        with self._immediate_transaction():
+            invalidated_rows = self._connection.execute(
+                "DELETE FROM result_cache WHERE cache_key IN ("
+                "SELECT cache_key FROM result_cache_tag "
+                f"WHERE tag IN ({placeholders})) RETURNING cache_key",
+                tuple(tags),
+            ).fetchall()
+            self._delete_tags(invalidated_rows)
+        return len(invalidated_rows)
+
+    def clear(self) -> None:
+        self._connection.executescript(
+            "DELETE FROM result_cache; DELETE FROM result_cache_tag;"
+        )
+
+    def size(self) -> int:
+        (size,) = self._connection.execute(
+            "SELECT count(*) FROM result_cache"
+        ).fetchone()
+        return size
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def _delete_tags(self, cache_key_rows: list[tuple[str]]) -> None:
+        self._connection.executemany(
+            "DELETE FROM result_cache_tag WHERE cache_key = ?", cache_key_rows
+        )
+
+    @contextmanager
+    def _immediate_transaction(self) -> Generator[None]:
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
+
+
+class ResultCache:
+    def __init__(
+        self,
+        *,
+        max_size: int = DEFAULT_RESULT_CACHE_MAX_SIZE,
+        ttl_seconds: float | None = None,
+        backing_path: str | Path | None = None,
+        access_time_resolution_seconds: float = (
+            DEFAULT_ACCESS_TIME_RESOLUTION_SECONDS
+        ),
+    ) -> None:
+        if max_size < 1:
+            raise ValueError(f"max_size must be positive: {max_size}")
+        if ttl_seconds is not None and ttl_seconds <= 0:
+            raise ValueError(f"ttl_seconds must be positive: {ttl_seconds}")
+
+        self._ttl_seconds = ttl_seconds
+        self._store: _ResultStore = (
+            _MemoryResultStore(max_size)
+            if backing_path is None
+            else _SqliteResultStore(
+                Path(backing_path), max_size, access_time_resolution_seconds
+            )
+        )
+        self._lock = Lock()
+        self._hit_count = 0
+        self._miss_count = 0
+        self._invalidation_count = 0
+
+    def get_or_load(
+        self,
+        kind: str,
+        sql: str,
+        params: Any,
+        load: Callable[[], Any],
+        *,
+        store_result: bool = True,
+    ) -> Any:
+        cache_key = _create_cache_key(kind, sql, params)
+        with self._lock:
+            value = self._store.get(cache_key, time.time())
+            if value is not _MISSING:
+                self._hit_count += 1
+                return value
+            self._miss_count += 1
+
+        value = load()
+        if not store_result:
+            return value
+
+        expires_at = (
+            None
+            if self._ttl_seconds is None
+            else time.time() + self._ttl_seconds
+        )
+        with self._lock:
+            self._store.put(
+                cache_key, value, expires_at, extract_table_tags(sql)
+            )
+        return value
+
+    def invalidate(self, table_names: Iterable[str]) -> int:
+        tags = frozenset(
+            _normalize_table_name(table_name) for table_name in table_names
+        )
+        if not tags:
+            return 0
+
+        with self._lock:
+            invalidated_count = self._store.invalidate(tags)
+            self._invalidation_count += invalidated_count
+        return invalidated_count
+
+    def invalidate_written_tables(self, sql: str) -> int:
+        if _READ_ONLY_SQL_PATTERN.match(sql):
+            return 0
+        return self.invalidate(extract_table_tags(sql))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._store.clear()
+
+    def stats(self) -> ResultCacheStats:
+        with self._lock:
+            return ResultCacheStats(
+                size=self._store.size(),
+                hit_count=self._hit_count,
+                miss_count=self._miss_count,
+                eviction_count=self._store.eviction_count,
+                expiration_count=self._store.expiration_count,
+                invalidation_count=self._invalidation_count,
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._store.close()
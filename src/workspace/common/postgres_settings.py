@@ -16,6 +16,15 @@ class PostgresSettings(BaseSettings):
     postgres_user: str
     postgres_password: str
 
+    def to_connection_params(self) -> dict[str, str | int]:
+        return {
+            "dbname": self.postgres_db_name,
+            "user": self.postgres_user,
+            "password": self.postgres_password,
+            "host": self.postgres_host,
+            "port": self.postgres_port,
+        }
+
 
 @lru_cache
 def load_postgres_settings() -> PostgresSettings:
@@ -0,0 +1,178 @@
+import re
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from itertools import count
+from threading import Lock
+from typing import Any
+from weakref import WeakKeyDictionary
+
+import psycopg2
+
+_PLACEHOLDER_PATTERN = re.compile(r"%[%s]")
+_INVALIDATING_SQLSTATES = frozenset(
+    {
+        "0A000",
+        "42P01",
+        "42703",
+        "42804",
+    }
+)
+_MISSING_STATEMENT_SQLSTATE = "26000"
+_STATEMENT_CACHES: WeakKeyDictionary[Any, "PreparedStatementCache"] = (
+    WeakKeyDictionary()
+)
+_STATEMENT_CACHES_LOCK = Lock()
+
+
+@dataclass(frozen=True)
+class PreparedStatementCacheStats:
+    size: int
+    hit_count: int
+    miss_count: int
+    eviction_count: int
+    invalidation_count: int
+
+
+@dataclass(frozen=True)
+class _PreparedStatement:
+    name: str
+    parameter_count: int
+
+
+def _convert_placeholders(sql: str) -> tuple[str, int]:
+    parameter_count = 0
+
+    def replace_placeholder(match: re.Match[str]) -> str:
+        nonlocal parameter_count
+        if match.group() == "%%":
+            return "%"
+        parameter_count += 1
+        return f"${parameter_count}"
+
+    return _PLACEHOLDER_PATTERN.sub(replace_placeholder, sql), parameter_count
+
+
+def _create_execute_sql(prepared_statement: _PreparedStatement) -> str:
+    placeholders = ", ".join(["%s"] * prepared_statement.parameter_count)
+    return f"EXECUTE {prepared_statement.name} ({placeholders})"
+
+
+class PreparedStatementCache:
+    def __init__(self, max_size: int = 100) -> None:
+        if max_size < 1:
+            raise ValueError(f"max_size must be positive: {max_size}")
+
+        self._max_size = max_size
+        self._prepared_statements: OrderedDict[str, _PreparedStatement] = (
+            OrderedDict()
+        )
+        self._statement_ids = count()
+        self._pending_deallocation_names: list[str] = []
+        self._deallocate_all_pending = False
+        self._hit_count = 0
+        self._miss_count = 0
+        self._eviction_count = 0
+        self._invalidation_count = 0
+
+    def execute(self, cursor: Any, sql: str, params: Sequence[Any]) -> None:
+        prepared_statement = self._get_or_prepare(cursor, sql)
+        try:
+            cursor.execute(_create_execute_sql(prepared_statement), params)
+        except psycopg2.Error as error:
+            self._handle_execute_error(sql, error)
+            raise
+
+    def executemany(
+        self, cursor: Any, sql: str, param_list: Sequence[Sequence[Any]]
+    ) -> None:
+        prepared_statement = self._get_or_prepare(cursor, sql)
+        try:
+            cursor.executemany(
+                _create_execute_sql(prepared_statement), param_list
+            )
+        except psycopg2.Error as error:
+            self._handle_execute_error(sql, error)
+            raise
+
+    def invalidate(self, sql: str) -> None:
+        prepared_statement = self._prepared_statements.pop(sql, None)
+        if prepared_statement is None:
+            return
+
+        self._invalidation_count += 1
+        self._pending_deallocation_names.append(prepared_statement.name)
+
+    def forget(self, sql: str) -> None:
+        if self._prepared_statements.pop(sql, None) is not None:
+            self._invalidation_count += 1
+
+    def reset(self) -> None:
+        self._invalidation_count += len(self._prepared_statements)
+        self._prepared_statements.clear()
+        self._pending_deallocation_names.clear()
+        self._deallocate_all_pending = True
+
+    def stats(self) -> PreparedStatementCacheStats:
+        return PreparedStatementCacheStats(
+            size=len(self._prepared_statements),
+            hit_count=self._hit_count,
+            miss_count=self._miss_count,
+            eviction_count=self._eviction_count,
+            invalidation_count=self._invalidation_count,
+        )
+
+    def _handle_execute_error(self, sql: str, error: psycopg2.Error) -> None:
+        if error.pgcode == _MISSING_STATEMENT_SQLSTATE:
+            self.forget(sql)
+        elif error.pgcode in _INVALIDATING_SQLSTATES:
+            self.invalidate(sql)
+
+    def _get_or_prepare(self, cursor: Any, sql: str) -> _PreparedStatement:
+        prepared_statement = self._prepared_statements.get(sql)
+        if prepared_statement is not None:
+            self._hit_count += 1
+            self._prepared_statements.move_to_end(sql)
+            return prepared_statement
+
+        self._miss_count += 1
+        while len(self._prepared_statements) >= self._max_size:
+            _, evicted_statement = self._prepared_statements.popitem(
+                last=False
+            )
+            self._eviction_count += 1
+            self._pending_deallocation_names.append(evicted_statement.name)
+        self._deallocate_pending(cursor)
+
+        converted_sql, parameter_count = _convert_placeholders(sql)
+        prepared_statement = _PreparedStatement(
+            name=f"workspace_stmt_{next(self._statement_ids)}",
+            parameter_count=parameter_count,
+        )
+        cursor.execute(f"PREPARE {prepared_statement.name} AS {converted_sql}")
+        self._prepared_statements[sql] = prepared_statement
+        return prepared_statement
+
+    def _deallocate_pending(self, cursor: Any) -> None:
+        if self._deallocate_all_pending:
+            cursor.execute("DEALLOCATE ALL")
+            self._deallocate_all_pending = False
+
+        while self._pending_deallocation_names:
+            deallocation_name = self._pending_deallocation_names.pop()
+            try:
+                cursor.execute(f"DEALLOCATE {deallocation_name}")
+            except psycopg2.Error:
+                self.reset()
+                raise
+
+
+def get_statement_cache(
+    connection: Any, max_size: int
+) -> PreparedStatementCache:
+    with _STATEMENT_CACHES_LOCK:
+        statement_cache = _STATEMENT_CACHES.get(connection)
+        if statement_cache is None:
+            statement_cache = PreparedStatementCache(max_size)
+            _STATEMENT_CACHES[connection] = statement_cache
+        return statement_cache
@@ -0,0 +1,367 @@
+from dataclasses import dataclass, field
+from threading import Event, Thread
+from time import perf_counter, thread_time
+from types import TracebackType
+from typing import Any, Self
+
+import psutil
+
+_BYTES_PER_MIB = 1024**2
+_ROUND_DIGITS = 3
+_MINIMUM_INTERVAL_SECONDS = 0.001
+
+
+@dataclass(frozen=True)
+class ResourceSample:
+    elapsed_seconds: float
+    resident_set_size_bytes: int
+    cpu_percent: float
+    read_bytes_per_second: float
+    write_bytes_per_second: float
+
+
+@dataclass(frozen=True)
+class ResourceSpike:
+    elapsed_seconds: float
+    kind: str
+    value: float
+
+
+@dataclass(frozen=True)
+class ResourceSamplingReport:
+    interval_seconds: float
+    samples: list[ResourceSample]
+    spikes: list[ResourceSpike]
+    peak_resident_set_size_bytes: int
+    peak_cpu_percent: float
+    sampled_wall_seconds: float
+    overhead_wall_seconds: float
+    overhead_cpu_seconds: float
+    failed_sample_count: int
+
+    def to_dict(self) -> dict[str, Any]:
+        overhead_cpu_percent = (
+            self.overhead_cpu_seconds / self.sampled_wall_seconds * 100.0
+            if self.sampled_wall_seconds
+            else 0.0
+        )
+        return {
+            "interval_seconds": self.interval_seconds,
+            "sample_count": len(self.samples),
+            "failed_sample_count": self.failed_sample_count,
+            "peak_resident_set_size_mib": round(
+                self.peak_resident_set_size_bytes / _BYTES_PER_MIB,
+                _ROUND_DIGITS,
+            ),
+            "peak_cpu_percent": round(self.peak_cpu_percent, 1),
+            "time_series": [
+                [
+                    round(sample.elapsed_seconds, _ROUND_DIGITS),
+                    round(
+                        sample.resident_set_size_bytes / _BYTES_PER_MIB,
+                        _ROUND_DIGITS,
+                    ),
+                    round(sample.cpu_percent, 1),
+                    round(
+                        sample.read_bytes_per_second / _BYTES_PER_MIB,
+                        _ROUND_DIGITS,
+                    ),
+                    round(
+                        sample.write_bytes_per_second / _BYTES_PER_MIB,
+                        _ROUND_DIGITS,
+                    ),
+                ]
+                for sample in self.samples
+            ],
+            "time_series_columns": [
+                "elapsed_seconds",
+                "resident_set_size_mib",
+                "cpu_percent",
+                "read_mib_per_second",
+                "write_mib_per_second",
+            ],
+            "spikes": [
+                {
+                    "elapsed_seconds": round(
+                        spike.elapsed_seconds, _ROUND_DIGITS
+                    ),
+                    "kind": spike.kind,
+                    "value": round(spike.value, _ROUND_DIGITS),
+                }
+                for spike in self.spikes
+            ],
+            "overhead": {
+                "wall_seconds": round(
+                    self.overhead_wall_seconds, _ROUND_DIGITS
+                ),
+                "cpu_seconds": round(self.overhead_cpu_seconds, _ROUND_DIGITS),
+                "cpu_percent": round(overhead_cpu_percent, 3),
+            },
+        }
+
+
+@dataclass(frozen=True)
+class ResourceSpikeThresholds:
+    resident_set_size_increase_mib: float = 100.0
+    cpu_percent_per_core: float = 90.0
+    io_mib_per_second: float = 100.0
+
+
+@dataclass
+class _RawCounters:
+    wall_time: float
+    cpu_seconds: float
+    read_bytes: int
+    write_bytes: int
+
+
+@dataclass
+class _SamplingState:
+    samples: list[ResourceSample] = field(default_factory=list)
+    spikes: list[ResourceSpike] = field(default_factory=list)
+    peak_resident_set_size_bytes: int = 0
+    peak_cpu_percent: float = 0.0
+    overhead_wall_seconds: float = 0.0
+    overhead_cpu_seconds: float = 0.0
+    sample_stride: int = 1
+    sample_index: int = 0
+    failed_sample_count: int = 0
+    previous_counters: _RawCounters | None = None
+    previous_resident_set_size_bytes: int = 0
+
+
+class ResourceSampler:
+    def __init__(
+        self,
+        *,
+        interval_seconds: float = 0.1,
+        max_samples: int = 10_000,
+        max_spikes: int = 100,
+        spike_thresholds: ResourceSpikeThresholds | None = None,
+    ) -> None:
+        if interval_seconds < _MINIMUM_INTERVAL_SECONDS:
+            raise ValueError(
+                "interval_seconds must be at least "
+                f"{_MINIMUM_INTERVAL_SECONDS}: {interval_seconds}"
+            )
+        if max_samples < 2:
+            raise ValueError(f"max_samples must be at least 2: {max_samples}")
+
+        self._interval_seconds = interval_seconds
+        self._max_samples = max_samples
+        self._max_spikes = max_spikes
+        self._spike_thresholds = spike_thresholds or ResourceSpikeThresholds()
+        self._cpu_count = psutil.cpu_count() or 1
+        self._psutil_process = psutil.Process()
+        self._stop_event = Event()
+        self._thread: Thread | None = None
+        self._state = _SamplingState()
+        self._start_time = 0.0
+        self._stop_time = 0.0
+
+    def start(self) -> None:
+        if self._thread is not None:
+            raise RuntimeError("ResourceSampler has already been started.")
+
+        self._start_time = perf_counter()
+        self._take_sample()
+        self._thread = Thread(
+            target=self._run, name="resource-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> ResourceSamplingReport:
+        if self._thread is None:
+            raise RuntimeError("ResourceSampler has not been started.")
+
+        self._stop_event.set()
+        self._thread.join()
+        self._take_sample()
+        self._stop_time = perf_counter()
+        return self.report()
+
+    def report(self) -> ResourceSamplingReport:
+        return ResourceSamplingReport(
+            interval_seconds=self._interval_seconds,
+            samples=list(self._state.samples),
+            spikes=list(self._state.spikes),
+            peak_resident_set_size_bytes=(
+                self._state.peak_resident_set_size_bytes
+            ),
+            peak_cpu_percent=self._state.peak_cpu_percent,
+            sampled_wall_seconds=self._stop_time - self._start_time,
+            overhead_wall_seconds=self._state.overhead_wall_seconds,
+            overhead_cpu_seconds=self._state.overhead_cpu_seconds,
+            failed_sample_count=self._state.failed_sample_count,
+        )
+
+    def _read_counters(self) -> tuple[int, _RawCounters] | None:
+        try:
+            with self._psutil_process.oneshot():
+                resident_set_size_bytes = (
+                    self._psutil_process.memory_info().rss
+                )
+                cpu_times = self._psutil_process.cpu_times()
+                read_bytes, write_bytes = self._read_io_bytes()
+        except psutil.Error:
+            self._state.failed_sample_count += 1
+            return None
+
+        return resident_set_size_bytes, _RawCounters(
+            wall_time=perf_counter(),
+            cpu_seconds=cpu_times.user + cpu_times.system,
+            read_bytes=read_bytes,
+            write_bytes=write_bytes,
+        )
+
+    def _read_io_bytes(self) -> tuple[int, int]:
+        try:
+            io_counters = self._psutil_process.io_counters()
+        except (psutil.Error, AttributeError):
+            return 0, 0
+        return io_counters.read_bytes, io_counters.write_bytes
+
+    def _create_start_sample(
+        self, resident_set_size_bytes: int, counters: _RawCounters
+    ) -> ResourceSample:
+        return ResourceSample(
+            elapsed_seconds=counters.wall_time - self._start_time,
+            resident_set_size_bytes=resident_set_size_bytes,
+            cpu_percent=0.0,
+            read_bytes_per_second=0.0,
+            write_bytes_per_second=0.0,
+        )
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self._interval_seconds):
+            self._take_sample()
+
+    def _take_sample(self) -> None:
+        sample_start_time = perf_counter()
+        sample_start_cpu_time = thread_time()
+
+        raw_reading = self._read_counters()
+        if raw_reading is not None:
+            self._record_raw_reading(*raw_reading)
+
+        self._state.overhead_wall_seconds += perf_counter() - sample_start_time
+        self._state.overhead_cpu_seconds += (
+            thread_time() - sample_start_cpu_time
+        )
+
+    def _record_raw_reading(
+        self, resident_set_size_bytes: int, counters: _RawCounters
+    ) -> None:
+        previous_counters = self._state.previous_counters
+        sample = (
+            self._create_start_sample(resident_set_size_bytes, counters)
+            if previous_counters is None
+            else self._create_sample(
+                resident_set_size_bytes, previous_counters, counters
+            )
+        )
+        self._record_sample(
+            sample, self._state.previous_resident_set_size_bytes
+        )
+        self._state.previous_counters = counters
+        self._state.previous_resident_set_size_bytes = resident_set_size_bytes
+
+    def _create_sample(
+        self,
+        resident_set_size_bytes: int,
+        previous_counters: _RawCounters,
+        counters: _RawCounters,
+    ) -> ResourceSample:
+        elapsed_seconds = max(
+            counters.wall_time - previous_counters.wall_time, 1e-9
+        )
+        return ResourceSample(
+            elapsed_seconds=counters.wall_time - self._start_time,
+            resident_set_size_bytes=resident_set_size_bytes,
+            cpu_percent=(
+                (counters.cpu_seconds - previous_counters.cpu_seconds)
+                / elapsed_seconds
+                * 100.0
+            ),
+            read_bytes_per_second=(
+                (counters.read_bytes - previous_counters.read_bytes)
+                / elapsed_seconds
+            ),
+            write_bytes_per_second=(
+                (counters.write_bytes - previous_counters.write_bytes)
+                / elapsed_seconds
+            ),
+        )
+
+    def _record_sample(
+        self, sample: ResourceSample, previous_resident_set_size_bytes: int
+    ) -> None:
+        self._state.peak_resident_set_size_bytes = max(
+            self._state.peak_resident_set_size_bytes,
+            sample.resident_set_size_bytes,
+        )
+        self._state.peak_cpu_percent = max(
+            self._state.peak_cpu_percent, sample.cpu_percent
+        )
+        self._detect_spikes(sample, previous_resident_set_size_bytes)
+
+        if self._state.sample_index % self._state.sample_stride == 0:
+            self._state.samples.append(sample)
+        self._state.sample_index += 1
+
+        if len(self._state.samples) >= self._max_samples:
+            self._state.samples = self._state.samples[::2]
+            self._state.sample_stride *= 2
+
+    def _detect_spikes(
+        self, sample: ResourceSample, previous_resident_set_size_bytes: int
+    ) -> None:
+        resident_set_size_increase_mib = (
+            (sample.resident_set_size_bytes - previous_resident_set_size_bytes)
+            / _BYTES_PER_MIB
+            if previous_resident_set_size_bytes
+            else 0.0
+        )
+        spike_candidates = (
+            (
+                "resident_set_size_increase_mib",
+                resident_set_size_increase_mib,
+                self._spike_thresholds.resident_set_size_increase_mib,
+            ),
+            (
+                "cpu_percent_per_core",
+                sample.cpu_percent / self._cpu_count,
+                self._spike_thresholds.cpu_percent_per_core,
+            ),
+            (
+                "io_mib_per_second",
+                (sample.read_bytes_per_second + sample.write_bytes_per_second)
+                / _BYTES_PER_MIB,
+                self._spike_thresholds.io_mib_per_second,
+            ),
+        )
+        for kind, value, threshold in spike_candidates:
+            if (
+                value >= threshold
+                and len(self._state.spikes) < self._max_spikes
+            ):
+                self._state.spikes.append(
+                    ResourceSpike(
+                        elapsed_seconds=sample.elapsed_seconds,
+                        kind=kind,
+                        value=value,
+                    )
+                )
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception_value: BaseException | None,
+        exception_traceback: TracebackType | None,
+    ) -> None:
+        if self._thread is not None and not self._stop_event.is_set():
+            self.stop()
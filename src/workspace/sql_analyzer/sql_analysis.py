@@ -0,0 +1,174 @@
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from sqlglot import exp
+
+
+@dataclass(frozen=True)
+class CTEAnalysis:
+    name: str
+    sql: str
+
+
+@dataclass(frozen=True)
+class JoinAnalysis:
+    kind: str
+    table: str
+    condition: str | None
+
+
+@dataclass(frozen=True)
+class CaseBranch:
+    condition: str
+    value: str
+
+
+@dataclass(frozen=True)
+class CaseAnalysis:
+    branches: list[CaseBranch]
+    default: str | None
+
+
+@dataclass(frozen=True)
+class NodeExtractor:
+    name: str
+    node_types: tuple[type[exp.Expr], ...]
+    extract: Callable[[Any], Any]
+
+
+@dataclass(frozen=True)
+class StatementAnalysis:
+    statement_index: int
+    statement_type: str
+    ctes: list[CTEAnalysis] = field(default_factory=list)
+    joins: list[JoinAnalysis] = field(default_factory=list)
+    wheres: list[str] = field(default_factory=list)
+    cases: list[CaseAnalysis] = field(default_factory=list)
+    extras: dict[str, list[Any]] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def analyze_cte(cte: exp.CTE) -> CTEAnalysis:
+    return CTEAnalysis(name=cte.alias, sql=cte.this.sql())
+
+
+def _join_condition(join: exp.Join) -> str | None:
+    on_expression = join.args.get("on")
+    if on_expression is not None:
+        return on_expression.sql()
+
+    using_columns = join.args.get("using")
+    if using_columns:
+        return f"USING ({', '.join(column.sql() for column in using_columns)})"
+    return None
+
+
+def analyze_join(join: exp.Join) -> JoinAnalysis:
+    return JoinAnalysis(
+        kind=" ".join(part for part in (join.side, join.kind) if part).upper()
+        or "INNER",
+        table=join.this.sql(),
+        condition=_join_condition(join),
+    )
+
+
+def analyze_case(case: exp.Case) -> CaseAnalysis:
+    default = case.args.get("default")
+    return CaseAnalysis(
+        branches=[
+            CaseBranch(
+                condition=if_clause.this.sql(),
+                value=if_clause.args["true"].sql(),
+            )
+            for if_clause in case.args.get("ifs", [])
+        ],
+        default=None if default is None else default.sql(),
+    )
+
+
+def _analyze_where(where: exp.Where) -> str:
+    return where.this.sql()
+
+
+CTE_EXTRACTOR = NodeExtractor("ctes", (exp.CTE,), analyze_cte)
+JOIN_EXTRACTOR = NodeExtractor("joins", (exp.Join,), analyze_join)
+WHERE_EXTRACTOR = NodeExtractor("wheres", (exp.Where,), _analyze_where)
+CASE_EXTRACTOR = NodeExtractor("cases", (exp.Case,), analyze_case)
+DEFAULT_EXTRACTORS = (
+    CTE_EXTRACTOR,
+    JOIN_EXTRACTOR,
+    WHERE_EXTRACTOR,
+    CASE_EXTRACTOR,
+)
+_BUILTIN_EXTRACTOR_NAMES = frozenset(
+    extractor.name for extractor in DEFAULT_EXTRACTORS
+)
+
+
+class SinglePassAnalyzer:
+    def __init__(
+        self, extractors: Sequence[NodeExtractor] = DEFAULT_EXTRACTORS
+    ) -> None:
+        extractor_names = [extractor.name for extractor in extractors]
+        if len(set(extractor_names)) != len(extractor_names):
+            raise ValueError(
+                f"Extractor names must be unique: {extractor_names}"
+            )
+
+        self._extractors = tuple(extractors)
+        self._extractors_by_node_type: dict[
+            type[exp.Expr], tuple[NodeExtractor, ...]
+        ] = {}
+
+    @property
+    def extractor_names(self) -> tuple[str, ...]:
+        return tuple(extractor.name for extractor in self._extractors)
+
+    def analyze(
+        self, syntax_tree: exp.Expr, statement_index: int = 0
+    ) -> StatementAnalysis:
+        extracted_items: dict[str, list[Any]] = {
+            extractor.name: [] for extractor in self._extractors
+        }
+        for node in syntax_tree.walk():
+            for extractor in self._find_extractors(type(node)):
+                extracted_items[extractor.name].append(extractor.extract(node))
+
+        return StatementAnalysis(
+            statement_index=statement_index,
+            statement_type=syntax_tree.key,
+            ctes=extracted_items.get("ctes", []),
+            joins=extracted_items.get("joins", []),
+            wheres=extracted_items.get("wheres", []),
+            cases=extracted_items.get("cases", []),
+            extras={
+                name: items
+                for name, items in extracted_items.items()
+                if name not in _BUILTIN_EXTRACTOR_NAMES
+            },
+        )
+
+    def _find_extractors(
+        self, node_type: type[exp.Expr]
+    ) -> tuple[NodeExtractor, ...]:
+        extractors = self._extractors_by_node_type.get(node_type)
+        if extractors is None:
+            extractors = tuple(
+                extractor
+                for extractor in self._extractors
+                if issubclass(node_type, extractor.node_types)
+            )
+            self._extractors_by_node_type[node_type] = extractors
+        return extractors
+
+
+_DEFAULT_SINGLE_PASS_ANALYZER = SinglePassAnalyzer()
+
+
+def analyze_expression(
+    syntax_tree: exp.Expr, statement_index: int = 0
+) -> StatementAnalysis:
+    return _DEFAULT_SINGLE_PASS_ANALYZER.analyze(syntax_tree, statement_index)
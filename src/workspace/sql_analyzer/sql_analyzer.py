@@ -1,8 +1,22 @@
+from collections.abc import Sequence
 from typing import Any
 
-from sqlglot import exp, parse_one
+from sqlglot import parse_one
 from sqlglot.dialects.dialect import DialectType
-from sqlglot.expressions import Expression
+from sqlglot.expressions import Expr
+
+from workspace.sql_analyzer.sql_analysis import (
+    DEFAULT_EXTRACTORS,
+    NodeExtractor,
+    SinglePassAnalyzer,
+    StatementAnalysis,
+)
+from workspace.sql_analyzer.sql_lineage import (
+    ColumnLineage,
+    extract_column_lineage,
+)
+from workspace.sql_analyzer.sql_lint import SQLLinter, StatementLintReport
+from workspace.sql_analyzer.sql_parse_cache import ParseCache
 
 
 class SQLAnalyzer:
@@ -11,58 +25,107 @@ class SQLAnalyzer:
         sql: str,
         read: DialectType | None = None,
         dialect: DialectType | None = None,
+        *,
+        extractors: Sequence[NodeExtractor] = DEFAULT_EXTRACTORS,
+        parse_cache: ParseCache | None = None,
         **parse_options: Any,
     ) -> None:
         self._sql: str = sql
-        self._syntax_tree: Expression = parse_one(
-            sql, read=read, dialect=dialect, **parse_options
+        self._read: DialectType | None = read or dialect
+        self._syntax_tree: Expr = (
+            parse_one(sql, read=read, dialect=dialect, **parse_options)
+            if parse_cache is None
+            else parse_cache.parse_one(
+                sql, read=read, dialect=dialect, **parse_options
+            )
         )
+        self._single_pass_analyzer = SinglePassAnalyzer(extractors)
+        self._analysis: StatementAnalysis | None = None
+        self._column_lineage: ColumnLineage | None = None
+        self._lint_report: StatementLintReport | None = None
+
+    def analyze(self) -> StatementAnalysis:
+        if self._analysis is None:
+            self._analysis = self._single_pass_analyzer.analyze(
+                self._syntax_tree
+            )
+        return self._analysis
+
+    def column_lineage(self) -> ColumnLineage:
+        if self._column_lineage is None:
+            self._column_lineage = extract_column_lineage(
+                self._syntax_tree, read=self._read
+            )
+        return self._column_lineage
+
+    def lint(self) -> StatementLintReport:
+        if self._lint_report is None:
+            self._lint_report = SQLLinter().lint(self._syntax_tree)
+        return self._lint_report
 
     def analyze_ctes(self) -> None:
         print("# [CTEs]")
 
-        for i, cte in enumerate(self._syntax_tree.find_all(exp.CTE), 1):
-            print(f"## CTE {i}: `{cte.alias}`")
+        for i, cte in enumerate(self.analyze().ctes, 1):
+            print(f"## CTE {i}: `{cte.name}`")
             print("``` sql")
-            print(f"{cte.this.sql()}")
+            print(f"{cte.sql}")
             print("```")
             print()
 
     def analyze_joins(self) -> None:
         print("# [JOINs]")
 
-        for i, join in enumerate(self._syntax_tree.find_all(exp.Join), 1):
-            on_expression = join.args.get("on")
-
-            if on_expression is not None:
-                print(f"- JOIN {i}: `{on_expression.sql()}`")
+        for i, join in enumerate(self.analyze().joins, 1):
+            if join.condition is not None:
+                print(f"- JOIN {i}: `{join.condition}`")
             print()
 
     def analyze_wheres(self) -> None:
         print("# [WHEREs]")
 
-        for i, where in enumerate(self._syntax_tree.find_all(exp.Where), 1):
-            print(f"- WHERE {i}: `{where.this.sql()}`")
+        for i, where in enumerate(self.analyze().wheres, 1):
+            print(f"- WHERE {i}: `{where}`")
             print()
 
     def analyze_case_when(self) -> None:
         print("# [CASE WHEN]")
 
-        for i, case in enumerate(self._syntax_tree.find_all(exp.Case), 1):
+        for i, case in enumerate(self.analyze().cases, 1):
             print(f"## CASE {i}")
 
-            for j, if_clause in enumerate(case.args.get("ifs", []), 1):
-                when_condition = if_clause.this
-                then_value = if_clause.args.get("true")
-                print(f"- WHEN {j}: `{when_condition.sql()}`")
-                print(f"  THEN: `{then_value.sql()}`")
+            for j, branch in enumerate(case.branches, 1):
+                print(f"- WHEN {j}: `{branch.condition}`")
+                print(f"  THEN: `{branch.value}`")
 
-            default = case.args.get("default")
-            if default:
-                print(f"- ELSE: `{default.sql()}`")
+            if case.default:
+                print(f"- ELSE: `{case.default}`")
 
             print()
 
+    def analyze_lineage(self) -> None:
+        print("# [Column Lineage]")
+
+        column_lineage = self.column_lineage()
+        for output_column in column_lineage.output_columns:
+            source_columns = ", ".join(
+                f"`{source_column.qualified_name}`"
+                for source_column in sorted(
+                    column_lineage.source_columns(output_column)
+                )
+            )
+            print(f"- `{output_column.qualified_name}` <- {source_columns}")
+        print()
+
+    def analyze_lint(self) -> None:
+        print("# [Lint]")
+
+        lint_report = self.lint()
+        print(f"- Complexity score: {lint_report.complexity_score}")
+        for finding in lint_report.findings:
+            print(f"- [{finding.rule}] {finding.message}: `{finding.sql}`")
+        print()
+
 
 if __name__ == "__main__":
     sql = """
@@ -114,3 +177,5 @@ if __name__ == "__main__":
     analyzer.analyze_joins()
     analyzer.analyze_wheres()
     analyzer.analyze_case_when()
+    analyzer.analyze_lineage()
+    analyzer.analyze_lint()
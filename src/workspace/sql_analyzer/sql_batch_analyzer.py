@@ -0,0 +1,344 @@
+import json
+import os
+from collections import deque
+from collections.abc import Generator, Iterable, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from glob import iglob
+from itertools import batched
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import sqlglot
+
+from workspace.sql_analyzer.sql_analysis import (
+    DEFAULT_EXTRACTORS,
+    NodeExtractor,
+    SinglePassAnalyzer,
+    StatementAnalysis,
+)
+from workspace.sql_analyzer.sql_parse_cache import (
+    ParseCache,
+    get_worker_parse_cache,
+    open_worker_parse_cache,
+)
+
+DEFAULT_FILES_PER_TASK = 16
+DEFAULT_PARQUET_ROW_GROUP_SIZE = 1024
+_STATEMENT_ANALYSES_NAMESPACE = "statement_analyses:v1"
+_CTE_TYPE = pa.struct([("name", pa.string()), ("sql", pa.string())])
+_JOIN_TYPE = pa.struct(
+    [
+        ("kind", pa.string()),
+        ("table", pa.string()),
+        ("condition", pa.string()),
+    ]
+)
+_CASE_BRANCH_TYPE = pa.struct(
+    [("condition", pa.string()), ("value", pa.string())]
+)
+_CASE_TYPE = pa.struct(
+    [("branches", pa.list_(_CASE_BRANCH_TYPE)), ("default", pa.string())]
+)
+_STATEMENT_TYPE = pa.struct(
+    [
+        ("statement_index", pa.int32()),
+        ("statement_type", pa.string()),
+        ("ctes", pa.list_(_CTE_TYPE)),
+        ("joins", pa.list_(_JOIN_TYPE)),
+        ("wheres", pa.list_(pa.string())),
+        ("cases", pa.list_(_CASE_TYPE)),
+        ("extras_json", pa.string()),
+    ]
+)
+_DEFAULT_SINGLE_PASS_ANALYZER = SinglePassAnalyzer()
+_FILE_ANALYSIS_SCHEMA = pa.schema(
+    [
+        ("path", pa.string()),
+        ("parse_seconds", pa.float64()),
+        ("analysis_seconds", pa.float64()),
+        ("statements", pa.list_(_STATEMENT_TYPE)),
+        ("error", pa.string()),
+    ]
+)
+
+
+@dataclass(frozen=True)
+class FileAnalysis:
+    path: str
+    parse_seconds: float
+    analysis_seconds: float
+    statements: list[StatementAnalysis] = field(default_factory=list)
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class BatchAnalysisStats:
+    file_count: int
+    statement_count: int
+    error_count: int
+    parse_seconds_sum: float
+    max_parse_seconds: float
+    elapsed_seconds: float
+
+    @property
+    def files_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.file_count / self.elapsed_seconds
+
+    @property
+    def statements_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.statement_count / self.elapsed_seconds
+
+
+@dataclass
+class _BatchAnalysisCounters:
+    started_at: float
+    file_count: int = 0
+    statement_count: int = 0
+    error_count: int = 0
+    parse_seconds_sum: float = 0.0
+    max_parse_seconds: float = 0.0
+
+    def record(self, file_analysis: FileAnalysis) -> None:
+        self.file_count += 1
+        self.statement_count += len(file_analysis.statements)
+        self.error_count += file_analysis.error is not None
+        self.parse_seconds_sum += file_analysis.parse_seconds
+        self.max_parse_seconds = max(
+            self.max_parse_seconds, file_analysis.parse_seconds
+        )
+
+    def to_stats(self) -> BatchAnalysisStats:
+        return BatchAnalysisStats(
+            file_count=self.file_count,
+            statement_count=self.statement_count,
+            error_count=self.error_count,
+            parse_seconds_sum=self.parse_seconds_sum,
+            max_parse_seconds=self.max_parse_seconds,
+            elapsed_seconds=perf_counter() - self.started_at,
+        )
+
+
+def iter_sql_paths(source: str | Path) -> Generator[Path]:
+    source_path = Path(source)
+    if source_path.is_dir():
+        yield from sorted(source_path.rglob("*.sql"))
+        return
+
+    for matched_path in sorted(iglob(str(source), recursive=True)):
+        if Path(matched_path).is_file():
+            yield Path(matched_path)
+
+
+def _create_error_analysis(
+    path: Path, parse_started_at: float, error: Exception
+) -> FileAnalysis:
+    return FileAnalysis(
+        path=str(path),
+        parse_seconds=perf_counter() - parse_started_at,
+        analysis_seconds=0.0,
+        error=f"{type(error).__name__}: {error}",
+    )
+
+
+def _statement_analyses_namespace(
+    single_pass_analyzer: SinglePassAnalyzer,
+) -> str:
+    return ":".join(
+        [_STATEMENT_ANALYSES_NAMESPACE, *single_pass_analyzer.extractor_names]
+    )
+
+
+def _analyze_sql_source(
+    path: Path,
+    read: str | None,
+    parse_cache: ParseCache | None,
+    single_pass_analyzer: SinglePassAnalyzer,
+    parse_started_at: float,
+) -> FileAnalysis:
+    sql = path.read_text(encoding="utf-8")
+    namespace = _statement_analyses_namespace(single_pass_analyzer)
+    cached_statements = (
+        None if parse_cache is None else parse_cache.get(namespace, sql, read)
+    )
+    if cached_statements is not None:
+        return FileAnalysis(
+            path=str(path),
+            parse_seconds=perf_counter() - parse_started_at,
+            analysis_seconds=0.0,
+            statements=cached_statements,
+        )
+
+    syntax_trees = sqlglot.parse(sql, read=read)
+    parse_seconds = perf_counter() - parse_started_at
+
+    analysis_started_at = perf_counter()
+    statements = [
+        single_pass_analyzer.analyze(syntax_tree, statement_index)
+        for statement_index, syntax_tree in enumerate(syntax_trees)
+        if syntax_tree is not None
+    ]
+    if parse_cache is not None:
+        parse_cache.put(namespace, sql, statements, read)
+    return FileAnalysis(
+        path=str(path),
+        parse_seconds=parse_seconds,
+        analysis_seconds=perf_counter() - analysis_started_at,
+        statements=statements,
+    )
+
+
+def analyze_sql_file(
+    path: Path,
+    read: str | None = None,
+    parse_cache: ParseCache | None = None,
+    *,
+    single_pass_analyzer: SinglePassAnalyzer = _DEFAULT_SINGLE_PASS_ANALYZER,
+) -> FileAnalysis:
+    parse_started_at = perf_counter()
+    try:
+        return _analyze_sql_source(
+            path, read, parse_cache, single_pass_analyzer, parse_started_at
+        )
+    except Exception as error:
+        return _create_error_analysis(path, parse_started_at, error)
+
+
+def _to_parquet_row(file_analysis: FileAnalysis) -> dict[str, Any]:
+    parquet_row = file_analysis.to_dict()
+    for statement in parquet_row["statements"]:
+        statement["extras_json"] = json.dumps(
+            statement.pop("extras"), ensure_ascii=False, default=str
+        )
+    return parquet_row
+
+
+def _analyze_sql_files(
+    paths: Sequence[Path],
+    read: str | None,
+    parse_cache_path: Path | None,
+    single_pass_analyzer: SinglePassAnalyzer,
+) -> list[FileAnalysis]:
+    parse_cache = get_worker_parse_cache(parse_cache_path)
+    return [
+        analyze_sql_file(
+            path,
+            read,
+            parse_cache,
+            single_pass_analyzer=single_pass_analyzer,
+        )
+        for path in paths
+    ]
+
+
+class SQLBatchAnalyzer:
+    def __init__(
+        self,
+        read: str | None = None,
+        *,
+        max_workers: int | None = None,
+        files_per_task: int = DEFAULT_FILES_PER_TASK,
+        parse_cache_path: str | Path | None = None,
+        extractors: Sequence[NodeExtractor] = DEFAULT_EXTRACTORS,
+    ) -> None:
+        if max_workers is not None and max_workers < 1:
+            raise ValueError(f"max_workers must be positive: {max_workers}")
+        if files_per_task < 1:
+            raise ValueError(
+                f"files_per_task must be positive: {files_per_task}"
+            )
+
+        self._read = read
+        self._max_workers = max_workers or os.process_cpu_count() or 1
+        self._files_per_task = files_per_task
+        self._parse_cache_path = (
+            None if parse_cache_path is None else Path(parse_cache_path)
+        )
+        self._single_pass_analyzer = SinglePassAnalyzer(extractors)
+        self._counters = _BatchAnalysisCounters(started_at=perf_counter())
+
+    def stats(self) -> BatchAnalysisStats:
+        return self._counters.to_stats()
+
+    def iter_analyses(
+        self, source: str | Path | Iterable[Path]
+    ) -> Generator[FileAnalysis]:
+        paths = (
+            iter_sql_paths(source)
+            if isinstance(source, str | Path)
+            else iter(source)
+        )
+        self._counters = _BatchAnalysisCounters(started_at=perf_counter())
+        with ProcessPoolExecutor(
+            self._max_workers,
+            initializer=open_worker_parse_cache,
+            initargs=(self._parse_cache_path,),
+        ) as executor:
+            max_pending_task_count = self._max_workers * 2
+            pending_tasks: deque[Future[list[FileAnalysis]]] = deque()
+            for path_batch in batched(
+                paths, self._files_per_task, strict=False
+            ):
+                pending_tasks.append(
+                    executor.submit(
+                        _analyze_sql_files,
+                        path_batch,
+                        self._read,
+                        self._parse_cache_path,
+                        self._single_pass_analyzer,
+                    )
+                )
+                if len(pending_tasks) >= max_pending_task_count:
+                    yield from self._record(pending_tasks.popleft().result())
+            while pending_tasks:
+                yield from self._record(pending_tasks.popleft().result())
+
+    def write_jsonl(
+        self, source: str | Path | Iterable[Path], output_path: str | Path
+    ) -> BatchAnalysisStats:
+        with Path(output_path).open("w", encoding="utf-8") as output_file:
+            for file_analysis in self.iter_analyses(source):
+                output_file.write(
+                    json.dumps(file_analysis.to_dict(), ensure_ascii=False)
+                )
+                output_file.write("\n")
+        return self.stats()
+
+    def write_parquet(
+        self,
+        source: str | Path | Iterable[Path],
+        output_path: str | Path,
+        *,
+        row_group_size: int = DEFAULT_PARQUET_ROW_GROUP_SIZE,
+    ) -> BatchAnalysisStats:
+        with pq.ParquetWriter(output_path, _FILE_ANALYSIS_SCHEMA) as writer:
+            for file_analyses in batched(
+                self.iter_analyses(source), row_group_size, strict=False
+            ):
+                writer.write_table(
+                    pa.Table.from_pylist(
+                        [
+                            _to_parquet_row(file_analysis)
+                            for file_analysis in file_analyses
+                        ],
+                        schema=_FILE_ANALYSIS_SCHEMA,
+                    )
+                )
+        return self.stats()
+
+    def _record(
+        self, file_analyses: list[FileAnalysis]
+    ) -> Generator[FileAnalysis]:
+        for file_analysis in file_analyses:
+            self._counters.record(file_analysis)
+            yield file_analysis
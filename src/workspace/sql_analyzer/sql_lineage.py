@@ -0,0 +1,241 @@
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+
+from sqlglot import exp
+from sqlglot.dialects.dialect import DialectType
+from sqlglot.errors import SqlglotError
+from sqlglot.optimizer.qualify import qualify
+from sqlglot.optimizer.scope import Scope, ScopeType, traverse_scope
+
+RESULT_RELATION = "<result>"
+UNKNOWN_RELATION = "<unknown>"
+
+
+@dataclass(frozen=True, order=True)
+class ColumnReference:
+    relation: str
+    column: str
+
+    @property
+    def qualified_name(self) -> str:
+        return f"{self.relation}.{self.column}"
+
+
+@dataclass(frozen=True)
+class ColumnLineage:
+    statement_index: int
+    target: str | None
+    output_columns: list[ColumnReference] = field(default_factory=list)
+    dependencies: Mapping[ColumnReference, frozenset[ColumnReference]] = field(
+        default_factory=dict
+    )
+
+    def source_columns(
+        self, column: ColumnReference
+    ) -> frozenset[ColumnReference]:
+        source_columns: set[ColumnReference] = set()
+        visited_columns = {column}
+        pending_columns = [column]
+        while pending_columns:
+            dependencies = self.dependencies.get(pending_columns.pop())
+            if dependencies is None:
+                continue
+            for dependency in dependencies - visited_columns:
+                visited_columns.add(dependency)
+                pending_columns.append(dependency)
+                if dependency not in self.dependencies:
+                    source_columns.add(dependency)
+        return frozenset(source_columns)
+
+    def resolved_dependencies(
+        self,
+    ) -> dict[ColumnReference, frozenset[ColumnReference]]:
+        return {
+            output_column: self.source_columns(output_column)
+            for output_column in self.output_columns
+        }
+
+
+def _split_statement(
+    syntax_tree: exp.Expr,
+) -> tuple[exp.Expr, str | None, list[str]]:
+    if not isinstance(syntax_tree, exp.Create | exp.Insert) or not (
+        isinstance(syntax_tree.expression, exp.Query)
+    ):
+        return syntax_tree, None, []
+
+    target = syntax_tree.this
+    if isinstance(target, exp.Schema):
+        return (
+            syntax_tree.expression,
+            exp.table_name(target.this),
+            [column.name for column in target.expressions],
+        )
+    return syntax_tree.expression, exp.table_name(target), []
+
+
+def _qualify_query(query: exp.Expr, read: DialectType) -> exp.Expr:
+    try:
+        return qualify(
+            query.copy(),
+            dialect=read,
+            validate_qualify_columns=False,
+            quote_identifiers=False,
+            identify=False,
+        )
+    except SqlglotError:
+        return query
+
+
+def _create_relation_name(
+    scope: Scope, target: str | None, used_relation_names: set[str]
+) -> str:
+    if scope.scope_type is ScopeType.ROOT:
+        return target or RESULT_RELATION
+
+    parent = scope.expression.parent
+    relation_name = (
+        parent.alias
+        if scope.scope_type in (ScopeType.CTE, ScopeType.DERIVED_TABLE)
+        and parent is not None
+        and parent.alias
+        else f"_{scope.scope_type.name.lower()}"
+    )
+    unique_relation_name = relation_name
+    suffix = 1
+    while unique_relation_name in used_relation_names:
+        suffix += 1
+        unique_relation_name = f"{relation_name}_{suffix}"
+    used_relation_names.add(unique_relation_name)
+    return unique_relation_name
+
+
+def _source_relation_name(
+    source: exp.Table | Scope | None, relation_names: dict[int, str]
+) -> str:
+    if isinstance(source, Scope):
+        return relation_names[id(source.expression)]
+    if isinstance(source, exp.Table):
+        return exp.table_name(source)
+    return UNKNOWN_RELATION
+
+
+def _resolve_column(
+    scope: Scope, column: exp.Column, relation_names: dict[int, str]
+) -> ColumnReference:
+    source_name = column.table
+    if not source_name and len(scope.selected_sources) == 1:
+        (source_name,) = scope.selected_sources
+
+    selected_source = scope.selected_sources.get(source_name)
+    source = None if selected_source is None else selected_source[1]
+    if source is None and column.table:
+        return ColumnReference(column.table, column.name)
+    return ColumnReference(
+        _source_relation_name(source, relation_names), column.name
+    )
+
+
+def _selects(expression: exp.Expr) -> list[exp.Expr]:
+    return expression.selects if isinstance(expression, exp.Query) else []
+
+
+def _is_descendant(node: exp.Expr, ancestor: exp.Expr) -> bool:
+    parent = node.parent
+    while parent is not None:
+        if parent is ancestor:
+            return True
+        parent = parent.parent
+    return False
+
+
+def _projection_dependencies(
+    scope: Scope,
+    projection: exp.Expr,
+    relation_names: dict[int, str],
+) -> frozenset[ColumnReference]:
+    if isinstance(projection, exp.Star):
+        return frozenset(
+            ColumnReference(_source_relation_name(source, relation_names), "*")
+            for _, source in scope.selected_sources.values()
+        )
+
+    dependencies = {
+        _resolve_column(scope, column, relation_names)
+        for column in projection.find_all(exp.Column)
+        if column.find_ancestor(exp.Select) is scope.expression
+    }
+    for subquery_scope in scope.subquery_scopes:
+        subquery = subquery_scope.expression
+        if _is_descendant(subquery, projection):
+            dependencies.update(
+                ColumnReference(
+                    relation_names[id(subquery)],
+                    subquery_projection.alias_or_name,
+                )
+                for subquery_projection in _selects(subquery)[:1]
+            )
+    return frozenset(dependencies)
+
+
+def _scope_dependencies(
+    scope: Scope, relation_names: dict[int, str]
+) -> list[frozenset[ColumnReference]]:
+    if isinstance(scope.expression, exp.SetOperation):
+        return [
+            frozenset(
+                ColumnReference(
+                    relation_names[id(branch_scope.expression)],
+                    _selects(branch_scope.expression)[index].alias_or_name,
+                )
+                for branch_scope in scope.set_operation_scopes
+            )
+            for index in range(len(_selects(scope.expression)))
+        ]
+
+    return [
+        _projection_dependencies(scope, projection, relation_names)
+        for projection in _selects(scope.expression)
+    ]
+
+
+def extract_column_lineage(
+    syntax_tree: exp.Expr,
+    statement_index: int = 0,
+    read: DialectType = None,
+) -> ColumnLineage:
+    query, target, target_column_names = _split_statement(syntax_tree)
+    if not isinstance(query, exp.Query):
+        return ColumnLineage(statement_index=statement_index, target=target)
+
+    relation_names: dict[int, str] = {}
+    used_relation_names = {target or RESULT_RELATION}
+    dependencies: dict[ColumnReference, frozenset[ColumnReference]] = {}
+    output_columns: list[ColumnReference] = []
+    for scope in traverse_scope(_qualify_query(query, read)):
+        relation_name = _create_relation_name(
+            scope, target, used_relation_names
+        )
+        relation_names[id(scope.expression)] = relation_name
+        column_names = [
+            projection.alias_or_name
+            for projection in _selects(scope.expression)
+        ]
+        if scope.scope_type is ScopeType.ROOT and target_column_names:
+            column_names = target_column_names
+        for column_name, column_dependencies in zip(
+            column_names,
+            _scope_dependencies(scope, relation_names),
+            strict=False,
+        ):
+            column = ColumnReference(relation_name, column_name)
+            dependencies[column] = column_dependencies
+            if scope.scope_type is ScopeType.ROOT:
+                output_columns.append(column)
+
+    return ColumnLineage(
+        statement_index=statement_index,
+        target=target,
+        output_columns=output_columns,
+        dependencies=dependencies,
+    )
@@ -0,0 +1,280 @@
+import os
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import batched, chain
+from pathlib import Path
+from time import perf_counter
+
+import sqlglot
+
+from workspace.sql_analyzer.sql_batch_analyzer import (
+    DEFAULT_FILES_PER_TASK,
+    iter_sql_paths,
+)
+from workspace.sql_analyzer.sql_lineage import (
+    ColumnLineage,
+    ColumnReference,
+    extract_column_lineage,
+)
+from workspace.sql_analyzer.sql_parse_cache import (
+    ParseCache,
+    get_worker_parse_cache,
+    open_worker_parse_cache,
+)
+
+_COLUMN_LINEAGES_NAMESPACE = "column_lineages:v1"
+
+type _ColumnEdges = list[tuple[ColumnReference, frozenset[ColumnReference]]]
+
+
+@dataclass(frozen=True)
+class FileLineage:
+    path: str
+    lineages: list[ColumnLineage] = field(default_factory=list)
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class LineageRefreshStats:
+    added_count: int
+    updated_count: int
+    removed_count: int
+    unchanged_count: int
+    error_count: int
+    elapsed_seconds: float
+
+
+@dataclass(frozen=True)
+class _FileSignature:
+    modified_ns: int
+    size: int
+
+
+@dataclass(frozen=True)
+class _ColumnGraph:
+    upstream: dict[ColumnReference, set[ColumnReference]]
+    downstream: dict[ColumnReference, set[ColumnReference]]
+
+
+def extract_file_lineage(
+    path: Path,
+    read: str | None = None,
+    parse_cache: ParseCache | None = None,
+) -> FileLineage:
+    try:
+        sql = path.read_text(encoding="utf-8")
+        cached_lineages = (
+            None
+            if parse_cache is None
+            else parse_cache.get(_COLUMN_LINEAGES_NAMESPACE, sql, read)
+        )
+        if cached_lineages is not None:
+            return FileLineage(path=str(path), lineages=cached_lineages)
+
+        lineages = [
+            extract_column_lineage(syntax_tree, statement_index, read)
+            for statement_index, syntax_tree in enumerate(
+                sqlglot.parse(sql, read=read)
+            )
+            if syntax_tree is not None
+        ]
+    except Exception as error:
+        return FileLineage(
+            path=str(path), error=f"{type(error).__name__}: {error}"
+        )
+
+    if parse_cache is not None:
+        parse_cache.put(_COLUMN_LINEAGES_NAMESPACE, sql, lineages, read)
+    return FileLineage(path=str(path), lineages=lineages)
+
+
+def _extract_files_lineage(
+    paths: Sequence[Path], read: str | None, parse_cache: ParseCache | None
+) -> list[FileLineage]:
+    return [extract_file_lineage(path, read, parse_cache) for path in paths]
+
+
+def _extract_files_lineage_in_worker(
+    paths: Sequence[Path], read: str | None, parse_cache_path: Path | None
+) -> list[FileLineage]:
+    return _extract_files_lineage(
+        paths, read, get_worker_parse_cache(parse_cache_path)
+    )
+
+
+def _read_file_signature(path: Path) -> _FileSignature | None:
+    try:
+        stat_result = path.stat()
+    except OSError:
+        return None
+    return _FileSignature(stat_result.st_mtime_ns, stat_result.st_size)
+
+
+def _create_column_edges(file_lineage: FileLineage) -> _ColumnEdges:
+    return [
+        (output_column, source_columns)
+        for lineage in file_lineage.lineages
+        if lineage.target is not None
+        for output_column, source_columns in (
+            lineage.resolved_dependencies().items()
+        )
+    ]
+
+
+def _build_column_graph(column_edges: Iterable[_ColumnEdges]) -> _ColumnGraph:
+    upstream: defaultdict[ColumnReference, set[ColumnReference]] = defaultdict(
+        set
+    )
+    downstream: defaultdict[ColumnReference, set[ColumnReference]] = (
+        defaultdict(set)
+    )
+    for output_column, source_columns in chain.from_iterable(column_edges):
+        upstream[output_column].update(source_columns)
+        for source_column in source_columns:
+            downstream[source_column].add(output_column)
+    return _ColumnGraph(upstream=dict(upstream), downstream=dict(downstream))
+
+
+def _traverse_columns(
+    edges: dict[ColumnReference, set[ColumnReference]],
+    column: ColumnReference,
+) -> frozenset[ColumnReference]:
+    reached_columns: set[ColumnReference] = set()
+    pending_columns = [column]
+    while pending_columns:
+        for next_column in edges.get(pending_columns.pop(), ()):
+            if next_column not in reached_columns:
+                reached_columns.add(next_column)
+                pending_columns.append(next_column)
+    return frozenset(reached_columns - {column})
+
+
+class ColumnLineageIndex:
+    def __init__(
+        self,
+        read: str | None = None,
+        *,
+        max_workers: int | None = None,
+        files_per_task: int = DEFAULT_FILES_PER_TASK,
+        parse_cache_path: str | Path | None = None,
+    ) -> None:
+        if max_workers is not None and max_workers < 1:
+            raise ValueError(f"max_workers must be positive: {max_workers}")
+        if files_per_task < 1:
+            raise ValueError(
+                f"files_per_task must be positive: {files_per_task}"
+            )
+
+        self._read = read
+        self._max_workers = max_workers or os.process_cpu_count() or 1
+        self._files_per_task = files_per_task
+        self._parse_cache_path = (
+            None if parse_cache_path is None else Path(parse_cache_path)
+        )
+        self._file_signatures: dict[Path, _FileSignature | None] = {}
+        self._file_lineages: dict[Path, FileLineage] = {}
+        self._column_edges: dict[Path, _ColumnEdges] = {}
+        self._column_graph: _ColumnGraph | None = None
+
+    def refresh(
+        self, source: str | Path | Iterable[Path]
+    ) -> LineageRefreshStats:
+        started_at = perf_counter()
+        paths = list(
+            iter_sql_paths(source)
+            if isinstance(source, str | Path)
+            else source
+        )
+        file_signatures = {path: _read_file_signature(path) for path in paths}
+        removed_paths = self._file_signatures.keys() - file_signatures.keys()
+        for removed_path in removed_paths:
+            self._forget(removed_path)
+        changed_paths = [
+            path
+            for path in paths
+            if path not in self._file_signatures
+            or self._file_signatures[path] != file_signatures[path]
+        ]
+        added_count = sum(
+            path not in self._file_signatures for path in changed_paths
+        )
+
+        error_count = 0
+        for file_lineage in self._extract(changed_paths):
+            path = Path(file_lineage.path)
+            self._file_signatures[path] = file_signatures[path]
+            self._file_lineages[path] = file_lineage
+            self._column_edges[path] = _create_column_edges(file_lineage)
+            error_count += file_lineage.error is not None
+        if removed_paths or changed_paths:
+            self._column_graph = None
+
+        return LineageRefreshStats(
+            added_count=added_count,
+            updated_count=len(changed_paths) - added_count,
+            removed_count=len(removed_paths),
+            unchanged_count=len(paths) - len(changed_paths),
+            error_count=error_count,
+            elapsed_seconds=perf_counter() - started_at,
+        )
+
+    def file_lineage(self, path: str | Path) -> FileLineage | None:
+        return self._file_lineages.get(Path(path))
+
+    def upstream_columns(
+        self, relation: str, column: str
+    ) -> frozenset[ColumnReference]:
+        return _traverse_columns(
+            self._get_column_graph().upstream,
+            ColumnReference(relation, column),
+        )
+
+    def downstream_columns(
+        self, relation: str, column: str
+    ) -> frozenset[ColumnReference]:
+        return _traverse_columns(
+            self._get_column_graph().downstream,
+            ColumnReference(relation, column),
+        )
+
+    def _forget(self, path: Path) -> None:
+        del self._file_signatures[path]
+        self._file_lineages.pop(path, None)
+        self._column_edges.pop(path, None)
+
+    def _extract(self, paths: list[Path]) -> Iterable[FileLineage]:
+        if self._max_workers == 1 or len(paths) <= self._files_per_task:
+            return self._extract_in_process(paths)
+
+        path_batches = list(batched(paths, self._files_per_task, strict=False))
+        with ProcessPoolExecutor(
+            self._max_workers,
+            initializer=open_worker_parse_cache,
+            initargs=(self._parse_cache_path,),
+        ) as executor:
+            return list(
+                chain.from_iterable(
+                    executor.map(
+                        _extract_files_lineage_in_worker,
+                        path_batches,
+                        [self._read] * len(path_batches),
+                        [self._parse_cache_path] * len(path_batches),
+                    )
+                )
+            )
+
+    def _extract_in_process(self, paths: list[Path]) -> list[FileLineage]:
+        if self._parse_cache_path is None:
+            return _extract_files_lineage(paths, self._read, None)
+
+        with ParseCache(self._parse_cache_path) as parse_cache:
+            return _extract_files_lineage(paths, self._read, parse_cache)
+
+    def _get_column_graph(self) -> _ColumnGraph:
+        if self._column_graph is None:
+            self._column_graph = _build_column_graph(
+                self._column_edges.values()
+            )
+        return self._column_graph
@@ -0,0 +1,404 @@
+import heapq
+from collections.abc import Generator, Iterable
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any, Literal
+
+import sqlglot
+from sqlglot import exp
+from sqlglot.optimizer.scope import ScopeType, traverse_scope
+
+from workspace.sql_analyzer.sql_analysis import (
+    NodeExtractor,
+    SinglePassAnalyzer,
+)
+from workspace.sql_analyzer.sql_batch_analyzer import iter_sql_paths
+
+type LintRule = Literal[
+    "cartesian_join",
+    "non_sargable_predicate",
+    "select_star_in_cte",
+    "or_heavy_predicate",
+    "case_repeats_where",
+    "correlated_subquery",
+]
+
+DEFAULT_OR_PREDICATE_THRESHOLD = 2
+DEFAULT_RANK_LIMIT = 20
+LINT_RULE_WEIGHTS: dict[LintRule, int] = {
+    "cartesian_join": 10,
+    "correlated_subquery": 8,
+    "non_sargable_predicate": 5,
+    "or_heavy_predicate": 3,
+    "case_repeats_where": 3,
+    "select_star_in_cte": 2,
+}
+_COMPLEXITY_EXTRACTOR_NAME = "complexity"
+_COMPLEXITY_WEIGHTS: dict[type[exp.Expr], int] = {
+    exp.Join: 3,
+    exp.Subquery: 4,
+    exp.CTE: 2,
+    exp.SetOperation: 3,
+    exp.Case: 2,
+    exp.If: 1,
+    exp.Window: 3,
+    exp.AggFunc: 1,
+    exp.Or: 1,
+    exp.Distinct: 1,
+}
+_COMPARISON_TYPES = (
+    exp.EQ,
+    exp.NEQ,
+    exp.GT,
+    exp.GTE,
+    exp.LT,
+    exp.LTE,
+    exp.Like,
+    exp.ILike,
+    exp.In,
+    exp.Between,
+)
+
+
+@dataclass(frozen=True)
+class LintFinding:
+    rule: LintRule
+    message: str
+    sql: str
+
+    @property
+    def weight(self) -> int:
+        return LINT_RULE_WEIGHTS[self.rule]
+
+
+@dataclass(frozen=True)
+class StatementLintReport:
+    statement_index: int
+    statement_type: str
+    structural_score: int
+    findings: list[LintFinding] = field(default_factory=list)
+
+    @property
+    def complexity_score(self) -> int:
+        return self.structural_score + sum(
+            finding.weight for finding in self.findings
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            **asdict(self),
+            "complexity_score": self.complexity_score,
+        }
+
+
+@dataclass(frozen=True)
+class FileLintReport:
+    path: str
+    reports: list[StatementLintReport] = field(default_factory=list)
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class RankedStatement:
+    path: str
+    report: StatementLintReport
+
+
+def _complexity_weight(node: exp.Expr) -> int:
+    return sum(
+        weight
+        for node_type, weight in _COMPLEXITY_WEIGHTS.items()
+        if isinstance(node, node_type)
+    )
+
+
+def _flatten_predicate(
+    condition: exp.Expr, connective: type[exp.Connector]
+) -> list[exp.Expr]:
+    condition = condition.unnest()
+    if isinstance(condition, connective):
+        return [
+            *_flatten_predicate(condition.left, connective),
+            *_flatten_predicate(condition.right, connective),
+        ]
+    return [condition]
+
+
+def _predicate_key(condition: exp.Expr) -> frozenset[str]:
+    return frozenset(
+        conjunct.sql() for conjunct in _flatten_predicate(condition, exp.And)
+    )
+
+
+def _has_join_predicate_in_where(join: exp.Join) -> bool:
+    select = join.parent
+    where = select.args.get("where") if select is not None else None
+    if where is None:
+        return False
+
+    joined_table = join.this.alias_or_name
+    return any(
+        joined_table in table_names and len(table_names) > 1
+        for table_names in (
+            {column.table for column in equality.find_all(exp.Column)}
+            for equality in where.find_all(exp.EQ)
+        )
+    )
+
+
+def _has_join_condition(join: exp.Join) -> bool:
+    on_condition = join.args.get("on")
+    return bool(join.args.get("using")) or (
+        on_condition is not None and on_condition.find(exp.Column) is not None
+    )
+
+
+def _find_cartesian_join(join: exp.Join) -> list[LintFinding]:
+    if (
+        _has_join_condition(join)
+        or isinstance(join.this, exp.Unnest | exp.Lateral)
+        or _has_join_predicate_in_where(join)
+    ):
+        return []
+    return [
+        LintFinding(
+            "cartesian_join",
+            f"JOIN {join.this.sql()} has no join condition",
+            join.sql(),
+        )
+    ]
+
+
+def _is_wrapped_column(operand: exp.Expr | None) -> bool:
+    if operand is None:
+        return False
+
+    operand = operand.unnest()
+    return (
+        not isinstance(operand, exp.Column | exp.Query | exp.Subquery)
+        and operand.find(exp.Column) is not None
+    )
+
+
+def _is_bare_column(operand: exp.Expr | None) -> bool:
+    return operand is not None and isinstance(operand.unnest(), exp.Column)
+
+
+def _wraps_only_column_side(predicate: exp.Expr) -> bool:
+    operands = (predicate.this, predicate.args.get("expression"))
+    return any(map(_is_wrapped_column, operands)) and not any(
+        map(_is_bare_column, operands)
+    )
+
+
+def _has_leading_wildcard(predicate: exp.Expr) -> bool:
+    pattern = predicate.args.get("expression")
+    return (
+        isinstance(predicate, exp.Like | exp.ILike)
+        and isinstance(pattern, exp.Literal)
+        and pattern.is_string
+        and pattern.this.startswith("%")
+    )
+
+
+def _find_non_sargable_predicates(where: exp.Where) -> list[LintFinding]:
+    return [
+        LintFinding(
+            "non_sargable_predicate",
+            "Predicate wraps a column in an expression or leading wildcard",
+            predicate.sql(),
+        )
+        for predicate in where.find_all(*_COMPARISON_TYPES)
+        if predicate.find_ancestor(exp.Where) is where
+        and (
+            _wraps_only_column_side(predicate)
+            or _has_leading_wildcard(predicate)
+        )
+    ]
+
+
+def _find_select_star_in_cte(cte: exp.CTE) -> list[LintFinding]:
+    query = cte.this
+    if not isinstance(query, exp.Query) or not query.is_star:
+        return []
+    return [
+        LintFinding(
+            "select_star_in_cte",
+            f"CTE {cte.alias} selects every column with *",
+            query.sql(),
+        )
+    ]
+
+
+def _find_or_heavy_predicate(
+    clause: exp.Where | exp.Having, or_predicate_threshold: int
+) -> list[LintFinding]:
+    or_count = sum(
+        1
+        for or_node in clause.find_all(exp.Or)
+        if or_node.find_ancestor(exp.Where, exp.Having) is clause
+    )
+    if or_count < or_predicate_threshold:
+        return []
+    return [
+        LintFinding(
+            "or_heavy_predicate",
+            f"{clause.key.upper()} combines {or_count} OR operators",
+            clause.this.sql(),
+        )
+    ]
+
+
+def _find_case_repeating_where(case: exp.Case) -> list[LintFinding]:
+    select = case.find_ancestor(exp.Select)
+    where = select.args.get("where") if select is not None else None
+    if where is None:
+        return []
+
+    where_keys = {_predicate_key(where.this)} | {
+        _predicate_key(disjunct)
+        for disjunct in _flatten_predicate(where.this, exp.Or)
+    }
+    return [
+        LintFinding(
+            "case_repeats_where",
+            "CASE branch repeats a WHERE predicate",
+            if_clause.this.sql(),
+        )
+        for if_clause in case.args.get("ifs", [])
+        if _predicate_key(if_clause.this) in where_keys
+    ]
+
+
+def _find_correlated_subqueries(syntax_tree: exp.Expr) -> list[LintFinding]:
+    return [
+        LintFinding(
+            "correlated_subquery",
+            "Subquery references columns of its outer query",
+            scope.expression.sql(),
+        )
+        for scope in traverse_scope(syntax_tree)
+        if scope.scope_type is ScopeType.SUBQUERY
+        and any(
+            column.table and column.table not in scope.sources
+            for column in scope.columns
+        )
+    ]
+
+
+class SQLLinter:
+    def __init__(
+        self,
+        read: str | None = None,
+        *,
+        or_predicate_threshold: int = DEFAULT_OR_PREDICATE_THRESHOLD,
+    ) -> None:
+        if or_predicate_threshold < 1:
+            raise ValueError(
+                "or_predicate_threshold must be positive: "
+                f"{or_predicate_threshold}"
+            )
+
+        self._read = read
+        self._single_pass_analyzer = SinglePassAnalyzer(
+            [
+                NodeExtractor(
+                    _COMPLEXITY_EXTRACTOR_NAME,
+                    tuple(_COMPLEXITY_WEIGHTS),
+                    _complexity_weight,
+                ),
+                NodeExtractor(
+                    "cartesian_join", (exp.Join,), _find_cartesian_join
+                ),
+                NodeExtractor(
+                    "non_sargable_predicate",
+                    (exp.Where,),
+                    _find_non_sargable_predicates,
+                ),
+                NodeExtractor(
+                    "select_star_in_cte", (exp.CTE,), _find_select_star_in_cte
+                ),
+                NodeExtractor(
+                    "or_heavy_predicate",
+                    (exp.Where, exp.Having),
+                    partial(
+                        _find_or_heavy_predicate,
+                        or_predicate_threshold=or_predicate_threshold,
+                    ),
+                ),
+                NodeExtractor(
+                    "case_repeats_where",
+                    (exp.Case,),
+                    _find_case_repeating_where,
+                ),
+            ]
+        )
+
+    def lint(
+        self, syntax_tree: exp.Expr, statement_index: int = 0
+    ) -> StatementLintReport:
+        statement_analysis = self._single_pass_analyzer.analyze(
+            syntax_tree, statement_index
+        )
+        extracted_items = statement_analysis.extras
+        findings = [
+            finding
+            for name, findings_by_node in extracted_items.items()
+            if name != _COMPLEXITY_EXTRACTOR_NAME
+            for node_findings in findings_by_node
+            for finding in node_findings
+        ]
+        findings.extend(_find_correlated_subqueries(syntax_tree))
+        return StatementLintReport(
+            statement_index=statement_index,
+            statement_type=statement_analysis.statement_type,
+            structural_score=sum(extracted_items[_COMPLEXITY_EXTRACTOR_NAME]),
+            findings=findings,
+        )
+
+    def lint_sql(self, sql: str) -> list[StatementLintReport]:
+        return [
+            self.lint(syntax_tree, statement_index)
+            for statement_index, syntax_tree in enumerate(
+                sqlglot.parse(sql, read=self._read)
+            )
+            if syntax_tree is not None
+        ]
+
+    def lint_file(self, path: Path) -> FileLintReport:
+        try:
+            reports = self.lint_sql(path.read_text(encoding="utf-8"))
+        except Exception as error:
+            return FileLintReport(
+                path=str(path), error=f"{type(error).__name__}: {error}"
+            )
+        return FileLintReport(path=str(path), reports=reports)
+
+    def iter_file_reports(
+        self, source: str | Path | Iterable[Path]
+    ) -> Generator[FileLintReport]:
+        paths = (
+            iter_sql_paths(source)
+            if isinstance(source, str | Path)
+            else iter(source)
+        )
+        for path in paths:
+            yield self.lint_file(path)
+
+    def rank(
+        self,
+        source: str | Path | Iterable[Path],
+        limit: int = DEFAULT_RANK_LIMIT,
+    ) -> list[RankedStatement]:
+        return heapq.nlargest(
+            limit,
+            (
+                RankedStatement(path=file_report.path, report=report)
+                for file_report in self.iter_file_reports(source)
+                for report in file_report.reports
+            ),
+            key=lambda ranked_statement: (
+                ranked_statement.report.complexity_score
+            ),
+        )
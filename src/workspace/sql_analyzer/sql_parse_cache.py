@@ -0,0 +1,300 @@
+import hashlib
+import pickle
+import sqlite3
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from types import TracebackType
+from typing import Any, Self
+
+import sqlglot
+from sqlglot import exp
+from sqlglot.dialects.dialect import DialectType
+
+DEFAULT_PARSE_CACHE_MAX_ENTRIES = 100_000
+DEFAULT_PARSE_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+DEFAULT_ACCESS_TIME_RESOLUTION_SECONDS = 60.0
+_SYNTAX_TREE_NAMESPACE = "syntax_tree"
+_SQLITE_SCHEMA_SQL = """
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS parse_cache (
+    cache_key TEXT PRIMARY KEY,
+    payload BLOB NOT NULL,
+    payload_bytes INTEGER NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS parse_cache_accessed_at
+ON parse_cache (accessed_at);
+CREATE TABLE IF NOT EXISTS parse_cache_totals (
+    singleton INTEGER PRIMARY KEY CHECK (singleton = 1),
+    entry_count INTEGER NOT NULL,
+    total_bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO parse_cache_totals (singleton, entry_count, total_bytes)
+SELECT 1, count(*), coalesce(sum(payload_bytes), 0) FROM parse_cache;
+CREATE TRIGGER IF NOT EXISTS parse_cache_totals_insert
+AFTER INSERT ON parse_cache BEGIN
+    UPDATE parse_cache_totals
+    SET entry_count = entry_count + 1,
+        total_bytes = total_bytes + new.payload_bytes;
+END;
+CREATE TRIGGER IF NOT EXISTS parse_cache_totals_update
+AFTER UPDATE OF payload_bytes ON parse_cache BEGIN
+    UPDATE parse_cache_totals
+    SET total_bytes = total_bytes - old.payload_bytes + new.payload_bytes;
+END;
+CREATE TRIGGER IF NOT EXISTS parse_cache_totals_delete
+AFTER DELETE ON parse_cache BEGIN
+    UPDATE parse_cache_totals
+    SET entry_count = entry_count - 1,
+        total_bytes = total_bytes - old.payload_bytes;
+END;
+COMMIT;
+"""
+_SQLITE_UPSERT_SQL = """
+INSERT INTO parse_cache (cache_key, payload, payload_bytes, accessed_at)
+VALUES (?, ?, ?, ?)
+ON CONFLICT (cache_key) DO UPDATE SET
+    payload = excluded.payload,
+    payload_bytes = excluded.payload_bytes,
+    accessed_at = excluded.accessed_at
+"""
+
+
+@dataclass(frozen=True)
+class ParseCacheStats:
+    size: int
+    total_bytes: int
+    hit_count: int
+    miss_count: int
+    eviction_count: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookup_count = self.hit_count + self.miss_count
+        return self.hit_count / lookup_count if lookup_count else 0.0
+
+
+def _dialect_cache_name(dialect: DialectType) -> str:
+    if dialect is None or isinstance(dialect, str):
+        return dialect or ""
+
+    dialect_type = dialect if isinstance(dialect, type) else type(dialect)
+    return f"{dialect_type.__module__}.{dialect_type.__qualname__}"
+
+
+def create_parse_cache_key(
+    namespace: str, sql: str, read: DialectType = None, **parse_options: Any
+) -> str:
+    cache_key_hash = hashlib.sha256()
+    for key_part in (
+        namespace,
+        sqlglot.__version__,
+        _dialect_cache_name(read),
+        repr(sorted(parse_options.items())),
+    ):
+        cache_key_hash.update(key_part.encode())
+        cache_key_hash.update(b"\0")
+    cache_key_hash.update(sql.encode())
+    return cache_key_hash.hexdigest()
+
+
+class ParseCache:
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        max_entries: int = DEFAULT_PARSE_CACHE_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_PARSE_CACHE_MAX_BYTES,
+        access_time_resolution_seconds: float = (
+            DEFAULT_ACCESS_TIME_RESOLUTION_SECONDS
+        ),
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be positive: {max_entries}")
+        if max_bytes < 1:
+            raise ValueError(f"max_bytes must be positive: {max_bytes}")
+
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._access_time_resolution_seconds = access_time_resolution_seconds
+        self._connection = sqlite3.connect(
+            path, timeout=30.0, check_same_thread=False, autocommit=True
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SQLITE_SCHEMA_SQL)
+        self._lock = Lock()
+        self._hit_count = 0
+        self._miss_count = 0
+        self._eviction_count = 0
+
+    def get(
+        self,
+        namespace: str,
+        sql: str,
+        read: DialectType = None,
+        **parse_options: Any,
+    ) -> Any:
+        cache_key = create_parse_cache_key(
+            namespace, sql, read, **parse_options
+        )
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT payload, accessed_at FROM parse_cache "
+                "WHERE cache_key = ?",
+                (cache_key,),
+            ).fetchone()
+            if row is None:
+                self._miss_count += 1
+                return None
+
+            self._hit_count += 1
+            payload, accessed_at = row
+            now = time.time()
+            if now - accessed_at >= self._access_time_resolution_seconds:
+                self._connection.execute(
+                    "UPDATE parse_cache SET accessed_at = ? "
+                    "WHERE cache_key = ?",
+                    (now, cache_key),
+                )
+        return pickle.loads(payload)
+
+    def put(
+        self,
+        namespace: str,
+        sql: str,
+        value: Any,
+        read: DialectType = None,
+        **parse_options: Any,
+    ) -> None:
+        if value is None:
+            raise ValueError("None cannot be stored in the parse cache")
+
+        cache_key = create_parse_cache_key(
+            namespace, sql, read, **parse_options
+        )
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock, self._immediate_transaction():
+            self._connection.execute(
+                _SQLITE_UPSERT_SQL,
+                (cache_key, payload, len(payload), time.time()),
+            )
+            self._evict_over_limits()
+
+    def parse_one(
+        self,
+        sql: str,
+        read: DialectType = None,
+        dialect: DialectType = None,
+        **parse_options: Any,
+    ) -> exp.Expr:
+        syntax_tree_read = read or dialect
+        syntax_tree = self.get(
+            _SYNTAX_TREE_NAMESPACE, sql, syntax_tree_read, **parse_options
+        )
+        if syntax_tree is None:
+            syntax_tree = sqlglot.parse_one(
+                sql, read=syntax_tree_read, **parse_options
+            )
+            self.put(
+                _SYNTAX_TREE_NAMESPACE,
+                sql,
+                syntax_tree,
+                syntax_tree_read,
+                **parse_options,
+            )
+        return syntax_tree
+
+    def stats(self) -> ParseCacheStats:
+        with self._lock:
+            size, total_bytes = self._read_totals()
+            return ParseCacheStats(
+                size=size,
+                total_bytes=total_bytes,
+                hit_count=self._hit_count,
+                miss_count=self._miss_count,
+                eviction_count=self._eviction_count,
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM parse_cache")
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception_value: BaseException | None,
+        exception_traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _read_totals(self) -> tuple[int, int]:
+        entry_count, total_bytes = self._connection.execute(
+            "SELECT entry_count, total_bytes FROM parse_cache_totals"
+        ).fetchone()
+        return entry_count, total_bytes
+
+    def _evict_over_limits(self) -> None:
+        entry_count, total_bytes = self._read_totals()
+        excess_entry_count = entry_count - self._max_entries
+        excess_bytes = total_bytes - self._max_bytes
+        if excess_entry_count <= 0 and excess_bytes <= 0:
+            return
+
+        evicted_cache_keys: list[tuple[str]] = []
+        oldest_entries = self._connection.execute(
+            "SELECT cache_key, payload_bytes FROM parse_cache "
+            "ORDER BY accessed_at"
+        )
+        for cache_key, payload_bytes in oldest_entries:
+            if excess_entry_count <= 0 and excess_bytes <= 0:
+                break
+            evicted_cache_keys.append((cache_key,))
+            excess_entry_count -= 1
+            excess_bytes -= payload_bytes
+        oldest_entries.close()
+
+        self._connection.executemany(
+            "DELETE FROM parse_cache WHERE cache_key = ?", evicted_cache_keys
+        )
+        self._eviction_count += len(evicted_cache_keys)
+
+    @contextmanager
+    def _immediate_transaction(self) -> Generator[None]:
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
+
+
+_WORKER_PARSE_CACHES: dict[Path, ParseCache] = {}
+
+
+def open_worker_parse_cache(path: Path | None) -> None:
+    if path is not None:
+        _WORKER_PARSE_CACHES[path] = ParseCache(path)
+
+
+def get_worker_parse_cache(path: Path | None) -> ParseCache | None:
+    if path is None:
+        return None
+
+    parse_cache = _WORKER_PARSE_CACHES.get(path)
+    if parse_cache is None:
+        raise RuntimeError(
+            f"Parse cache was not opened in this worker process: {path}"
+        )
+    return parse_cache
@@ -0,0 +1,161 @@
+import mmap
+import os
+import re
+from collections.abc import Generator, Sequence
+from dataclasses import asdict, dataclass
+from functools import cache
+from itertools import chain
+from pathlib import Path
+from typing import Any
+
+import sqlglot
+from sqlglot.dialects.dialect import Dialect
+from sqlglot.errors import SqlglotError
+
+from workspace.sql_analyzer.sql_analysis import (
+    DEFAULT_EXTRACTORS,
+    NodeExtractor,
+    SinglePassAnalyzer,
+    StatementAnalysis,
+)
+
+_STATEMENT_TERMINATOR = b";"
+_HEREDOC_PATTERN = (
+    rb"\$(?P<heredoc_tag>(?:[A-Za-z_]\w*)?)\$.*?\$(?P=heredoc_tag)\$"
+)
+
+
+@dataclass(frozen=True)
+class SQLStatement:
+    start_offset: int
+    end_offset: int
+    sql: str
+
+
+@dataclass(frozen=True)
+class StreamedStatementAnalysis:
+    start_offset: int
+    end_offset: int
+    analysis: StatementAnalysis | None = None
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _delimiter_pair(delimiter: str | Sequence[str]) -> tuple[bytes, bytes]:
+    if isinstance(delimiter, str):
+        return delimiter.encode(), delimiter.encode()
+
+    opening, closing = delimiter
+    return opening.encode(), closing.encode()
+
+
+def _quoted_pattern(
+    opening: bytes, closing: bytes, backslash_escapes: bool
+) -> bytes:
+    if len(closing) > 1:
+        body = rb"(?:\\.|.)*?" if backslash_escapes else rb".*?"
+        return re.escape(opening) + body + re.escape(closing)
+
+    excluded = re.escape(closing) + (rb"\\" if backslash_escapes else b"")
+    body = rb"[^%s]*" % excluded
+    if backslash_escapes:
+        body += rb"(?:\\.[^%s]*)*" % excluded
+    return re.escape(opening) + body + re.escape(closing)
+
+
+@cache
+def statement_token_pattern(read: str | None = None) -> re.Pattern[bytes]:
+    tokenizer = Dialect.get_or_raise(read).tokenizer_class
+    backslash_escapes = "\\" in tokenizer.STRING_ESCAPES
+    quoted_delimiters = sorted(
+        {
+            _delimiter_pair(delimiter)
+            for delimiter in [*tokenizer.QUOTES, *tokenizer.IDENTIFIERS]
+        },
+        key=lambda delimiter_pair: -len(delimiter_pair[0]),
+    )
+    token_patterns = [
+        _quoted_pattern(opening, closing, backslash_escapes)
+        for opening, closing in quoted_delimiters
+    ]
+    for comment in tokenizer.COMMENTS:
+        opening, closing = _delimiter_pair(comment)
+        token_patterns.append(
+            re.escape(opening) + rb".*?" + re.escape(closing)
+            if isinstance(comment, tuple)
+            else re.escape(opening) + rb"[^\n]*"
+        )
+    if "$" in tokenizer.HEREDOC_STRINGS:
+        token_patterns.append(_HEREDOC_PATTERN)
+    token_patterns.append(re.escape(_STATEMENT_TERMINATOR))
+    return re.compile(b"|".join(token_patterns), re.DOTALL)
+
+
+def split_sql_statements(
+    sql_buffer: bytes | mmap.mmap, read: str | None = None
+) -> Generator[SQLStatement]:
+    statement_start = 0
+    statement_ends = (
+        token_match.start()
+        for token_match in statement_token_pattern(read).finditer(sql_buffer)
+        if token_match[0] == _STATEMENT_TERMINATOR
+    )
+    for statement_end in chain(statement_ends, [len(sql_buffer)]):
+        sql = sql_buffer[statement_start:statement_end].decode("utf-8")
+        if sql.strip():
+            yield SQLStatement(statement_start, statement_end, sql)
+        statement_start = statement_end + len(_STATEMENT_TERMINATOR)
+
+
+def iter_sql_file_statements(
+    path: str | Path, read: str | None = None
+) -> Generator[SQLStatement]:
+    with Path(path).open("rb") as sql_file:
+        if os.fstat(sql_file.fileno()).st_size == 0:
+            return
+
+        with mmap.mmap(
+            sql_file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as sql_buffer:
+            yield from split_sql_statements(sql_buffer, read)
+
+
+class StreamingSQLAnalyzer:
+    def __init__(
+        self,
+        read: str | None = None,
+        *,
+        extractors: Sequence[NodeExtractor] = DEFAULT_EXTRACTORS,
+    ) -> None:
+        self._read = read
+        self._single_pass_analyzer = SinglePassAnalyzer(extractors)
+
+    def iter_statements(self, path: str | Path) -> Generator[SQLStatement]:
+        yield from iter_sql_file_statements(path, self._read)
+
+    def iter_analyses(
+        self, path: str | Path
+    ) -> Generator[StreamedStatementAnalysis]:
+        statement_index = 0
+        for statement in self.iter_statements(path):
+            try:
+                syntax_trees = sqlglot.parse(statement.sql, read=self._read)
+            except SqlglotError as error:
+                yield StreamedStatementAnalysis(
+                    start_offset=statement.start_offset,
+                    end_offset=statement.end_offset,
+                    error=f"{type(error).__name__}: {error}",
+                )
+                continue
+
+            for syntax_tree in filter(None, syntax_trees):
+                yield StreamedStatementAnalysis(
+                    start_offset=statement.start_offset,
+                    end_offset=statement.end_offset,
+                    analysis=self._single_pass_analyzer.analyze(
+                        syntax_tree, statement_index
+                    ),
+                )
+                statement_index += 1
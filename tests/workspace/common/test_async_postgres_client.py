@@ -0,0 +1,278 @@
+import asyncio
+import socket
+from typing import Any
+
+import pytest
+from psycopg2.extensions import (
+    POLL_OK,
+    POLL_READ,
+    TRANSACTION_STATUS_IDLE,
+    TRANSACTION_STATUS_INTRANS,
+)
+from pytest import MonkeyPatch
+
+from workspace.common import async_postgres_client
+from workspace.common.async_postgres_client import AsyncPostgresClient
+from workspace.common.async_postgres_pool import AsyncPostgresConnectionPool
+from workspace.common.postgres_settings import PostgresSettings
+
+
+class _StubAsyncCursor:
+    def __init__(self, connection: "_StubAsyncConnection") -> None:
+        self._connection = connection
+        self._sql = ""
+
+    def execute(self, sql: str, params: tuple = ()) -> None:
+        self._sql = sql
+        self._connection.start_query(sql)
+
+    def fetchone(self) -> dict[str, Any]:
+        return {"sql": self._sql}
+
+    def fetchall(self) -> list[dict[str, Any]]:
+        return [{"sql": self._sql}]
+
+    def close(self) -> None:
+        return None
+
+
+class _StubAsyncConnection:
+    def __init__(self, blocks_selects: bool) -> None:
+        self.closed = 0
+        self.is_cancelled = False
+        self.executed_sqls: list[str] = []
+        self._blocks_selects = blocks_selects
+        self._is_waiting_for_result = False
+        self._transaction_status = TRANSACTION_STATUS_IDLE
+        self._reader_socket, self._writer_socket = socket.socketpair()
+        self._reader_socket.setblocking(False)
+
+    @property
+    def is_waiting_for_result(self) -> bool:
+        return self._is_waiting_for_result
+
+    def start_query(self, sql: str) -> None:
+        self.executed_sqls.append(sql)
+        if sql == "BEGIN":
+            self._transaction_status = TRANSACTION_STATUS_INTRANS
+        elif sql in ("COMMIT", "ROLLBACK"):
+            self._transaction_status = TRANSACTION_STATUS_IDLE
+        self._is_waiting_for_result = self._blocks_selects and sql.startswith(
+            "SELECT"
+        )
+
+    def deliver_result(self) -> None:
+        self._writer_socket.send(b"x")
+
+    def cursor(self, cursor_factory: Any = None) -> _StubAsyncCursor:
+        return _StubAsyncCursor(self)
+
+    def fileno(self) -> int:
+        return self._reader_socket.fileno()
+
+    def poll(self) -> int:
+        if not self._is_waiting_for_result:
+            return POLL_OK
+        try:
+            self._reader_socket.recv(1)
+        except BlockingIOError:
+            return POLL_READ
+        self._is_waiting_for_result = False
+        return POLL_OK
+
+    def isexecuting(self) -> bool:
+        return self._is_waiting_for_result
+
+    def get_transaction_status(self) -> int:
+        return self._transaction_status
+
+    def cancel(self) -> None:
+        self.is_cancelled = True
+
+    def close(self) -> None:
+        self.closed = 1
+        self._reader_socket.close()
+        self._writer_socket.close()
+
+
+class _StubAsyncConnectionFactory:
+    def __init__(self, blocks_selects: bool = False) -> None:
+        self.connections: list[_StubAsyncConnection] = []
+        self._blocks_selects = blocks_selects
+
+    async def __call__(self) -> _StubAsyncConnection:
+        connection = _StubAsyncConnection(self._blocks_selects)
+        self.connections.append(connection)
+        return connection
+
+
+def _create_settings() -> PostgresSettings:
+    return PostgresSettings(
+        postgres_host="localhost",
+        postgres_port=5432,
+        postgres_db_name="sandbox",
+        postgres_user="sandbox",
+        postgres_password="sandbox",
+    )
+
+
+async def _wait_until(condition: Any, timeout_seconds: float = 1.0) -> None:
+    async with asyncio.timeout(timeout_seconds):
+        while not condition():
+            await asyncio.sleep(0.001)
+
+
+def test_async_client_wraps_calls_in_transaction(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    # Arrange
+    connection_factory = _StubAsyncConnectionFactory()
+    monkeypatch.setattr(
+        async_postgres_client,
+        "connect_async",
+        lambda **_: connection_factory(),
+    )
+
+    async def run_queries() -> list[Any]:
+        async with AsyncPostgresClient(_create_settings()) as db:
+            await db.executemany(
+                "INSERT INTO users (name) VALUES (%s)", [("a",), ("b",)]
+            )
+            return await db.fetchall("SELECT * FROM users")
+
+    # Act
+    rows = asyncio.run(run_queries())
+
+    # Assert
+    assert rows == [{"sql": "SELECT * FROM users"}]
+    (connection,) = connection_factory.connections
+    assert connection.executed_sqls == [
+        "BEGIN",
+        "INSERT INTO users (name) VALUES (%s)",
+        "INSERT INTO users (name) VALUES (%s)",
+        "SELECT * FROM users",
+        "COMMIT",
+    ]
+    assert connection.closed == 1
+
+
+def test_async_client_rolls_back_and_reuses_pooled_connection() -> None:
+    # Arrange
+    connection_factory = _StubAsyncConnectionFactory()
+    pool = AsyncPostgresConnectionPool(connection_factory, min_size=1)
+
+    async def fail_then_succeed() -> None:
+        await pool.open()
+        with pytest.raises(ValueError, match="boom"):
+            async with AsyncPostgresClient(
+                _create_settings(), pool=pool
+            ) as db:
+                await db.execute("DELETE FROM users")
+                raise ValueError("boom")
+        async with AsyncPostgresClient(_create_settings(), pool=pool) as db:
+            await db.fetchone("SELECT 1")
+
+    # Act
+    asyncio.run(fail_then_succeed())
+
+    # Assert
+    (connection,) = connection_factory.connections
+    assert connection.executed_sqls == [
+        "BEGIN",
+        "DELETE FROM users",
+        "ROLLBACK",
+        "BEGIN",
+        "SELECT 1",
+        "COMMIT",
+    ]
+    assert pool.metrics().acquire_count == 2
+
+
+def test_async_pool_keeps_queries_in_flight_concurrently() -> None:
+    # Arrange
+    connection_factory = _StubAsyncConnectionFactory(blocks_selects=True)
+    pool = AsyncPostgresConnectionPool(
+        connection_factory, min_size=0, max_size=3
+    )
+
+    async def fetch(query_index: int) -> Any:
+        async with AsyncPostgresClient(_create_settings(), pool=pool) as db:
+            return await db.fetchone(f"SELECT {query_index}")
+
+    async def run_concurrently() -> tuple[int, list[Any]]:
+        tasks = [asyncio.create_task(fetch(index)) for index in range(3)]
+        await _wait_until(
+            lambda: (
+                sum(
+                    connection.is_waiting_for_result
+                    for connection in connection_factory.connections
+                )
+                == 3
+            )
+        )
+        in_flight_count = pool.metrics().in_use_count
+        for connection in connection_factory.connections:
+            connection.deliver_result()
+        return in_flight_count, list(await asyncio.gather(*tasks))
+
+    # Act
+    in_flight_count, rows = asyncio.run(run_concurrently())
+
+    # Assert
+    assert in_flight_count == 3
+    assert rows == [{"sql": f"SELECT {index}"} for index in range(3)]
+    metrics = pool.metrics()
+    assert metrics.created_count == 3
+    assert metrics.idle_count == 3
+
+
+def test_async_pool_times_out_when_exhausted() -> None:
+    # Arrange
+    pool = AsyncPostgresConnectionPool(
+        _StubAsyncConnectionFactory(),
+        min_size=0,
+        max_size=1,
+        acquire_timeout_seconds=0.05,
+    )
+
+    async def acquire_twice() -> None:
+        await pool.acquire()
+        await pool.acquire()
+
+    # Act / Assert
+    with pytest.raises(TimeoutError, match="pooled connection"):
+        asyncio.run(acquire_twice())
+    assert pool.metrics().acquire_timeout_count == 1
+
+
+def test_async_client_discards_connection_after_cancellation() -> None:
+    # Arrange
+    connection_factory = _StubAsyncConnectionFactory(blocks_selects=True)
+    pool = AsyncPostgresConnectionPool(connection_factory, min_size=0)
+
+    async def cancel_running_query() -> None:
+        async def fetch() -> None:
+            async with AsyncPostgresClient(
+                _create_settings(), pool=pool
+            ) as db:
+                await db.fetchall("SELECT pg_sleep(60)")
+
+        task = asyncio.create_task(fetch())
+        await _wait_until(
+            lambda: any(
+                connection.is_waiting_for_result
+                for connection in connection_factory.connections
+            )
+        )
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    # Act
+    asyncio.run(cancel_running_query())
+
+    # Assert
+    (connection,) = connection_factory.connections
+    assert connection.is_cancelled
+    assert connection.closed == 1
+    assert pool.metrics().size == 0
@@ -0,0 +1,178 @@
+import subprocess
+from pathlib import Path
+
+import pytest
+from pytest import MonkeyPatch
+
+from workspace.common.benchmark import (
+    BenchmarkCase,
+    BenchmarkResult,
+    compare_to_baseline,
+    discover_benchmarks,
+    get_git_commit,
+    load_results,
+    mann_whitney_u_p_value,
+    run_benchmark,
+    save_results,
+)
+
+
+def _create_benchmark_result(
+    name: str, wall_seconds_samples: list[float]
+) -> BenchmarkResult:
+    return BenchmarkResult(
+        name=name,
+        samples={
+            "wall_seconds": wall_seconds_samples,
+            "cpu_seconds": wall_seconds_samples,
+        },
+    )
+
+
+def test_discover_benchmarks_finds_benchmark_functions(
+    tmp_path: Path,
+) -> None:
+    # Arrange
+    (tmp_path / "benchmark_sample.py").write_text(
+        "from math import sqrt\n"
+        "def benchmark_sum():\n"
+        "    sum(range(100))\n"
+        "def helper():\n"
+        "    pass\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "not_a_benchmark.py").write_text(
+        "def benchmark_ignored():\n    pass\n", encoding="utf-8"
+    )
+
+    # Act
+    benchmark_cases = discover_benchmarks([tmp_path])
+
+    # Assert
+    assert [benchmark_case.name for benchmark_case in benchmark_cases] == [
+        "benchmark_sample.benchmark_sum"
+    ]
+
+
+def test_run_benchmark_collects_samples_after_warmup() -> None:
+    # Arrange
+    call_count = 0
+
+    def benchmark_increment() -> None:
+        nonlocal call_count
+        call_count += 1
+
+    # Act
+    benchmark_result = run_benchmark(
+        BenchmarkCase(name="increment", function=benchmark_increment),
+        warmup_rounds=2,
+        repetitions=5,
+        memory_repetitions=2,
+    )
+
+    # Assert
+    assert call_count == 9
+    assert len(benchmark_result.samples["wall_seconds"]) == 5
+    assert len(benchmark_result.samples["cpu_seconds"]) == 5
+    assert len(benchmark_result.samples["unique_set_size_delta_mib"]) == 2
+
+
+def test_save_and_load_results_round_trip(tmp_path: Path) -> None:
+    # Arrange
+    benchmark_result = _create_benchmark_result("sample", [0.1, 0.2, 0.3])
+
+    # Act
+    results_path = save_results([benchmark_result], tmp_path, "abc123")
+    loaded_results = load_results(results_path)
+
+    # Assert
+    assert results_path == tmp_path / "abc123.json"
+    assert loaded_results == [benchmark_result]
+
+
+def test_mann_whitney_u_p_value_detects_shift() -> None:
+    # Arrange
+    baseline_samples = [1.0 + i * 0.01 for i in range(20)]
+    shifted_samples = [1.5 + i * 0.01 for i in range(20)]
+
+    # Act
+    shifted_p_value = mann_whitney_u_p_value(baseline_samples, shifted_samples)
+    same_p_value = mann_whitney_u_p_value(baseline_samples, baseline_samples)
+
+    # Assert
+    assert shifted_p_value < 0.001
+    assert same_p_value == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize(
+    ("current_offset", "expected_verdict"),
+    [(0.5, "regressed"), (-0.5, "improved"), (0.0, "unchanged")],
+)
+def test_compare_to_baseline_verdicts(
+    current_offset: float, expected_verdict: str
+) -> None:
+    # Arrange
+    baseline_samples = [1.0 + i * 0.01 for i in range(20)]
+    current_samples = [sample + current_offset for sample in baseline_samples]
+
+    # Act
+    comparisons = compare_to_baseline(
+        [_create_benchmark_result("sample", current_samples)],
+        [_create_benchmark_result("sample", baseline_samples)],
+    )
+
+    # Assert
+    assert [comparison.metric_name for comparison in comparisons] == [
+        "wall_seconds",
+        "cpu_seconds",
+    ]
+    assert all(
+        comparison.verdict == expected_verdict for comparison in comparisons
+    )
+
+
+def test_compare_to_baseline_skips_new_benchmarks() -> None:
+    # Act
+    comparisons = compare_to_baseline(
+        [_create_benchmark_result("new", [1.0, 1.1])],
+        [_create_benchmark_result("old", [1.0, 1.1])],
+    )
+
+    # Assert
+    assert comparisons == []
+
+
+def test_get_git_commit_marks_dirty_trees_and_missing_repositories(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    # Arrange
+    monkeypatch.setenv("GIT_CEILING_DIRECTORIES", str(tmp_path))
+    repository_dir = tmp_path / "repository"
+    repository_dir.mkdir()
+    outside_dir = tmp_path / "outside"
+    outside_dir.mkdir()
+    for git_arguments in (
+        ["init", "--quiet"],
+        [
+            "-c",
+            "user.name=benchmark",
+            "-c",
+            "user.email=benchmark@example.com",
+            "commit",
+            "--quiet",
+            "--allow-empty",
+            "--message=baseline",
+        ],
+    ):
+        subprocess.run(["git", *git_arguments], cwd=repository_dir, check=True)
+
+    # Act
+    clean_commit = get_git_commit(repository_dir)
+    (repository_dir / "untracked.txt").write_text("x", encoding="utf-8")
+    dirty_commit = get_git_commit(repository_dir)
+    outside_commit = get_git_commit(outside_dir)
+
+    # Assert
+    assert len(clean_commit) == 40
+    assert dirty_commit == f"{clean_commit}-dirty"
+    assert outside_commit == "unknown"
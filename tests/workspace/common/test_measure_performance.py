@@ -1,4 +1,10 @@
+import asyncio
+import tracemalloc
 from collections.abc import Iterator
+from pathlib import Path
+from threading import Event, Thread
+from time import perf_counter
+from typing import Any
 from unittest.mock import Mock
 
 import psutil
@@ -7,13 +13,23 @@ from pytest import LogCaptureFixture, MonkeyPatch
 
 import workspace.common.measure_performance as measure_performance_module  # noqa: E501
 from workspace.common.measure_performance import (
+    CallMeasurement,
     ProcessIOCounters,
     ProcessSnapshot,
     _capture_process_snapshot,
+    _capture_thread_io_counters,
+    _get_psutil_process,
     measure_performance,
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_psutil_process_cache() -> Iterator[None]:
+    _get_psutil_process.cache_clear()
+    yield
+    _get_psutil_process.cache_clear()
+
+
 def _create_process_snapshot(
     resident_set_size_bytes: int,
     unique_set_size_bytes: float | None,
@@ -61,7 +77,7 @@ def test_measure_performance_success_logs(
     monkeypatch.setattr(
         measure_performance_module,
         "_capture_process_snapshot",
-        lambda: next(snapshots),
+        lambda **_: next(snapshots),
     )
 
     caplog.set_level("DEBUG")
@@ -99,7 +115,7 @@ def test_measure_performance_error_logs(
     monkeypatch.setattr(
         measure_performance_module,
         "_capture_process_snapshot",
-        lambda: next(snapshots),
+        lambda **_: next(snapshots),
     )
 
     caplog.set_level("DEBUG")
@@ -149,7 +165,7 @@ def test_capture_process_snapshot_reads_psutil(
     )
 
     # Act
-    snapshot = _capture_process_snapshot()
+    snapshot = _capture_process_snapshot(include_unique_set_size=True)
 
     # Assert
     assert snapshot.resident_set_size_bytes == 2048
@@ -159,3 +175,365 @@ def test_capture_process_snapshot_reads_psutil(
     assert snapshot.process_io_counters.write_bytes == 20
     assert snapshot.process_io_counters.read_count == 1
     assert snapshot.process_io_counters.write_count == 2
+
+
+def test_capture_process_snapshot_skips_unique_set_size(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    # Arrange
+    process_mock = Mock(spec=psutil.Process)
+    process_mock.memory_info.return_value = Mock(rss=2048)
+    process_mock.io_counters.return_value = None
+
+    monkeypatch.setattr(
+        "workspace.common.measure_performance.psutil.Process",
+        lambda: process_mock,
+    )
+
+    # Act
+    snapshot = _capture_process_snapshot(include_unique_set_size=False)
+
+    # Assert
+    assert snapshot.unique_set_size_bytes is None
+    process_mock.memory_full_info.assert_not_called()
+
+
+def test_capture_process_snapshot_reuses_psutil_process(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    # Arrange
+    process_factory = Mock(return_value=Mock(spec=psutil.Process))
+    monkeypatch.setattr(
+        "workspace.common.measure_performance.psutil.Process",
+        process_factory,
+    )
+
+    # Act
+    _capture_process_snapshot(include_unique_set_size=False)
+    _capture_process_snapshot(include_unique_set_size=False)
+
+    # Assert
+    process_factory.assert_called_once_with()
+
+
+def test_measure_performance_samples_every_n_calls(
+    monkeypatch: MonkeyPatch,
+    caplog: LogCaptureFixture,
+) -> None:
+    # Arrange
+    capture_process_snapshot_mock = Mock(
+        side_effect=lambda **_: _create_process_snapshot(1024, None)
+    )
+    monkeypatch.setattr(
+        measure_performance_module,
+        "_capture_process_snapshot",
+        capture_process_snapshot_mock,
+    )
+
+    caplog.set_level("DEBUG")
+
+    @measure_performance(enable_tracemalloc=False, sample_every_n_calls=3)
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    # Act
+    results = [add(i, 1) for i in range(7)]
+
+    # Assert
+    assert results == [1, 2, 3, 4, 5, 6, 7]
+    assert len(caplog.records) == 3
+    assert capture_process_snapshot_mock.call_count == 6
+
+
+def test_measure_performance_skips_unsampled_calls(
+    monkeypatch: MonkeyPatch,
+    caplog: LogCaptureFixture,
+) -> None:
+    # Arrange
+    capture_process_snapshot_mock = Mock()
+    monkeypatch.setattr(
+        measure_performance_module,
+        "_capture_process_snapshot",
+        capture_process_snapshot_mock,
+    )
+    monkeypatch.setattr(measure_performance_module, "random", lambda: 0.5)
+
+    caplog.set_level("DEBUG")
+
+    @measure_performance(enable_tracemalloc=False, sample_rate=0.1)
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    # Act
+    result = add(1, 2)
+
+    # Assert
+    assert result == 3
+    assert not caplog.records
+    capture_process_snapshot_mock.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ("sample_rate", "sample_every_n_calls", "error_message"),
+    [
+        (0.0, 1, "sample_rate must be in the range"),
+        (1.5, 1, "sample_rate must be in the range"),
+        (1.0, 0, "sample_every_n_calls must be a positive integer"),
+        (0.5, 2, "cannot be combined"),
+    ],
+)
+def test_measure_performance_rejects_invalid_sampling(
+    sample_rate: float,
+    sample_every_n_calls: int,
+    error_message: str,
+) -> None:
+    # Act / Assert
+    with pytest.raises(ValueError, match=error_message):
+        measure_performance(
+            enable_tracemalloc=False,
+            sample_rate=sample_rate,
+            sample_every_n_calls=sample_every_n_calls,
+        )
+
+
+def _burn_cpu(seconds: float) -> None:
+    deadline = perf_counter() + seconds
+    while perf_counter() < deadline:
+        pass
+
+
+def test_measure_performance_times_awaited_coroutine() -> None:
+    # Arrange
+    measurements: list[CallMeasurement] = []
+
+    @measure_performance(
+        enable_tracemalloc=False, measurement_handler=measurements.append
+    )
+    async def sleep_then_add(a: int, b: int) -> int:
+        await asyncio.sleep(0.05)
+        return a + b
+
+    # Act
+    result = asyncio.run(sleep_then_add(1, 2))
+
+    # Assert
+    assert result == 3
+    (measurement,) = measurements
+    assert measurement.status == "success"
+    assert measurement.elapsed_wall_seconds >= 0.05
+    assert measurement.suspended_seconds is not None
+    assert measurement.suspended_seconds >= 0.04
+    assert measurement.cpu_seconds < 0.02
+
+
+def test_measure_performance_excludes_other_tasks_cpu() -> None:
+    # Arrange
+    measurements: list[CallMeasurement] = []
+
+    @measure_performance(
+        enable_tracemalloc=False, measurement_handler=measurements.append
+    )
+    async def sleep_briefly() -> None:
+        await asyncio.sleep(0.01)
+
+    async def burn_cpu_in_other_task() -> None:
+        await asyncio.sleep(0)
+        _burn_cpu(0.1)
+
+    async def run_concurrently() -> None:
+        await asyncio.gather(sleep_briefly(), burn_cpu_in_other_task())
+
+    # Act
+    asyncio.run(run_concurrently())
+
+    # Assert
+    (measurement,) = measurements
+    assert measurement.elapsed_wall_seconds >= 0.1
+    assert measurement.cpu_seconds < 0.05
+
+
+def test_measure_performance_reports_coroutine_error(
+    caplog: LogCaptureFixture,
+) -> None:
+    # Arrange
+    caplog.set_level("DEBUG")
+
+    @measure_performance(enable_tracemalloc=False)
+    async def raise_runtime_error() -> None:
+        await asyncio.sleep(0)
+        raise RuntimeError("RuntimeError occured.")
+
+    # Act / Assert
+    with pytest.raises(RuntimeError, match="RuntimeError occured."):
+        asyncio.run(raise_runtime_error())
+
+    assert any(
+        '"status": "error"' in record.message
+        and '"suspended_seconds": ' in record.message
+        for record in caplog.records
+    )
+
+
+def test_capture_thread_io_counters_parses_proc_file(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    # Arrange
+    monkeypatch.setattr(
+        Path,
+        "read_text",
+        lambda _: (
+            "rchar: 100\nwchar: 200\nsyscr: 3\nsyscw: 4\n"
+            "read_bytes: 4096\nwrite_bytes: 8192\n"
+            "cancelled_write_bytes: 0\n"
+        ),
+    )
+
+    # Act
+    thread_io_counters = _capture_thread_io_counters(1234)
+
+    # Assert
+    assert thread_io_counters is not None
+    assert thread_io_counters.read_bytes == 4096
+    assert thread_io_counters.write_bytes == 8192
+    assert thread_io_counters.read_count == 3
+    assert thread_io_counters.write_count == 4
+
+
+def test_capture_thread_io_counters_returns_none_when_unavailable() -> None:
+    # Act
+    thread_io_counters = _capture_thread_io_counters(-1)
+
+    # Assert
+    assert thread_io_counters is None
+
+
+def test_measure_performance_flags_concurrent_thread_activity() -> None:
+    # Arrange
+    measurements: list[CallMeasurement] = []
+    other_thread_started = Event()
+
+    def burn_cpu_in_other_thread() -> None:
+        other_thread_started.set()
+        _burn_cpu(0.2)
+
+    @measure_performance(
+        enable_tracemalloc=False, measurement_handler=measurements.append
+    )
+    def wait_for_other_thread(other_thread: Thread) -> None:
+        other_thread.join()
+
+    other_thread = Thread(target=burn_cpu_in_other_thread)
+
+    # Act
+    other_thread.start()
+    other_thread_started.wait()
+    wait_for_other_thread(other_thread)
+
+    # Assert
+    (measurement,) = measurements
+    assert measurement.thread_metrics is not None
+    assert measurement.thread_metrics.cpu_seconds < 0.05
+    assert measurement.thread_metrics.other_threads_cpu_seconds > 0.1
+    assert measurement.thread_metrics.is_process_wide_contaminated
+
+
+def test_measure_performance_logs_thread_attribution(
+    caplog: LogCaptureFixture,
+) -> None:
+    # Arrange
+    caplog.set_level("DEBUG")
+
+    @measure_performance(enable_tracemalloc=False)
+    def burn_cpu() -> None:
+        _burn_cpu(0.01)
+
+    # Act
+    burn_cpu()
+
+    # Assert
+    assert any(
+        '"thread": ' in record.message
+        and '"process_wide_contaminated": ' in record.message
+        for record in caplog.records
+    )
+
+
+@pytest.fixture
+def stop_tracemalloc() -> Iterator[None]:
+    yield
+    tracemalloc.stop()
+
+
+@pytest.mark.usefixtures("stop_tracemalloc")
+def test_measure_performance_reports_top_allocation_sites() -> None:
+    # Arrange
+    measurements: list[CallMeasurement] = []
+
+    @measure_performance(
+        enable_tracemalloc=True,
+        measurement_handler=measurements.append,
+        top_allocation_site_count=3,
+    )
+    def allocate() -> list[bytes]:
+        return [bytes(1024) for _ in range(1000)]
+
+    # Act
+    allocated_blocks = allocate()
+
+    # Assert
+    assert len(allocated_blocks) == 1000
+    (measurement,) = measurements
+    assert measurement.allocation_sites is not None
+    top_site_by_size = measurement.allocation_sites["by_size"][0]
+    assert top_site_by_size["site"].startswith(__file__)
+    assert top_site_by_size["size_delta_bytes"] >= 1000 * 1024
+    assert len(measurement.allocation_sites["by_count"]) <= 3
+    assert tracemalloc.is_tracing()
+
+
+@pytest.mark.usefixtures("stop_tracemalloc")
+def test_measure_performance_groups_allocation_sites_by_traceback() -> None:
+    # Arrange
+    measurements: list[CallMeasurement] = []
+
+    def allocate_block() -> bytes:
+        return bytes(1024 * 1024)
+
+    @measure_performance(
+        enable_tracemalloc=False,
+        measurement_handler=measurements.append,
+        top_allocation_site_count=1,
+        allocation_site_group_by="traceback",
+    )
+    def allocate() -> bytes:
+        return allocate_block()
+
+    # Act
+    allocate()
+
+    # Assert
+    (measurement,) = measurements
+    assert measurement.allocation_sites is not None
+    (top_site_by_size,) = measurement.allocation_sites["by_size"]
+    assert len(top_site_by_size["traceback"]) > 1
+
+
+@pytest.mark.parametrize(
+    ("top_allocation_site_count", "allocation_site_group_by", "message"),
+    [
+        (-1, "lineno", "top_allocation_site_count must not be negative"),
+        (1, "function", "allocation_site_group_by must be one of"),
+    ],
+)
+def test_measure_performance_rejects_invalid_allocation_site_options(
+    top_allocation_site_count: int,
+    allocation_site_group_by: Any,
+    message: str,
+) -> None:
+    # Act / Assert
+    with pytest.raises(ValueError, match=message):
+        measure_performance(
+            enable_tracemalloc=True,
+            top_allocation_site_count=top_allocation_site_count,
+            allocation_site_group_by=allocation_site_group_by,
+        )
@@ -0,0 +1,135 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.request import urlopen
+
+from workspace.common.measure_performance import (
+    CallMeasurement,
+    ProcessMetrics,
+)
+from workspace.common.openmetrics_exporter import (
+    OPENMETRICS_CONTENT_TYPE,
+    render_openmetrics,
+    start_http_server,
+    write_textfile,
+)
+from workspace.common.performance_metrics import PerformanceMetricsRegistry
+
+
+def _create_call_measurement(
+    function_name: str, status: str, elapsed_wall_seconds: float
+) -> CallMeasurement:
+    return CallMeasurement(
+        function_name=function_name,
+        status=status,
+        elapsed_wall_seconds=elapsed_wall_seconds,
+        cpu_seconds=elapsed_wall_seconds,
+        process_metrics=ProcessMetrics(
+            memory_info={"resident_set_size_delta_mib": 1.0},
+            io_counters={
+                "read_mib": 0.5,
+                "write_mib": 0.0,
+                "read_operations": 3,
+                "write_operations": 0,
+            },
+        ),
+        tracemalloc_metrics=None,
+    )
+
+
+def _create_registry() -> PerformanceMetricsRegistry:
+    registry = PerformanceMetricsRegistry(
+        flush_interval_seconds=None, flush_at_exit=False
+    )
+    registry.record(_create_call_measurement("load", "success", 0.002))
+    registry.record(_create_call_measurement("load", "error", 0.2))
+    return registry
+
+
+def test_render_openmetrics_exposes_histogram_and_counters() -> None:
+    # Arrange
+    registry = _create_registry()
+
+    # Act
+    exposition = render_openmetrics(registry)
+
+    # Assert
+    lines = exposition.splitlines()
+    assert (
+        "# TYPE measure_performance_call_duration_seconds histogram" in lines
+    )
+    assert (
+        'measure_performance_call_duration_seconds_bucket{function="load",'
+        'le="0.005"} 1'
+    ) in lines
+    assert (
+        'measure_performance_call_duration_seconds_bucket{function="load",'
+        'le="+Inf"} 2'
+    ) in lines
+    assert (
+        'measure_performance_calls_total{function="load",status="error"} 1'
+    ) in lines
+    assert (
+        'measure_performance_io_read_bytes_total{function="load"} '
+        + str(1024**2)
+        in lines
+    )
+    assert lines[-1] == "# EOF"
+
+
+def test_registry_merges_thread_shards() -> None:
+    # Arrange
+    registry = PerformanceMetricsRegistry(
+        flush_interval_seconds=None, flush_at_exit=False
+    )
+
+    def record_many(_: int) -> None:
+        for _ in range(250):
+            registry.record(_create_call_measurement("hot", "success", 0.001))
+
+    # Act
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(record_many, range(8)))
+
+    # Assert
+    (function_metrics,) = registry.collect()
+    assert function_metrics.count == 2000
+    assert function_metrics.latency_histogram.count == 2000
+
+
+def test_write_textfile_replaces_file_atomically(tmp_path: Path) -> None:
+    # Arrange
+    registry = _create_registry()
+    output_path = tmp_path / "textfile" / "measure_performance.prom"
+    output_path.parent.mkdir()
+    output_path.write_text("stale\n", encoding="utf-8")
+
+    # Act
+    write_textfile(registry, output_path)
+
+    # Assert
+    assert output_path.read_text(encoding="utf-8") == render_openmetrics(
+        registry
+    )
+    assert [path.name for path in output_path.parent.iterdir()] == [
+        "measure_performance.prom"
+    ]
+
+
+def test_start_http_server_serves_metrics() -> None:
+    # Arrange
+    registry = _create_registry()
+    http_server = start_http_server(registry, port=0)
+    metrics_url = f"http://127.0.0.1:{http_server.server_port}/metrics"
+
+    # Act
+    try:
+        with urlopen(metrics_url) as response:
+            content_type = response.headers["Content-Type"]
+            response_body = response.read().decode("utf-8")
+    finally:
+        http_server.shutdown()
+        http_server.server_close()
+
+    # Assert
+    assert content_type == OPENMETRICS_CONTENT_TYPE
+    assert response_body == render_openmetrics(registry)
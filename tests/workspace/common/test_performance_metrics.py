@@ -0,0 +1,171 @@
+import gc
+import json
+from threading import Thread
+
+import pytest
+from pytest import LogCaptureFixture
+
+from workspace.common.measure_performance import (
+    CallMeasurement,
+    ProcessMetrics,
+    measure_performance,
+)
+from workspace.common.performance_metrics import (
+    LatencyHistogram,
+    PerformanceMetricsRegistry,
+)
+
+
+def _create_call_measurement(
+    status: str, elapsed_wall_seconds: float
+) -> CallMeasurement:
+    return CallMeasurement(
+        function_name="add",
+        status=status,
+        elapsed_wall_seconds=elapsed_wall_seconds,
+        cpu_seconds=elapsed_wall_seconds / 2,
+        process_metrics=ProcessMetrics(
+            memory_info={"resident_set_size_delta_mib": 0.5},
+            io_counters={"read_mib": 1.0, "read_operations": 2},
+        ),
+        tracemalloc_metrics=None,
+    )
+
+
+def test_latency_histogram_percentiles_are_within_bucket_precision() -> None:
+    # Arrange
+    histogram = LatencyHistogram()
+
+    # Act
+    for millisecond in range(1, 1001):
+        histogram.record(millisecond / 1000)
+
+    # Assert
+    assert histogram.count == 1000
+    assert histogram.percentile(50) == pytest.approx(0.5, rel=0.02)
+    assert histogram.percentile(95) == pytest.approx(0.95, rel=0.02)
+    assert histogram.percentile(99) == pytest.approx(0.99, rel=0.02)
+    assert histogram.percentile(100) == pytest.approx(1.0)
+
+
+def test_latency_histogram_merge() -> None:
+    # Arrange
+    histogram = LatencyHistogram()
+    other_histogram = LatencyHistogram()
+    histogram.record(0.001)
+    other_histogram.record(0.003)
+
+    # Act
+    histogram.merge(other_histogram)
+
+    # Assert
+    assert histogram.count == 2
+    assert histogram.max_seconds == pytest.approx(0.003)
+
+
+def test_latency_histogram_cumulative_counts_use_bucket_upper_edges() -> None:
+    # Arrange
+    histogram = LatencyHistogram()
+    histogram.record(1.005)
+
+    # Act
+    cumulative_counts = histogram.cumulative_counts([1.003, 1.01])
+
+    # Assert
+    assert cumulative_counts == [0, 1]
+
+
+def test_registry_aggregates_measurements() -> None:
+    # Arrange
+    registry = PerformanceMetricsRegistry(
+        flush_interval_seconds=None, flush_at_exit=False
+    )
+
+    # Act
+    registry.record(_create_call_measurement("success", 0.002))
+    registry.record(_create_call_measurement("error", 0.004))
+
+    # Assert
+    (summary,) = registry.summarize()
+    assert summary["function"] == "add"
+    assert summary["count"] == 2
+    assert summary["error_count"] == 1
+    assert summary["wall_seconds_sum"] == pytest.approx(0.006)
+    assert summary["cpu_seconds_sum"] == pytest.approx(0.003)
+    assert summary["resident_set_size_delta_mib_sum"] == pytest.approx(1.0)
+    assert summary["io_sums"] == {"read_mib": 2.0, "read_operations": 4}
+    assert summary["latency_seconds"]["p99"] == pytest.approx(0.004, rel=0.02)
+
+
+def test_registry_folds_finished_thread_shards() -> None:
+    # Arrange
+    registry = PerformanceMetricsRegistry(
+        flush_interval_seconds=None, flush_at_exit=False
+    )
+    registry.record(_create_call_measurement("success", 0.002))
+
+    def record_once() -> None:
+        registry.record(_create_call_measurement("error", 0.004))
+
+    # Act
+    for _ in range(5):
+        thread = Thread(target=record_once)
+        thread.start()
+        thread.join()
+    gc.collect()
+
+    # Assert
+    assert len(registry._thread_shards) == 1
+    (summary,) = registry.summarize()
+    assert summary["count"] == 6
+    assert summary["error_count"] == 5
+
+
+def test_registry_flush_logs_compact_summary(
+    caplog: LogCaptureFixture,
+) -> None:
+    # Arrange
+    registry = PerformanceMetricsRegistry(
+        flush_interval_seconds=None, flush_at_exit=False
+    )
+    registry.record(_create_call_measurement("success", 0.002))
+    caplog.set_level("INFO")
+
+    # Act
+    registry.flush()
+
+    # Assert
+    (record,) = caplog.records
+    assert "\n" not in record.message
+    assert json.loads(record.message)["count"] == 1
+
+
+def test_measure_performance_reports_to_registry(
+    caplog: LogCaptureFixture,
+) -> None:
+    # Arrange
+    registry = PerformanceMetricsRegistry(
+        flush_interval_seconds=None, flush_at_exit=False
+    )
+    caplog.set_level("DEBUG")
+
+    @measure_performance(
+        enable_tracemalloc=False, measurement_handler=registry.record
+    )
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    # Act
+    for i in range(5):
+        add(i, 1)
+
+    # Assert
+    (summary,) = registry.summarize()
+    assert summary["count"] == 5
+    assert not caplog.records
+
+
+def test_registry_rejects_non_positive_flush_interval() -> None:
+    # Act / Assert
+    with pytest.raises(ValueError, match="flush_interval_seconds"):
+        PerformanceMetricsRegistry(flush_interval_seconds=0)
@@ -0,0 +1,180 @@
+import asyncio
+import json
+from pathlib import Path
+from time import sleep
+
+import pytest
+
+from workspace.common.measure_performance import (
+    CallMeasurement,
+    measure_performance,
+)
+from workspace.common.performance_trace import (
+    ChromeTraceRecorder,
+    PerformanceSpan,
+    has_current_span,
+)
+
+
+def _ignore_measurement(_: CallMeasurement) -> None:
+    return None
+
+
+def test_measure_performance_builds_span_tree() -> None:
+    # Arrange
+    root_spans: list[PerformanceSpan] = []
+
+    @measure_performance(
+        enable_tracemalloc=False, measurement_handler=_ignore_measurement
+    )
+    def load() -> None:
+        sleep(0.02)
+
+    @measure_performance(
+        enable_tracemalloc=False, measurement_handler=_ignore_measurement
+    )
+    def transform() -> None:
+        sleep(0.01)
+
+    @measure_performance(
+        enable_tracemalloc=False,
+        measurement_handler=_ignore_measurement,
+        trace_handler=root_spans.append,
+    )
+    def pipeline() -> None:
+        load()
+        transform()
+
+    # Act
+    pipeline()
+    pipeline()
+
+    # Assert
+    assert len(root_spans) == 2
+    root_span = root_spans[0]
+    assert root_span.name == "pipeline"
+    assert [child.name for child in root_span.children] == [
+        "load",
+        "transform",
+    ]
+    assert root_span.inclusive_wall_seconds >= 0.03
+    assert root_span.exclusive_wall_seconds < 0.01
+    assert root_span.children[0].exclusive_wall_seconds >= 0.02
+
+
+def test_measure_performance_skips_spans_without_trace_handler() -> None:
+    # Arrange
+    span_observations: list[bool] = []
+
+    @measure_performance(
+        enable_tracemalloc=False, measurement_handler=_ignore_measurement
+    )
+    def handle_request() -> None:
+        span_observations.append(has_current_span())
+
+    @measure_performance(
+        enable_tracemalloc=False, measurement_handler=_ignore_measurement
+    )
+    def worker_loop() -> None:
+        span_observations.append(has_current_span())
+        for _ in range(3):
+            handle_request()
+
+    # Act
+    worker_loop()
+
+    # Assert
+    assert span_observations == [False, False, False, False]
+    assert not has_current_span()
+
+
+def test_measure_performance_span_tree_reports_allocations() -> None:
+    # Arrange
+    root_spans: list[PerformanceSpan] = []
+
+    @measure_performance(
+        enable_tracemalloc=True, measurement_handler=_ignore_measurement
+    )
+    def allocate() -> list[int]:
+        return list(range(100_000))
+
+    @measure_performance(
+        enable_tracemalloc=True,
+        measurement_handler=_ignore_measurement,
+        trace_handler=root_spans.append,
+    )
+    def pipeline() -> list[int]:
+        return allocate()
+
+    # Act
+    pipeline()
+
+    # Assert
+    (root_span,) = root_spans
+    (child_span,) = root_span.children
+    assert child_span.inclusive_allocated_mib is not None
+    assert child_span.inclusive_allocated_mib > 1.0
+    assert root_span.exclusive_allocated_mib is not None
+    assert root_span.exclusive_allocated_mib == pytest.approx(0.0, abs=0.1)
+
+
+def test_measure_performance_links_awaited_child_spans() -> None:
+    # Arrange
+    root_spans: list[PerformanceSpan] = []
+
+    @measure_performance(
+        enable_tracemalloc=False, measurement_handler=_ignore_measurement
+    )
+    async def fetch(delay_seconds: float) -> None:
+        await asyncio.sleep(delay_seconds)
+
+    @measure_performance(
+        enable_tracemalloc=False,
+        measurement_handler=_ignore_measurement,
+        trace_handler=root_spans.append,
+    )
+    async def ingest() -> None:
+        await asyncio.gather(fetch(0.01), fetch(0.02))
+
+    # Act
+    asyncio.run(ingest())
+
+    # Assert
+    (root_span,) = root_spans
+    assert [child.name for child in root_span.children] == ["fetch", "fetch"]
+
+
+def test_chrome_trace_recorder_writes_complete_events(tmp_path: Path) -> None:
+    # Arrange
+    recorder = ChromeTraceRecorder()
+    output_path = tmp_path / "trace.json"
+
+    @measure_performance(
+        enable_tracemalloc=False, measurement_handler=_ignore_measurement
+    )
+    def child() -> None:
+        sleep(0.001)
+
+    @measure_performance(
+        enable_tracemalloc=False,
+        measurement_handler=_ignore_measurement,
+        trace_handler=recorder.record,
+    )
+    def parent() -> None:
+        child()
+
+    # Act
+    parent()
+    recorder.write(output_path)
+
+    # Assert
+    chrome_trace = json.loads(output_path.read_text(encoding="utf-8"))
+    trace_events = chrome_trace["traceEvents"]
+    assert [trace_event["name"] for trace_event in trace_events] == [
+        "parent",
+        "child",
+    ]
+    assert all(trace_event["ph"] == "X" for trace_event in trace_events)
+    parent_event, child_event = trace_events
+    assert parent_event["ts"] <= child_event["ts"]
+    assert parent_event["dur"] >= child_event["dur"]
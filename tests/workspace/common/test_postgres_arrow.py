@@ -0,0 +1,173 @@
+from datetime import UTC, date, datetime
+from decimal import Decimal
+from typing import IO, Any, NamedTuple
+
+import pyarrow as pa
+
+from workspace.common.postgres_arrow import (
+    fetch_arrow_table,
+    iter_arrow_batches,
+    iter_dataframes,
+)
+
+
+class _Column(NamedTuple):
+    name: str
+    type_code: int
+    precision: int | None = None
+    scale: int | None = None
+
+
+class _StubConnection:
+    encoding = "UTF8"
+
+
+class _StubCursor:
+    def __init__(self, columns: list[_Column], copy_output: bytes) -> None:
+        self.connection = _StubConnection()
+        self.description: list[_Column] = []
+        self.executed_sqls: list[str] = []
+        self.copy_sqls: list[str] = []
+        self._columns = columns
+        self._copy_output = copy_output
+
+    def execute(self, sql: str, params: tuple = ()) -> None:
+        self.executed_sqls.append(sql)
+        self.description = self._columns
+
+    def mogrify(self, sql: str, params: tuple) -> bytes:
+        return (sql % tuple(repr(param) for param in params)).encode()
+
+    def copy_expert(self, sql: str, file: IO[bytes], size: int) -> None:
+        self.copy_sqls.append(sql)
+        file.write(self._copy_output)
+
+
+_COLUMNS = [
+    _Column("id", 23),
+    _Column("is_active", 16),
+    _Column("name", 25),
+    _Column("score", 701),
+    _Column("born_on", 1082),
+    _Column("updated_at", 1184),
+]
+_COPY_OUTPUT = (
+    b'1,t,"Alice",1.5,2000-01-02,2024-01-02 03:04:05+09\n'
+    b'2,f,"",,,\n'
+    b"3,,,2.5,1999-12-31,2024-01-02 00:00:00+00\n"
+)
+
+
+def test_fetch_arrow_table_builds_typed_columns() -> None:
+    # Arrange
+    cursor = _StubCursor(_COLUMNS, _COPY_OUTPUT)
+
+    # Act
+    table = fetch_arrow_table(
+        cursor, "SELECT * FROM users WHERE id > %s", (0,)
+    )
+
+    # Assert
+    assert cursor.executed_sqls == [
+        "SELECT * FROM (SELECT * FROM users WHERE id > %s) AS _described "
+        "LIMIT 0"
+    ]
+    assert cursor.copy_sqls == [
+        "COPY (SELECT * FROM users WHERE id > 0) TO STDOUT WITH (FORMAT csv)"
+    ]
+    assert table.schema.types == [
+        pa.int32(),
+        pa.bool_(),
+        pa.string(),
+        pa.float64(),
+        pa.date32(),
+        pa.timestamp("us", tz="UTC"),
+    ]
+    assert table.to_pydict() == {
+        "id": [1, 2, 3],
+        "is_active": [True, False, None],
+        "name": ["Alice", "", None],
+        "score": [1.5, None, 2.5],
+        "born_on": [date(2000, 1, 2), None, date(1999, 12, 31)],
+        "updated_at": [
+            datetime(2024, 1, 1, 18, 4, 5, tzinfo=UTC),
+            None,
+            datetime(2024, 1, 2, tzinfo=UTC),
+        ],
+    }
+
+
+def test_fetch_arrow_table_keeps_numeric_exact() -> None:
+    # Arrange
+    cursor = _StubCursor(
+        [
+            _Column("price", 1700, 12, 2),
+            _Column("balance", 1700, 50, 10),
+            _Column("ratio", 1700),
+        ],
+        b"1234567890.23,1234567890123456789012345678901.0123456789,"
+        b"0.1000000000000000000001\n,,\n",
+    )
+
+    # Act
+    table = fetch_arrow_table(cursor, "SELECT * FROM accounts")
+
+    # Assert
+    assert table.schema.types == [
+        pa.decimal128(12, 2),
+        pa.decimal256(50, 10),
+        pa.string(),
+    ]
+    assert table.to_pydict() == {
+        "price": [Decimal("1234567890.23"), None],
+        "balance": [
+            Decimal("1234567890123456789012345678901.0123456789"),
+            None,
+        ],
+        "ratio": ["0.1000000000000000000001", None],
+    }
+
+
+def test_fetch_arrow_table_returns_empty_table_with_schema() -> None:
+    # Arrange
+    cursor = _StubCursor(_COLUMNS, b"")
+
+    # Act
+    table = fetch_arrow_table(cursor, "SELECT * FROM users")
+
+    # Assert
+    assert table.num_rows == 0
+    assert table.schema.names == [column.name for column in _COLUMNS]
+
+
+def test_iter_arrow_batches_reads_in_blocks() -> None:
+    # Arrange
+    copy_output = b"".join(
+        f"{row_index},user-{row_index}\n".encode() for row_index in range(5000)
+    )
+    cursor = _StubCursor([_Column("id", 20), _Column("name", 25)], copy_output)
+
+    # Act
+    record_batches = list(
+        iter_arrow_batches(
+            cursor, "SELECT id, name FROM users", block_size_bytes=4096
+        )
+    )
+
+    # Assert
+    assert len(record_batches) > 1
+    assert sum(batch.num_rows for batch in record_batches) == 5000
+    assert record_batches[0].schema.field("id").type == pa.int64()
+
+
+def test_iter_dataframes_yields_pandas_chunks() -> None:
+    # Arrange
+    cursor = _StubCursor(_COLUMNS, _COPY_OUTPUT)
+
+    # Act
+    dataframes: list[Any] = list(iter_dataframes(cursor, "SELECT 1"))
+
+    # Assert
+    (dataframe,) = dataframes
+    assert dataframe["id"].tolist() == [1, 2, 3]
+    assert dataframe["name"].isna().tolist() == [False, False, True]
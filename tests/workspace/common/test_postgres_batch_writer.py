@@ -0,0 +1,191 @@
+import time
+from types import TracebackType
+from typing import Self
+
+import psycopg2
+import pytest
+
+from workspace.common.postgres_batch_writer import BatchingWriter, BatchUnit
+from workspace.common.postgres_result_cache import ResultCache
+
+
+class _SerializationFailureError(psycopg2.errors.SerializationFailure):
+    pgcode = "40001"
+
+
+class _UniqueViolationError(psycopg2.errors.UniqueViolation):
+    pgcode = "23505"
+
+
+class _StubCursor:
+    def __init__(self, connection: "_StubConnection") -> None:
+        self._connection = connection
+
+    def mogrify(self, sql: str, params: tuple) -> bytes:
+        return (sql % params).encode()
+
+    def execute(self, sql: bytes) -> None:
+        if self._connection.serialization_failure_count:
+            self._connection.serialization_failure_count -= 1
+            raise _SerializationFailureError("could not serialize access")
+        failing_sql_fragment = self._connection.failing_sql_fragment
+        if failing_sql_fragment and failing_sql_fragment in sql.decode():
+            raise _UniqueViolationError("duplicate key value")
+        self._connection.pending_sqls.append(sql.decode())
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception_value: BaseException | None,
+        exception_traceback: TracebackType | None,
+    ) -> None:
+        return None
+
+
+class _StubConnection:
+    def __init__(self) -> None:
+        self.serialization_failure_count = 0
+        self.failing_sql_fragment: str | None = None
+        self.pending_sqls: list[str] = []
+        self.committed_batches: list[list[str]] = []
+        self.rollback_count = 0
+        self.closed = 0
+
+    def cursor(self) -> _StubCursor:
+        return _StubCursor(self)
+
+    def commit(self) -> None:
+        self.committed_batches.append(self.pending_sqls)
+        self.pending_sqls = []
+
+    def rollback(self) -> None:
+        self.rollback_count += 1
+        self.pending_sqls = []
+
+    def close(self) -> None:
+        self.closed = 1
+
+
+def test_batching_writer_groups_units_into_one_transaction() -> None:
+    # Arrange
+    connection = _StubConnection()
+    writer = BatchingWriter(
+        lambda: connection, max_batch_rows=4, max_batch_delay_seconds=60.0
+    )
+
+    # Act
+    for user_id in range(3):
+        with writer.unit() as unit:
+            unit.execute("INSERT INTO users VALUES (%s)", (user_id,))
+    pending_before_full = writer.metrics().pending_row_count
+    with writer.unit() as unit:
+        unit.executemany("INSERT INTO users VALUES (%s)", [(3,), (4,)])
+    with pytest.raises(ValueError, match="boom"), writer.unit() as unit:
+        unit.execute("DELETE FROM users")
+        raise ValueError("boom")
+    writer.close()
+
+    # Assert
+    assert pending_before_full == 3
+    assert unit.future.cancelled()
+    assert connection.committed_batches == [
+        [
+            "INSERT INTO users VALUES (0);INSERT INTO users VALUES (1);"
+            "INSERT INTO users VALUES (2);INSERT INTO users VALUES (3);"
+            "INSERT INTO users VALUES (4)"
+        ]
+    ]
+    metrics = writer.metrics()
+    assert (metrics.batch_count, metrics.unit_count, metrics.row_count) == (
+        1,
+        4,
+        5,
+    )
+    assert connection.closed == 1
+
+
+def test_batching_writer_retries_serialization_failures() -> None:
+    # Arrange
+    connection = _StubConnection()
+    connection.serialization_failure_count = 2
+    result_cache = ResultCache()
+    result_cache.get_or_load("fetchall", "SELECT * FROM users", (), list)
+    writer = BatchingWriter(
+        lambda: connection,
+        max_retries=2,
+        retry_backoff_seconds=0.0,
+        max_batch_delay_seconds=60.0,
+        result_cache=result_cache,
+    )
+
+    # Act
+    with writer.unit() as unit:
+        unit.execute("UPDATE users SET age = 1")
+    (batch_commit,) = writer.flush()
+
+    # Assert
+    assert unit.future.result() == batch_commit
+    assert batch_commit.attempt_count == 3
+    assert connection.rollback_count == 2
+    assert connection.committed_batches == [["UPDATE users SET age = 1"]]
+    assert result_cache.stats().invalidation_count == 1
+    assert writer.metrics().retry_count == 2
+
+
+def test_batching_writer_isolates_failing_units() -> None:
+    # Arrange
+    connection = _StubConnection()
+    writer = BatchingWriter(
+        lambda: connection, max_retries=0, max_batch_delay_seconds=60.0
+    )
+    futures = []
+    for user_id in range(4):
+        batch_unit = BatchUnit()
+        batch_unit.execute(
+            "INSERT INTO users VALUES (%s)",
+            ("bad",) if user_id == 2 else (user_id,),
+        )
+        futures.append(writer.submit(batch_unit))
+    connection.failing_sql_fragment = "(bad)"
+
+    # Act
+    batch_commits = writer.flush()
+
+    # Assert
+    assert [batch_commit.unit_count for batch_commit in batch_commits] == [
+        2,
+        1,
+    ]
+    assert connection.committed_batches == [
+        ["INSERT INTO users VALUES (0);INSERT INTO users VALUES (1)"],
+        ["INSERT INTO users VALUES (3)"],
+    ]
+    assert futures[0].result() == futures[1].result() == batch_commits[0]
+    assert futures[3].result() == batch_commits[1]
+    with pytest.raises(psycopg2.errors.UniqueViolation):
+        futures[2].result()
+    metrics = writer.metrics()
+    assert (metrics.failed_batch_count, metrics.failed_unit_count) == (3, 1)
+    assert writer.submit(BatchUnit()).result() is None
+
+
+def test_batching_writer_flushes_on_time_budget() -> None:
+    # Arrange
+    connection = _StubConnection()
+    writer = BatchingWriter(lambda: connection, max_batch_delay_seconds=0.01)
+
+    # Act
+    with writer.unit() as unit:
+        unit.execute("DELETE FROM users WHERE id = %s", (1,))
+    deadline = time.monotonic() + 1.0
+    while not connection.committed_batches and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+    # Assert
+    assert connection.committed_batches == [["DELETE FROM users WHERE id = 1"]]
+    writer.close()
+    with pytest.raises(RuntimeError, match="closed"), writer.unit() as unit:
+        unit.execute("DELETE FROM users")
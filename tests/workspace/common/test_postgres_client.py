@@ -0,0 +1,146 @@
+from collections.abc import Iterator
+from types import TracebackType
+from typing import Any, Self
+
+import psycopg2
+import pytest
+from psycopg2.extras import NamedTupleCursor
+from pytest import MonkeyPatch
+
+from workspace.common.postgres_client import PostgresClient
+from workspace.common.postgres_settings import PostgresSettings
+
+
+class _StubServerSideCursor:
+    def __init__(
+        self, name: str | None, cursor_factory: Any, rows: list[tuple]
+    ) -> None:
+        self.name = name
+        self.cursor_factory = cursor_factory
+        self.itersize = 0
+        self.closed = False
+        self.executed_sql = ""
+        self.fetched_row_count = 0
+        self._rows = rows
+
+    def execute(self, sql: str, params: tuple = ()) -> None:
+        self.executed_sql = sql
+
+    def fetchmany(self, size: int) -> list[tuple]:
+        batch = self._rows[
+            self.fetched_row_count : self.fetched_row_count + size
+        ]
+        self.fetched_row_count += len(batch)
+        return batch
+
+    def __iter__(self) -> Iterator[tuple]:
+        while batch := self.fetchmany(self.itersize):
+            yield from batch
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception_value: BaseException | None,
+        exception_traceback: TracebackType | None,
+    ) -> None:
+        self.closed = True
+
+
+class _StubConnection:
+    def __init__(self, rows: list[tuple]) -> None:
+        self.cursors: list[_StubServerSideCursor] = []
+        self._rows = rows
+
+    def cursor(
+        self, name: str | None = None, cursor_factory: Any = None
+    ) -> _StubServerSideCursor:
+        cursor = _StubServerSideCursor(name, cursor_factory, self._rows)
+        self.cursors.append(cursor)
+        return cursor
+
+    def commit(self) -> None:
+        return None
+
+    def rollback(self) -> None:
+        return None
+
+    def close(self) -> None:
+        return None
+
+
+def _create_settings() -> PostgresSettings:
+    return PostgresSettings(
+        postgres_host="localhost",
+        postgres_port=5432,
+        postgres_db_name="sandbox",
+        postgres_user="sandbox",
+        postgres_password="sandbox",
+    )
+
+
+def _patch_connect(
+    monkeypatch: MonkeyPatch, row_count: int
+) -> _StubConnection:
+    connection = _StubConnection([(index,) for index in range(row_count)])
+    monkeypatch.setattr(psycopg2, "connect", lambda **_: connection)
+    return connection
+
+
+def test_stream_uses_named_cursor_and_yields_lazily(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    # Arrange
+    connection = _patch_connect(monkeypatch, row_count=10)
+
+    # Act
+    with PostgresClient(_create_settings()) as db:
+        rows = db.stream("SELECT id FROM big_table", itersize=3)
+        first_row = next(rows)
+        (cursor,) = connection.cursors
+        fetched_row_count_after_first_row = cursor.fetched_row_count
+        rows.close()
+
+    # Assert
+    assert first_row == (0,)
+    assert fetched_row_count_after_first_row == 3
+    assert cursor.name is not None
+    assert cursor.name.startswith("workspace_stream_")
+    assert cursor.cursor_factory is None
+    assert cursor.itersize == 3
+    assert cursor.closed
+
+
+def test_stream_batches_yields_fixed_size_batches(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    # Arrange
+    connection = _patch_connect(monkeypatch, row_count=7)
+
+    # Act
+    with PostgresClient(_create_settings()) as db:
+        batches = list(
+            db.stream_batches(
+                "SELECT id FROM big_table", batch_size=3, row_type="namedtuple"
+            )
+        )
+
+    # Assert
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    (cursor,) = connection.cursors
+    assert cursor.cursor_factory is NamedTupleCursor
+    assert cursor.closed
+
+
+def test_stream_rejects_invalid_usage(monkeypatch: MonkeyPatch) -> None:
+    # Arrange
+    _patch_connect(monkeypatch, row_count=1)
+    client = PostgresClient(_create_settings())
+
+    # Act / Assert
+    with pytest.raises(RuntimeError, match="not established"):
+        next(client.stream("SELECT 1"))
+    with client as db, pytest.raises(ValueError, match="itersize"):
+        next(db.stream("SELECT 1", itersize=0))
@@ -0,0 +1,239 @@
+import csv
+import json
+import struct
+from collections.abc import Iterator
+from datetime import date, datetime
+from io import BytesIO
+from typing import Any
+
+import pandas as pd
+import pytest
+
+from workspace.common.postgres_copy import bulk_load
+
+
+class _StubConnection:
+    encoding = "UTF8"
+
+
+class _StubCursor:
+    def __init__(self, column_type_rows: list[tuple[str, str]]) -> None:
+        self.connection = _StubConnection()
+        self.rowcount = -1
+        self.copy_sqls: list[str] = []
+        self.copy_chunks: list[bytes] = []
+        self.executed_sqls: list[Any] = []
+        self.executed_params: list[tuple] = []
+        self._column_type_rows = column_type_rows
+
+    def copy_expert(self, sql: str, file: Any, size: int) -> None:
+        self.copy_sqls.append(sql)
+        while chunk := file.read(size):
+            self.copy_chunks.append(chunk)
+        self.rowcount = self._count_copied_rows(sql)
+
+    def execute(self, sql: Any, params: tuple = ()) -> None:
+        self.executed_sqls.append(sql)
+        self.executed_params.append(params)
+
+    def fetchall(self) -> list[tuple[str, str]]:
+        return self._column_type_rows
+
+    def mogrify(self, template: bytes, args: tuple) -> bytes:
+        return template % tuple(repr(arg).encode() for arg in args)
+
+    def _count_copied_rows(self, sql: str) -> int:
+        copied_data = b"".join(self.copy_chunks)
+        if "FORMAT binary" in sql:
+            return len(_decode_binary_copy(copied_data))
+        return copied_data.count(b"\n")
+
+
+def _decode_binary_copy(copied_data: bytes) -> list[list[bytes | None]]:
+    assert copied_data.startswith(b"PGCOPY\n\xff\r\n\x00")
+    offset = 19
+    rows: list[list[bytes | None]] = []
+    while True:
+        (field_count,) = struct.unpack_from("!h", copied_data, offset)
+        offset += 2
+        if field_count == -1:
+            return rows
+        row: list[bytes | None] = []
+        for _ in range(field_count):
+            (field_length,) = struct.unpack_from("!i", copied_data, offset)
+            offset += 4
+            if field_length == -1:
+                row.append(None)
+                continue
+            row.append(copied_data[offset : offset + field_length])
+            offset += field_length
+        rows.append(row)
+
+
+def _generate_rows(row_count: int) -> Iterator[tuple[int, str | None]]:
+    for row_index in range(row_count):
+        yield row_index, None if row_index % 10 == 0 else f"user-{row_index}"
+
+
+def test_bulk_load_streams_csv_in_bounded_chunks() -> None:
+    # Arrange
+    cursor = _StubCursor([])
+
+    # Act
+    result = bulk_load(
+        cursor,
+        "public.users",
+        _generate_rows(1000),
+        columns=["id", "name"],
+        chunk_size_bytes=256,
+    )
+
+    # Assert
+    assert cursor.copy_sqls == [
+        'COPY "public"."users" ("id", "name") FROM STDIN WITH (FORMAT csv)'
+    ]
+    assert len(cursor.copy_chunks) > 1
+    assert max(len(chunk) for chunk in cursor.copy_chunks) < 256 + 32
+    copied_lines = b"".join(cursor.copy_chunks).decode().splitlines()
+    assert copied_lines[:2] == ['"0",', '"1","user-1"']
+    assert result.row_count == 1000
+    assert result.rows_per_second > 0.0
+
+
+def test_bulk_load_encodes_binary_copy_from_column_types() -> None:
+    # Arrange
+    cursor = _StubCursor(
+        [
+            ("id", "bigint"),
+            ("name", "text"),
+            ("created_at", "timestamp without time zone"),
+        ]
+    )
+    rows = [
+        (1, "Alice", datetime(2000, 1, 1, 0, 0, 1)),
+        (2, None, datetime(1999, 12, 31, 23, 59, 59)),
+    ]
+
+    # Act
+    result = bulk_load(cursor, "users", rows, copy_format="binary")
+
+    # Assert
+    assert cursor.copy_sqls == ['COPY "users" FROM STDIN WITH (FORMAT binary)']
+    assert _decode_binary_copy(b"".join(cursor.copy_chunks)) == [
+        [struct.pack("!q", 1), b"Alice", struct.pack("!q", 1_000_000)],
+        [struct.pack("!q", 2), None, struct.pack("!q", -1_000_000)],
+    ]
+    assert result.row_count == 2
+
+
+def test_bulk_load_binary_copy_quotes_table_and_accepts_datetimes() -> None:
+    # Arrange
+    cursor = _StubCursor([("Id", "integer"), ("ShippedOn", "date")])
+    rows = [
+        (1, date(2000, 1, 2)),
+        (2, datetime(2000, 1, 3, 12, 30)),
+        (3, pd.Timestamp("1999-12-31 23:00")),
+    ]
+
+    # Act
+    bulk_load(cursor, "Sales.OrderItems", rows, copy_format="binary")
+
+    # Assert
+    assert cursor.executed_params == [('"Sales"."OrderItems"',)]
+    assert cursor.copy_sqls == [
+        'COPY "Sales"."OrderItems" FROM STDIN WITH (FORMAT binary)'
+    ]
+    assert [
+        shipped_on
+        for _, shipped_on in _decode_binary_copy(b"".join(cursor.copy_chunks))
+    ] == [struct.pack("!i", 1), struct.pack("!i", 2), struct.pack("!i", -1)]
+
+
+def test_bulk_load_serializes_json_values_in_csv() -> None:
+    # Arrange
+    cursor = _StubCursor([])
+    payloads = [{"tags": ["a", "b"], "active": True}, [1, None]]
+
+    # Act
+    bulk_load(
+        cursor,
+        "events",
+        list(enumerate(payloads)),
+        columns=["id", "payload"],
+    )
+
+    # Assert
+    copied_lines = b"".join(cursor.copy_chunks).decode().splitlines()
+    assert [
+        json.loads(next(csv.reader([copied_line]))[1])
+        for copied_line in copied_lines
+    ] == payloads
+
+
+def test_bulk_load_rejects_unsupported_binary_column_types() -> None:
+    # Arrange
+    cursor = _StubCursor([("id", "integer"), ("price", "numeric")])
+
+    # Act / Assert
+    with pytest.raises(ValueError, match="numeric"):
+        bulk_load(cursor, "items", [(1, 9.99)], copy_format="binary")
+
+
+def test_bulk_load_converts_dataframe_missing_values_to_null() -> None:
+    # Arrange
+    cursor = _StubCursor([])
+    dataframe = pd.DataFrame(
+        {"id": [1, 2, 3], "score": [1.5, None, 3.0], "name": ["a", None, ""]}
+    )
+
+    # Act
+    result = bulk_load(cursor, "scores", dataframe)
+
+    # Assert
+    assert cursor.copy_sqls == [
+        'COPY "scores" ("id", "score", "name") FROM STDIN WITH (FORMAT csv)'
+    ]
+    assert b"".join(cursor.copy_chunks).decode().splitlines() == [
+        '"1","1.5","a"',
+        '"2",,',
+        '"3","3.0",""',
+    ]
+    assert result.row_count == 3
+
+
+def test_bulk_load_passes_file_objects_through() -> None:
+    # Arrange
+    cursor = _StubCursor([])
+    csv_file = BytesIO(b"1,a\n2,b\n")
+
+    # Act
+    result = bulk_load(cursor, "users", csv_file, columns=["id", "name"])
+
+    # Assert
+    assert b"".join(cursor.copy_chunks) == b"1,a\n2,b\n"
+    assert result.row_count == 2
+
+
+def test_bulk_load_falls_back_to_paged_values() -> None:
+    # Arrange
+    cursor = _StubCursor([])
+
+    # Act
+    result = bulk_load(
+        cursor,
+        "users",
+        _generate_rows(25),
+        columns=["id", "name"],
+        method="values",
+        page_size=10,
+    )
+
+    # Assert
+    assert len(cursor.executed_sqls) == 3
+    assert cursor.executed_sqls[0].startswith(
+        b'INSERT INTO "users" ("id", "name") VALUES (0,None),(1,'
+    )
+    assert cursor.copy_sqls == []
+    assert result.row_count == 25
+    with pytest.raises(ValueError, match="method='values'"):
+        bulk_load(cursor, "users", BytesIO(b""), method="values")
@@ -0,0 +1,195 @@
+import re
+from types import TracebackType
+from typing import IO, Any, NamedTuple, Self
+
+import pytest
+from psycopg2.extensions import (
+    TRANSACTION_STATUS_IDLE,
+    TRANSACTION_STATUS_INTRANS,
+)
+
+from workspace.common.postgres_parallel import (
+    ParallelQueryExecutor,
+    ctid_partitions,
+    hash_partitions,
+    key_range_partitions,
+)
+from workspace.common.postgres_pool import PostgresConnectionPool
+
+_USER_IDS = list(range(1, 10))
+_PREDICATE_PATTERN = re.compile(
+    r"\((?:id >= (\d+) AND id < (\d+)|id < (\d+) OR id IS NULL|id >= (\d+))\)"
+)
+
+
+class _Column(NamedTuple):
+    name: str
+    type_code: int
+
+
+class _StubCursor:
+    def __init__(self, connection: "_StubConnection") -> None:
+        self.connection = connection
+        self.description: list[_Column] = []
+
+    def execute(self, sql: str, params: tuple = ()) -> None:
+        self.connection.transaction_status = TRANSACTION_STATUS_INTRANS
+        self.description = [_Column("id", 20), _Column("name", 25)]
+
+    def mogrify(self, sql: str, params: tuple) -> bytes:
+        return (sql % params).encode()
+
+    def copy_expert(self, sql: str, file: IO[bytes], size: int) -> None:
+        self.connection.copy_sqls.append(sql)
+        match = _PREDICATE_PATTERN.search(sql)
+        assert match is not None
+        lower, upper, first_upper, last_lower = match.groups()
+        for user_id in _USER_IDS:
+            if (
+                (lower and int(lower) <= user_id < int(upper))
+                or (first_upper and user_id < int(first_upper))
+                or (last_lower and user_id >= int(last_lower))
+            ):
+                file.write(f"{user_id},user-{user_id}\n".encode())
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception_value: BaseException | None,
+        exception_traceback: TracebackType | None,
+    ) -> None:
+        return None
+
+
+class _StubConnection:
+    encoding = "UTF8"
+
+    def __init__(self, copy_sqls: list[str]) -> None:
+        self.closed = 0
+        self.transaction_status = TRANSACTION_STATUS_IDLE
+        self.copy_sqls = copy_sqls
+
+    def cursor(self, **_: Any) -> _StubCursor:
+        return _StubCursor(self)
+
+    def rollback(self) -> None:
+        self.transaction_status = TRANSACTION_STATUS_IDLE
+
+    def close(self) -> None:
+        self.closed = 1
+
+    def get_transaction_status(self) -> int:
+        return self.transaction_status
+
+
+def _create_pool(copy_sqls: list[str]) -> PostgresConnectionPool:
+    return PostgresConnectionPool(
+        lambda: _StubConnection(copy_sqls), min_size=0, max_size=3
+    )
+
+
+def test_key_range_ctid_and_hash_partitions_cover_the_table() -> None:
+    # Arrange / Act
+    key_ranges = key_range_partitions("id", 1, 9, 3)
+    ctid_ranges = ctid_partitions(page_count=100, partition_count=4)
+    hash_ranges = hash_partitions("id", 2)
+    (empty_table_range,) = ctid_partitions(page_count=0, partition_count=4)
+
+    # Assert
+    assert [(part.predicate, part.params) for part in key_ranges] == [
+        ("id < %s OR id IS NULL", (4,)),
+        ("id >= %s AND id < %s", (4, 7)),
+        ("id >= %s", (7,)),
+    ]
+    assert [part.params for part in ctid_ranges] == [
+        ("(25,0)",),
+        ("(25,0)", "(50,0)"),
+        ("(50,0)", "(75,0)"),
+        ("(75,0)",),
+    ]
+    assert [part.params for part in hash_ranges] == [(0,), (1,)]
+    assert empty_table_range.predicate == "TRUE"
+    with pytest.raises(ValueError, match="partition_count"):
+        hash_partitions("id", 0)
+
+
+def test_parallel_executor_merges_partitions_into_one_table() -> None:
+    # Arrange
+    copy_sqls: list[str] = []
+    pool = _create_pool(copy_sqls)
+    executor = ParallelQueryExecutor(pool, max_workers=3)
+
+    # Act
+    table = executor.fetch_arrow(
+        "SELECT id, name FROM users WHERE {partition}",
+        key_range_partitions("id", 1, 9, 3),
+    )
+
+    # Assert
+    assert sorted(table.column("id").to_pylist()) == _USER_IDS
+    assert len(copy_sqls) == 3
+    assert [
+        (timing.partition_index, timing.row_count)
+        for timing in executor.partition_timings
+    ] == [(0, 3), (1, 3), (2, 3)]
+    metrics = pool.metrics()
+    assert metrics.in_use_count == 0
+    assert metrics.idle_count == metrics.size
+    with pytest.raises(ValueError, match="placeholder"):
+        executor.fetch_dataframe(
+            "SELECT 1", key_range_partitions("id", 1, 9, 3)
+        )
+
+
+def test_parallel_executor_releases_connections_when_stopped_early() -> None:
+    # Arrange
+    pool = _create_pool([])
+    executor = ParallelQueryExecutor(
+        pool, max_workers=3, max_pending_batches=1, block_size_bytes=16
+    )
+    record_batches = executor.iter_arrow(
+        "SELECT id, name FROM users WHERE {partition}",
+        key_range_partitions("id", 1, 9, 3),
+    )
+
+    # Act
+    first_record_batch = next(record_batches)
+    record_batches.close()
+
+    # Assert
+    assert first_record_batch.num_rows >= 1
+    assert pool.metrics().in_use_count == 0
+
+
+def test_parallel_executor_cancels_pending_and_surfaces_errors() -> None:
+    # Arrange
+    copy_sqls: list[str] = []
+    executor = ParallelQueryExecutor(
+        _create_pool(copy_sqls),
+        max_workers=1,
+        max_pending_batches=1,
+        block_size_bytes=16,
+    )
+    sql = "SELECT id, name FROM users WHERE {partition}"
+
+    def refuse_connection() -> _StubConnection:
+        raise ConnectionError("connection refused")
+
+    failing_executor = ParallelQueryExecutor(
+        PostgresConnectionPool(refuse_connection, min_size=0, max_size=1)
+    )
+
+    # Act
+    record_batches = executor.iter_arrow(
+        sql, key_range_partitions("id", 1, 9, 3)
+    )
+    next(record_batches)
+    record_batches.close()
+
+    # Assert
+    assert len(copy_sqls) == 1
+    with pytest.raises(ConnectionError, match="connection refused"):
+        failing_executor.fetch_arrow(sql, key_range_partitions("id", 1, 9, 3))
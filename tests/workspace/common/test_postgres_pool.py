@@ -0,0 +1,238 @@
+from threading import Thread
+from time import sleep
+from types import TracebackType
+from typing import Any, Self
+
+import psycopg2
+import pytest
+from psycopg2.extensions import (
+    TRANSACTION_STATUS_IDLE,
+    TRANSACTION_STATUS_INTRANS,
+)
+
+from workspace.common.postgres_client import PostgresClient
+from workspace.common.postgres_pool import PostgresConnectionPool
+from workspace.common.postgres_settings import PostgresSettings
+
+
+class _StubCursor:
+    def __init__(self, connection: "_StubConnection") -> None:
+        self._connection = connection
+
+    def execute(self, sql: str, params: tuple = ()) -> None:
+        if self._connection.is_broken:
+            raise psycopg2.OperationalError("server closed the connection")
+        self._connection.executed_sqls.append(sql)
+        self._connection.transaction_status = TRANSACTION_STATUS_INTRANS
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception_value: BaseException | None,
+        exception_traceback: TracebackType | None,
+    ) -> None:
+        return None
+
+
+class _StubConnection:
+    def __init__(self) -> None:
+        self.closed = 0
+        self.is_broken = False
+        self.transaction_status = TRANSACTION_STATUS_IDLE
+        self.executed_sqls: list[str] = []
+        self.commit_count = 0
+        self.rollback_count = 0
+
+    def cursor(self, **_: Any) -> _StubCursor:
+        return _StubCursor(self)
+
+    def commit(self) -> None:
+        self.commit_count += 1
+        self.transaction_status = TRANSACTION_STATUS_IDLE
+
+    def rollback(self) -> None:
+        if self.is_broken:
+            raise psycopg2.InterfaceError("connection already closed")
+        self.rollback_count += 1
+        self.transaction_status = TRANSACTION_STATUS_IDLE
+
+    def close(self) -> None:
+        self.closed = 1
+
+    def get_transaction_status(self) -> int:
+        return self.transaction_status
+
+
+class _StubConnectionFactory:
+    def __init__(self) -> None:
+        self.connections: list[_StubConnection] = []
+
+    def __call__(self) -> _StubConnection:
+        connection = _StubConnection()
+        self.connections.append(connection)
+        return connection
+
+
+def _create_settings() -> PostgresSettings:
+    return PostgresSettings(
+        postgres_host="localhost",
+        postgres_port=5432,
+        postgres_db_name="sandbox",
+        postgres_user="sandbox",
+        postgres_password="sandbox",
+    )
+
+
+def test_pooled_client_reuses_connection() -> None:
+    # Arrange
+    connection_factory = _StubConnectionFactory()
+    pool = PostgresConnectionPool(connection_factory, min_size=1, max_size=2)
+
+    # Act
+    for _ in range(3):
+        with PostgresClient(_create_settings(), pool=pool) as db:
+            db.execute("UPDATE counters SET value = value + 1")
+
+    # Assert
+    (connection,) = connection_factory.connections
+    assert connection.commit_count == 3
+    assert connection.closed == 0
+    metrics = pool.metrics()
+    assert metrics.acquire_count == 3
+    assert metrics.created_count == 1
+    assert metrics.idle_count == 1
+    assert metrics.in_use_count == 0
+
+
+def test_pooled_client_rolls_back_and_returns_connection() -> None:
+    # Arrange
+    connection_factory = _StubConnectionFactory()
+    pool = PostgresConnectionPool(connection_factory, min_size=1)
+
+    # Act
+    with (
+        pytest.raises(ValueError, match="boom"),
+        PostgresClient(_create_settings(), pool=pool) as db,
+    ):
+        db.execute("DELETE FROM users")
+        raise ValueError("boom")
+
+    # Assert
+    (connection,) = connection_factory.connections
+    assert connection.rollback_count == 1
+    assert pool.metrics().idle_count == 1
+
+
+def test_pool_discards_connection_left_in_transaction() -> None:
+    # Arrange
+    connection_factory = _StubConnectionFactory()
+    pool = PostgresConnectionPool(connection_factory, min_size=0)
+    connection = pool.acquire()
+    connection.cursor().execute("SELECT 1")
+
+    # Act
+    pool.release(connection)
+
+    # Assert
+    assert connection.closed == 1
+    assert pool.metrics().size == 0
+
+
+def test_pool_times_out_when_exhausted() -> None:
+    # Arrange
+    pool = PostgresConnectionPool(
+        _StubConnectionFactory(),
+        min_size=0,
+        max_size=1,
+        acquire_timeout_seconds=0.05,
+    )
+    pool.acquire()
+
+    # Act / Assert
+    with pytest.raises(TimeoutError, match="pooled connection"):
+        pool.acquire()
+    assert pool.metrics().acquire_timeout_count == 1
+
+
+def test_pool_records_wait_until_connection_is_released() -> None:
+    # Arrange
+    pool = PostgresConnectionPool(
+        _StubConnectionFactory(), min_size=0, max_size=1
+    )
+    connection = pool.acquire()
+    acquired_connections: list[Any] = []
+    waiting_thread = Thread(
+        target=lambda: acquired_connections.append(pool.acquire())
+    )
+
+    # Act
+    waiting_thread.start()
+    sleep(0.05)
+    pool.release(connection)
+    waiting_thread.join(timeout=1.0)
+
+    # Assert
+    assert acquired_connections == [connection]
+    metrics = pool.metrics()
+    assert metrics.wait_count == 1
+    assert metrics.max_wait_seconds >= 0.04
+
+
+def test_pool_replaces_connection_failing_health_check() -> None:
+    # Arrange
+    connection_factory = _StubConnectionFactory()
+    pool = PostgresConnectionPool(
+        connection_factory, min_size=1, health_check_idle_seconds=0.0
+    )
+    connection_factory.connections[0].is_broken = True
+
+    # Act
+    connection = pool.acquire()
+
+    # Assert
+    assert connection is connection_factory.connections[1]
+    assert connection_factory.connections[0].closed == 1
+    metrics = pool.metrics()
+    assert metrics.health_check_failure_count == 1
+    assert metrics.closed_count == 1
+
+
+def test_pool_enforces_lifetime_and_idle_timeout() -> None:
+    # Arrange
+    connection_factory = _StubConnectionFactory()
+    expiring_pool = PostgresConnectionPool(
+        connection_factory, min_size=0, max_lifetime_seconds=0.0
+    )
+    idle_pool = PostgresConnectionPool(
+        connection_factory, min_size=0, idle_timeout_seconds=0.0
+    )
+
+    # Act
+    expiring_pool.release(expiring_pool.acquire())
+    idle_pool.release(idle_pool.acquire())
+
+    # Assert
+    assert [
+        connection.closed for connection in connection_factory.connections
+    ] == [1, 1]
+    assert expiring_pool.size == 0
+    assert idle_pool.size == 0
+
+
+def test_pool_rejects_invalid_usage() -> None:
+    # Arrange
+    pool = PostgresConnectionPool(_StubConnectionFactory(), min_size=0)
+
+    # Act / Assert
+    with pytest.raises(ValueError, match="min_size"):
+        PostgresConnectionPool(
+            _StubConnectionFactory(), min_size=2, max_size=1
+        )
+    with pytest.raises(ValueError, match="not acquired"):
+        pool.release(_StubConnection())
+    pool.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        pool.acquire()
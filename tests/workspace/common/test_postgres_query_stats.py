@@ -0,0 +1,218 @@
+import json
+import logging
+from types import TracebackType
+from typing import Any, Self
+
+import psycopg2
+import pytest
+from pytest import LogCaptureFixture, MonkeyPatch
+
+from workspace.common.postgres_client import PostgresClient
+from workspace.common.postgres_query_stats import (
+    QueryExecution,
+    QueryStatisticsRecorder,
+    fingerprint_sql,
+)
+from workspace.common.postgres_settings import PostgresSettings
+
+
+class _StubCursor:
+    def __init__(self) -> None:
+        self.executed_statements: list[tuple[str, Any]] = []
+        self.rowcount = -1
+        self.query: bytes | None = None
+        self.failing_sql_prefix: str | None = None
+
+    def execute(self, sql: str, params: Any = None) -> None:
+        self.executed_statements.append((sql, params))
+        if self.failing_sql_prefix and sql.startswith(self.failing_sql_prefix):
+            raise psycopg2.errors.QueryCanceled(sql)
+        self.query = sql.encode()
+        self.rowcount = 2 if sql.startswith("SELECT") else 1
+
+    def executemany(self, sql: str, param_list: list[tuple]) -> None:
+        self.executed_statements.append((sql, param_list))
+        self.query = sql.encode()
+        self.rowcount = len(param_list)
+
+    def fetchall(self) -> list[tuple[str]]:
+        return [("Seq Scan on users",), ("  Buffers: shared hit=1",)]
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception_value: BaseException | None,
+        exception_traceback: TracebackType | None,
+    ) -> None:
+        return None
+
+
+class _StubConnection:
+    def __init__(self) -> None:
+        self.stub_cursor = _StubCursor()
+        self.transaction_status = (
+            psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+        )
+
+    def cursor(self, **_: Any) -> _StubCursor:
+        return self.stub_cursor
+
+    def get_transaction_status(self) -> int:
+        return self.transaction_status
+
+    def commit(self) -> None:
+        return None
+
+    def rollback(self) -> None:
+        return None
+
+    def close(self) -> None:
+        return None
+
+
+def _create_settings() -> PostgresSettings:
+    return PostgresSettings(
+        postgres_host="localhost",
+        postgres_port=5432,
+        postgres_db_name="sandbox",
+        postgres_user="sandbox",
+        postgres_password="sandbox",
+    )
+
+
+def test_fingerprint_sql_normalizes_literals_and_value_lists() -> None:
+    # Arrange
+    sqls = [
+        "SELECT * FROM users WHERE id = 1 AND name = 'O''Brien' -- x",
+        "select *\n  from users where id = %s and name = %(name)s",
+        "SELECT * FROM users /* hint */ WHERE id = $1 AND name = $2",
+    ]
+
+    # Act
+    fingerprints = {fingerprint_sql(sql) for sql in sqls}
+
+    # Assert
+    assert fingerprints == {"select * from users where id = ? and name = ?"}
+    assert fingerprint_sql(
+        "INSERT INTO t VALUES (1, 'a'), (2, 'b'), (3, 'c')"
+    ) == fingerprint_sql("INSERT INTO t VALUES (%s, %s)")
+    assert fingerprint_sql(
+        "SELECT * FROM t WHERE id IN (1, 2, 3)"
+    ) == fingerprint_sql("SELECT * FROM t WHERE id IN (%s)")
+
+
+def test_recorder_aggregates_by_fingerprint() -> None:
+    # Arrange
+    recorder = QueryStatisticsRecorder()
+
+    # Act
+    for user_id, elapsed_seconds in [(1, 0.01), (2, 0.03)]:
+        recorder.record(
+            QueryExecution(
+                sql=f"SELECT * FROM users WHERE id = {user_id}",
+                status="success",
+                elapsed_seconds=elapsed_seconds,
+                row_count=1,
+                query_text_bytes=34,
+            )
+        )
+    recorder.record(
+        QueryExecution(
+            sql="DELETE FROM users",
+            status="error",
+            elapsed_seconds=0.001,
+            row_count=0,
+            query_text_bytes=17,
+        )
+    )
+
+    # Assert
+    select_summary, delete_summary = recorder.summarize()
+    assert select_summary["fingerprint"] == (
+        "select * from users where id = ?"
+    )
+    assert select_summary["count"] == 2
+    assert select_summary["elapsed_seconds_sum"] == pytest.approx(0.04)
+    assert select_summary["row_count_sum"] == 2
+    assert select_summary["query_text_bytes_sum"] == 68
+    assert delete_summary["error_count"] == 1
+    with pytest.raises(ValueError, match="slow_query_threshold_seconds"):
+        QueryStatisticsRecorder(slow_query_threshold_seconds=-1)
+
+
+def test_postgres_client_logs_slow_query_with_plan(
+    monkeypatch: MonkeyPatch, caplog: LogCaptureFixture
+) -> None:
+    # Arrange
+    connection = _StubConnection()
+    monkeypatch.setattr(psycopg2, "connect", lambda **_: connection)
+    recorder = QueryStatisticsRecorder(
+        slow_query_threshold_seconds=0.0, explain_slow_queries=True
+    )
+
+    # Act
+    with (
+        caplog.at_level(logging.WARNING),
+        PostgresClient(_create_settings(), query_recorder=recorder) as db,
+    ):
+        db.fetchall("SELECT * FROM users WHERE id = %s", (1,))
+        db.executemany("INSERT INTO users VALUES (%s)", [(1,), (2,)])
+
+    # Assert
+    select_log, insert_log = (
+        json.loads(record.getMessage()) for record in caplog.records
+    )
+    assert select_log["plan"] == "Seq Scan on users\n  Buffers: shared hit=1"
+    assert select_log["row_count"] == 2
+    assert "plan" not in insert_log
+    assert insert_log["row_count"] == 2
+    assert [sql for sql, _ in connection.stub_cursor.executed_statements] == [
+        "SELECT * FROM users WHERE id = %s",
+        "SAVEPOINT workspace_explain",
+        "EXPLAIN (ANALYZE, BUFFERS) SELECT * FROM users WHERE id = %s",
+        "ROLLBACK TO SAVEPOINT workspace_explain",
+        "INSERT INTO users VALUES (%s)",
+    ]
+    assert [summary["count"] for summary in recorder.summarize()] == [1, 1]
+
+
+def test_postgres_client_never_raises_from_explain(
+    monkeypatch: MonkeyPatch, caplog: LogCaptureFixture
+) -> None:
+    # Arrange
+    connection = _StubConnection()
+    connection.stub_cursor.failing_sql_prefix = "EXPLAIN"
+    monkeypatch.setattr(psycopg2, "connect", lambda **_: connection)
+    recorder = QueryStatisticsRecorder(
+        slow_query_threshold_seconds=0.0, explain_slow_queries=True
+    )
+
+    # Act
+    with (
+        caplog.at_level(logging.WARNING),
+        PostgresClient(_create_settings(), query_recorder=recorder) as db,
+    ):
+        rows = db.fetchall("SELECT * FROM users WHERE id = %s", (1,))
+        connection.transaction_status = (
+            psycopg2.extensions.TRANSACTION_STATUS_INERROR
+        )
+        db.fetchall("SELECT * FROM users WHERE id = %s", (2,))
+
+    # Assert
+    assert rows == [("Seq Scan on users",), ("  Buffers: shared hit=1",)]
+    failed_explain_record, first_log_record, second_log_record = caplog.records
+    assert failed_explain_record.exc_info is not None
+    first_log = json.loads(first_log_record.getMessage())
+    assert first_log["plan_error"].startswith("QueryCanceled: EXPLAIN")
+    assert "plan" not in first_log
+    assert "plan_error" not in json.loads(second_log_record.getMessage())
+    assert [sql for sql, _ in connection.stub_cursor.executed_statements] == [
+        "SELECT * FROM users WHERE id = %s",
+        "SAVEPOINT workspace_explain",
+        "EXPLAIN (ANALYZE, BUFFERS) SELECT * FROM users WHERE id = %s",
+        "ROLLBACK TO SAVEPOINT workspace_explain",
+        "SELECT * FROM users WHERE id = %s",
+    ]
@@ -0,0 +1,234 @@
+from functools import partial
+from pathlib import Path
+from types import SimpleNamespace, TracebackType
+from typing import Any, Self
+
+import psycopg2
+import pytest
+from pytest import MonkeyPatch
+
+from workspace.common import postgres_client, postgres_result_cache
+from workspace.common.postgres_client import PostgresClient
+from workspace.common.postgres_copy import BulkLoadResult
+from workspace.common.postgres_result_cache import (
+    ResultCache,
+    extract_table_tags,
+)
+from workspace.common.postgres_settings import PostgresSettings
+
+
+class _StubCursor:
+    def __init__(self, connection: "_StubConnection") -> None:
+        self.executed_sqls: list[str] = []
+        self._connection = connection
+
+    def execute(self, sql: str, params: Any = None) -> None:
+        self._connection.transaction_status = (
+            psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+        )
+        self.executed_sqls.append(sql)
+
+    def fetchone(self) -> dict[str, Any]:
+        return {"query_count": len(self.executed_sqls)}
+
+    def fetchall(self) -> list[dict[str, Any]]:
+        return [{"query_count": len(self.executed_sqls)}]
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception_value: BaseException | None,
+        exception_traceback: TracebackType | None,
+    ) -> None:
+        return None
+
+
+class _StubConnection:
+    def __init__(self) -> None:
+        self.stub_cursor = _StubCursor(self)
+        self.transaction_status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def cursor(self, **_: Any) -> _StubCursor:
+        return self.stub_cursor
+
+    def get_transaction_status(self) -> int:
+        return self.transaction_status
+
+    def commit(self) -> None:
+        self.transaction_status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def rollback(self) -> None:
+        self.transaction_status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self) -> None:
+        return None
+
+
+def _create_settings() -> PostgresSettings:
+    return PostgresSettings(
+        postgres_host="localhost",
+        postgres_port=5432,
+        postgres_db_name="sandbox",
+        postgres_user="sandbox",
+        postgres_password="sandbox",
+    )
+
+
+def test_extract_table_tags_normalizes_qualified_names() -> None:
+    # Arrange
+    sql = (
+        'SELECT * FROM public.Users u JOIN "Orders" o ON o.user_id = u.id '
+        "WHERE u.id = %s"
+    )
+
+    # Act
+    tags = extract_table_tags(sql)
+
+    # Assert
+    assert tags == {"users", "Orders"}
+
+
+def test_result_cache_evicts_least_recently_used_and_expires(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    # Arrange
+    result_cache = ResultCache(max_size=2, ttl_seconds=10.0)
+    now = [1000.0]
+    monkeypatch.setattr(
+        postgres_result_cache, "time", SimpleNamespace(time=lambda: now[0])
+    )
+    loaded_sqls: list[str] = []
+
+    def load(sql: str) -> Any:
+        loaded_sqls.append(sql)
+        return sql
+
+    # Act
+    for sql in ["SELECT 1", "SELECT 2", "SELECT 1", "SELECT 3"]:
+        result_cache.get_or_load("fetchall", sql, (), partial(load, sql))
+    result_cache.get_or_load("fetchall", "SELECT 2", (), lambda: "two")
+    now[0] += 10.0
+    result_cache.get_or_load("fetchall", "SELECT 3", (), lambda: "three")
+
+    # Assert
+    assert loaded_sqls == ["SELECT 1", "SELECT 2", "SELECT 3"]
+    stats = result_cache.stats()
+    assert (stats.hit_count, stats.miss_count) == (1, 5)
+    assert (stats.eviction_count, stats.expiration_count) == (2, 1)
+    assert stats.hit_rate == pytest.approx(1 / 6)
+    with pytest.raises(ValueError, match="ttl_seconds"):
+        ResultCache(ttl_seconds=0)
+
+
+def test_result_cache_hits_do_not_share_mutable_results() -> None:
+    # Arrange
+    result_cache = ResultCache()
+    loaded_rows = [{"id": 1}]
+    result_cache.get_or_load("fetchall", "SELECT 1", (), lambda: loaded_rows)
+
+    # Act
+    loaded_rows.append({"id": 2})
+    first_hit = result_cache.get_or_load("fetchall", "SELECT 1", (), list)
+    first_hit[0]["id"] = 3
+    second_hit = result_cache.get_or_load("fetchall", "SELECT 1", (), list)
+
+    # Assert
+    assert first_hit == [{"id": 3}]
+    assert second_hit == [{"id": 1}]
+
+
+def test_result_cache_shares_entries_through_backing_store(
+    tmp_path: Path,
+) -> None:
+    # Arrange
+    backing_path = tmp_path / "result_cache.sqlite3"
+    writer_cache = ResultCache(backing_path=backing_path)
+    reader_cache = ResultCache(backing_path=backing_path)
+    sql = "SELECT * FROM users WHERE name = %s"
+
+    # Act
+    writer_cache.get_or_load("fetchall", sql, ("Alice",), lambda: [1, 2])
+    shared_rows = reader_cache.get_or_load(
+        "fetchall", sql, ("Alice",), lambda: []
+    )
+    invalidated_count = writer_cache.invalidate(["public.users"])
+    reloaded_rows = reader_cache.get_or_load(
+        "fetchall", sql, ("Alice",), lambda: [3]
+    )
+
+    # Assert
+    assert shared_rows == [1, 2]
+    assert invalidated_count == 1
+    assert reloaded_rows == [3]
+    assert reader_cache.stats().size == 1
+    writer_cache.close()
+    reader_cache.close()
+
+
+def test_postgres_client_serves_repeated_reads_from_result_cache(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    # Arrange
+    connection = _StubConnection()
+    monkeypatch.setattr(psycopg2, "connect", lambda **_: connection)
+    result_cache = ResultCache()
+    sql = "SELECT * FROM temp_users WHERE name = %s"
+
+    # Act
+    with PostgresClient(_create_settings(), result_cache=result_cache) as db:
+        first_rows = [db.fetchall(sql, ("Alice",)) for _ in range(3)]
+        db.execute("UPDATE temp_users SET age = 11 WHERE name = 'Alice'")
+        updated_rows = db.fetchall(sql, ("Alice",))
+        db.fetchone(sql, ("Alice",))
+        db.invalidate_result_cache("temp_users")
+        stats = db.result_cache_stats()
+
+    # Assert
+    assert first_rows == [[{"query_count": 1}]] * 3
+    assert updated_rows == [{"query_count": 3}]
+    assert connection.stub_cursor.executed_sqls == [sql] + [
+        "UPDATE temp_users SET age = 11 WHERE name = 'Alice'",
+        sql,
+        sql,
+    ]
+    assert stats is not None
+    assert (stats.hit_count, stats.miss_count) == (2, 3)
+    assert (stats.invalidation_count, stats.size) == (1, 0)
+
+
+def test_postgres_client_does_not_cache_reads_after_uncommitted_writes(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    # Arrange
+    connection = _StubConnection()
+    monkeypatch.setattr(psycopg2, "connect", lambda **_: connection)
+    monkeypatch.setattr(
+        postgres_client,
+        "bulk_load",
+        lambda *_, **__: BulkLoadResult(row_count=1, elapsed_seconds=0.1),
+    )
+    result_cache = ResultCache()
+    client = PostgresClient(_create_settings(), result_cache=result_cache)
+    sql = "SELECT * FROM temp_users"
+
+    # Act
+    with client as db:
+        db.fetchall(sql)
+        db.fetchall(sql)
+        db.bulk_load("temp_users", [("Alice",)])
+        db.fetchall(sql)
+        size_after_write = result_cache.stats().size
+    with client as db:
+        db.fetchall(sql)
+        db.fetchall(sql)
+        stats = db.result_cache_stats()
+
+    # Assert
+    assert size_after_write == 0
+    assert connection.stub_cursor.executed_sqls == [sql, sql, sql]
+    assert stats is not None
+    assert (stats.hit_count, stats.miss_count) == (2, 3)
+    assert (stats.invalidation_count, stats.size) == (1, 1)
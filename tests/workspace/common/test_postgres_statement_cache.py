@@ -0,0 +1,221 @@
+from types import TracebackType
+from typing import Any, Self
+
+import psycopg2
+import pytest
+from pytest import MonkeyPatch
+
+from workspace.common.postgres_client import PostgresClient
+from workspace.common.postgres_settings import PostgresSettings
+from workspace.common.postgres_statement_cache import PreparedStatementCache
+
+
+class _CachedPlanChangedError(psycopg2.errors.FeatureNotSupported):
+    pgcode = "0A000"
+
+
+class _MissingStatementError(psycopg2.errors.InvalidSqlStatementName):
+    pgcode = "26000"
+
+
+class _TransactionAbortedError(psycopg2.errors.InFailedSqlTransaction):
+    pgcode = "25P02"
+
+
+class _StubCursor:
+    def __init__(self) -> None:
+        self.executed_statements: list[tuple[str, Any]] = []
+        self.failing_sql_prefix: str | None = None
+        self.failing_error_type: type[psycopg2.Error] = _CachedPlanChangedError
+
+    def execute(self, sql: str, params: Any = None) -> None:
+        self.executed_statements.append((sql, params))
+        if self.failing_sql_prefix and sql.startswith(self.failing_sql_prefix):
+            self.failing_sql_prefix = None
+            raise self.failing_error_type(sql)
+
+    def executemany(self, sql: str, param_list: list[tuple]) -> None:
+        for params in param_list:
+            self.execute(sql, params)
+
+    def fetchone(self) -> dict[str, Any]:
+        return {"id": 1}
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception_value: BaseException | None,
+        exception_traceback: TracebackType | None,
+    ) -> None:
+        return None
+
+
+class _StubConnection:
+    def __init__(self) -> None:
+        self.stub_cursor = _StubCursor()
+
+    def cursor(self, **_: Any) -> _StubCursor:
+        return self.stub_cursor
+
+    def commit(self) -> None:
+        return None
+
+    def rollback(self) -> None:
+        return None
+
+    def close(self) -> None:
+        return None
+
+
+def test_statement_cache_prepares_once_and_reuses() -> None:
+    # Arrange
+    cursor = _StubCursor()
+    statement_cache = PreparedStatementCache(max_size=2)
+    sql = "SELECT * FROM users WHERE id = %s AND name LIKE 'a%%'"
+
+    # Act
+    statement_cache.execute(cursor, sql, (1,))
+    statement_cache.execute(cursor, sql, (2,))
+
+    # Assert
+    assert cursor.executed_statements == [
+        (
+            "PREPARE workspace_stmt_0 AS "
+            "SELECT * FROM users WHERE id = $1 AND name LIKE 'a%'",
+            None,
+        ),
+        ("EXECUTE workspace_stmt_0 (%s)", (1,)),
+        ("EXECUTE workspace_stmt_0 (%s)", (2,)),
+    ]
+    stats = statement_cache.stats()
+    assert (stats.hit_count, stats.miss_count, stats.size) == (1, 1, 1)
+
+
+def test_statement_cache_evicts_least_recently_used() -> None:
+    # Arrange
+    cursor = _StubCursor()
+    statement_cache = PreparedStatementCache(max_size=2)
+
+    # Act
+    statement_cache.execute(cursor, "SELECT %s", (1,))
+    statement_cache.execute(cursor, "SELECT %s, %s", (1, 2))
+    statement_cache.execute(cursor, "SELECT %s", (1,))
+    statement_cache.execute(cursor, "SELECT %s, %s, %s", (1, 2, 3))
+
+    # Assert
+    executed_sqls = [sql for sql, _ in cursor.executed_statements]
+    assert executed_sqls[-3:] == [
+        "DEALLOCATE workspace_stmt_1",
+        "PREPARE workspace_stmt_2 AS SELECT $1, $2, $3",
+        "EXECUTE workspace_stmt_2 (%s, %s, %s)",
+    ]
+    stats = statement_cache.stats()
+    assert (stats.eviction_count, stats.size) == (1, 2)
+
+
+def test_statement_cache_invalidates_on_schema_change_error() -> None:
+    # Arrange
+    cursor = _StubCursor()
+    statement_cache = PreparedStatementCache()
+    statement_cache.execute(cursor, "SELECT * FROM users WHERE id = %s", (1,))
+    cursor.failing_sql_prefix = "EXECUTE"
+
+    # Act
+    with pytest.raises(psycopg2.errors.FeatureNotSupported):
+        statement_cache.execute(
+            cursor, "SELECT * FROM users WHERE id = %s", (2,)
+        )
+    statement_cache.execute(cursor, "SELECT * FROM users WHERE id = %s", (3,))
+
+    # Assert
+    executed_sqls = [sql for sql, _ in cursor.executed_statements]
+    assert executed_sqls[-3:] == [
+        "DEALLOCATE workspace_stmt_0",
+        "PREPARE workspace_stmt_1 AS SELECT * FROM users WHERE id = $1",
+        "EXECUTE workspace_stmt_1 (%s)",
+    ]
+    assert statement_cache.stats().invalidation_count == 1
+
+
+def test_statement_cache_forgets_statement_missing_on_server() -> None:
+    # Arrange
+    cursor = _StubCursor()
+    statement_cache = PreparedStatementCache()
+    statement_cache.execute(cursor, "SELECT %s", (1,))
+    cursor.failing_sql_prefix = "EXECUTE"
+    cursor.failing_error_type = _MissingStatementError
+
+    # Act
+    with pytest.raises(psycopg2.errors.InvalidSqlStatementName):
+        statement_cache.execute(cursor, "SELECT %s", (2,))
+    statement_cache.execute(cursor, "SELECT %s", (3,))
+    statement_cache.execute(cursor, "SELECT %s, %s", (4, 5))
+
+    # Assert
+    executed_sqls = [sql for sql, _ in cursor.executed_statements]
+    assert not any(sql.startswith("DEALLOCATE") for sql in executed_sqls)
+    assert executed_sqls[-4:] == [
+        "PREPARE workspace_stmt_1 AS SELECT $1",
+        "EXECUTE workspace_stmt_1 (%s)",
+        "PREPARE workspace_stmt_2 AS SELECT $1, $2",
+        "EXECUTE workspace_stmt_2 (%s, %s)",
+    ]
+    assert statement_cache.stats().invalidation_count == 1
+
+
+def test_statement_cache_resets_when_deallocation_fails() -> None:
+    # Arrange
+    cursor = _StubCursor()
+    statement_cache = PreparedStatementCache()
+    statement_cache.execute(cursor, "SELECT %s", (1,))
+    statement_cache.execute(cursor, "SELECT %s, %s", (1, 2))
+    statement_cache.invalidate("SELECT %s")
+    cursor.failing_sql_prefix = "DEALLOCATE"
+    cursor.failing_error_type = _TransactionAbortedError
+
+    # Act
+    with pytest.raises(psycopg2.errors.InFailedSqlTransaction):
+        statement_cache.execute(cursor, "SELECT %s", (2,))
+    statement_cache.execute(cursor, "SELECT %s, %s", (3, 4))
+
+    # Assert
+    executed_sqls = [sql for sql, _ in cursor.executed_statements]
+    assert executed_sqls[-4:] == [
+        "DEALLOCATE workspace_stmt_0",
+        "DEALLOCATE ALL",
+        "PREPARE workspace_stmt_2 AS SELECT $1, $2",
+        "EXECUTE workspace_stmt_2 (%s, %s)",
+    ]
+    assert statement_cache.stats().size == 1
+
+
+def test_postgres_client_uses_statement_cache_per_connection(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    # Arrange
+    connection = _StubConnection()
+    monkeypatch.setattr(psycopg2, "connect", lambda **_: connection)
+    settings = PostgresSettings(
+        postgres_host="localhost",
+        postgres_port=5432,
+        postgres_db_name="sandbox",
+        postgres_user="sandbox",
+        postgres_password="sandbox",
+    )
+
+    # Act
+    with PostgresClient(settings, prepared_statement_cache_size=8) as db:
+        for user_id in range(3):
+            db.fetchone("SELECT * FROM users WHERE id = %s", (user_id,))
+        db.execute("SELECT 1")
+        stats = db.prepared_statement_cache_stats()
+
+    # Assert
+    assert stats is not None
+    assert (stats.hit_count, stats.miss_count) == (2, 1)
+    assert connection.stub_cursor.executed_statements[-1] == ("SELECT 1", ())
+    with pytest.raises(ValueError, match="prepared_statement_cache_size"):
+        PostgresClient(settings, prepared_statement_cache_size=-1)
@@ -0,0 +1,181 @@
+from contextlib import AbstractContextManager
+from time import sleep
+
+import psutil
+import pytest
+from pytest import MonkeyPatch
+
+from workspace.common.measure_performance import (
+    CallMeasurement,
+    measure_performance,
+)
+from workspace.common.resource_sampler import (
+    ResourceSampler,
+    ResourceSpikeThresholds,
+)
+
+_BYTES_PER_MIB = 1024**2
+
+
+def _hold_memory(mib: int, seconds: float) -> None:
+    block = bytearray(mib * _BYTES_PER_MIB)
+    block[::4096] = b"\x01" * len(block[::4096])
+    sleep(seconds)
+    del block
+
+
+def test_resource_sampler_captures_transient_peak() -> None:
+    # Arrange
+    sampler = ResourceSampler(interval_seconds=0.01)
+
+    # Act
+    with sampler:
+        _hold_memory(64, 0.1)
+        sleep(0.05)
+    report = sampler.report()
+
+    # Assert
+    assert len(report.samples) >= 5
+    last_sample = report.samples[-1]
+    assert (
+        report.peak_resident_set_size_bytes
+        - last_sample.resident_set_size_bytes
+    ) >= 32 * _BYTES_PER_MIB
+    assert report.overhead_cpu_seconds >= 0.0
+    assert report.to_dict()["overhead"]["wall_seconds"] >= 0.0
+
+
+def test_resource_sampler_records_spikes() -> None:
+    # Arrange
+    sampler = ResourceSampler(
+        interval_seconds=0.01,
+        spike_thresholds=ResourceSpikeThresholds(
+            resident_set_size_increase_mib=16.0,
+            cpu_percent_per_core=1000.0,
+            io_mib_per_second=1e9,
+        ),
+    )
+
+    # Act
+    with sampler:
+        sleep(0.03)
+        _hold_memory(64, 0.05)
+
+    # Assert
+    spikes = sampler.report().spikes
+    assert spikes
+    assert {spike.kind for spike in spikes} == {
+        "resident_set_size_increase_mib"
+    }
+
+
+def test_resource_sampler_bounds_samples() -> None:
+    # Arrange
+    sampler = ResourceSampler(interval_seconds=0.001, max_samples=8)
+
+    # Act
+    with sampler:
+        sleep(0.1)
+
+    # Assert
+    report = sampler.report()
+    assert 1 <= len(report.samples) < 8
+    assert report.samples == sorted(
+        report.samples, key=lambda sample: sample.elapsed_seconds
+    )
+
+
+def test_resource_sampler_records_start_and_final_samples() -> None:
+    # Arrange
+    sampler = ResourceSampler(interval_seconds=10.0)
+
+    # Act
+    with sampler:
+        _hold_memory(32, 0.01)
+        retained_block = bytearray(32 * _BYTES_PER_MIB)
+        retained_block[::4096] = b"\x01" * len(retained_block[::4096])
+
+    # Assert
+    report = sampler.report()
+    first_sample, final_sample = report.samples
+    assert first_sample.elapsed_seconds <= final_sample.elapsed_seconds
+    assert first_sample.cpu_percent == 0.0
+    assert (
+        final_sample.resident_set_size_bytes
+        - first_sample.resident_set_size_bytes
+    ) >= 16 * _BYTES_PER_MIB
+    assert final_sample.elapsed_seconds <= report.sampled_wall_seconds
+    del retained_block
+
+
+def test_resource_sampler_rejects_invalid_usage() -> None:
+    # Arrange
+    sampler = ResourceSampler(interval_seconds=0.01)
+
+    # Act / Assert
+    with pytest.raises(ValueError, match="interval_seconds"):
+        ResourceSampler(interval_seconds=0.0)
+    with pytest.raises(RuntimeError, match="has not been started"):
+        sampler.stop()
+    sampler.start()
+    with pytest.raises(RuntimeError, match="has already been started"):
+        sampler.start()
+    sampler.stop()
+
+
+def test_measure_performance_reports_resource_sampling() -> None:
+    # Arrange
+    measurements: list[CallMeasurement] = []
+
+    @measure_performance(
+        enable_tracemalloc=False,
+        measurement_handler=measurements.append,
+        resource_sampling_interval_seconds=0.01,
+    )
+    def hold_memory() -> None:
+        _hold_memory(32, 0.05)
+
+    # Act
+    hold_memory()
+
+    # Assert
+    (measurement,) = measurements
+    assert measurement.resource_sampling is not None
+    assert measurement.resource_sampling.samples
+    assert measurement.resource_sampling.peak_resident_set_size_bytes > 0
+
+
+def test_measure_performance_survives_resource_sampling_failures(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    # Arrange
+    measurements: list[CallMeasurement] = []
+
+    def raise_no_such_process(
+        _: psutil.Process,
+    ) -> AbstractContextManager[None]:
+        raise psutil.NoSuchProcess(pid=0)
+
+    @measure_performance(
+        enable_tracemalloc=False,
+        measurement_handler=measurements.append,
+        resource_sampling_interval_seconds=0.01,
+    )
+    def compute() -> int:
+        sleep(0.03)
+        return 42
+
+    monkeypatch.setattr(psutil.Process, "oneshot", raise_no_such_process)
+
+    # Act
+    result = compute()
+
+    # Assert
+    (measurement,) = measurements
+    assert result == 42
+    assert measurement.resource_sampling is not None
+    assert measurement.resource_sampling.samples == []
+    assert measurement.resource_sampling.failed_sample_count >= 2
+    assert measurement.resource_sampling.to_dict()["failed_sample_count"] == (
+        measurement.resource_sampling.failed_sample_count
+    )
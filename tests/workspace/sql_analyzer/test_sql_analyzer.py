@@ -0,0 +1,109 @@
+from contextlib import redirect_stdout
+from io import StringIO
+
+import pytest
+from sqlglot import exp, parse_one
+
+from workspace.sql_analyzer.sql_analysis import (
+    DEFAULT_EXTRACTORS,
+    JOIN_EXTRACTOR,
+    NodeExtractor,
+    SinglePassAnalyzer,
+    analyze_case,
+    analyze_cte,
+    analyze_join,
+)
+from workspace.sql_analyzer.sql_analyzer import SQLAnalyzer
+
+_SQL = """
+WITH filtered_orders AS (
+    SELECT
+        o.user_id AS id,
+        o.amount,
+        CASE WHEN u.status = 'vip' THEN 'vip' ELSE 'other' END AS flag
+    FROM orders o
+    JOIN users u ON u.id = o.user_id
+    WHERE o.amount > 100
+),
+tmp AS (
+    SELECT id, amount FROM filtered_orders WHERE id IN (
+        SELECT user_id FROM vip_users v JOIN regions r ON r.id = v.region_id
+    )
+)
+SELECT id, SUM(amount) AS total_amount FROM tmp GROUP BY id
+"""
+
+
+def test_single_pass_analyzer_matches_per_type_walks() -> None:
+    # Arrange
+    syntax_tree = parse_one(_SQL)
+
+    # Act
+    statement_analysis = SinglePassAnalyzer().analyze(syntax_tree)
+
+    # Assert
+    assert statement_analysis.ctes == [
+        analyze_cte(cte) for cte in syntax_tree.find_all(exp.CTE)
+    ]
+    assert statement_analysis.joins == [
+        analyze_join(join) for join in syntax_tree.find_all(exp.Join)
+    ]
+    assert statement_analysis.wheres == [
+        where.this.sql() for where in syntax_tree.find_all(exp.Where)
+    ]
+    assert statement_analysis.cases == [
+        analyze_case(case) for case in syntax_tree.find_all(exp.Case)
+    ]
+    assert statement_analysis.extras == {}
+
+
+def test_single_pass_analyzer_runs_user_supplied_extractors() -> None:
+    # Arrange
+    table_extractor = NodeExtractor(
+        "tables", (exp.Table,), lambda table: table.name
+    )
+    aggregate_extractor = NodeExtractor(
+        "aggregates", (exp.AggFunc,), lambda aggregate: aggregate.sql()
+    )
+    single_pass_analyzer = SinglePassAnalyzer(
+        [JOIN_EXTRACTOR, table_extractor, aggregate_extractor]
+    )
+
+    # Act
+    statement_analysis = single_pass_analyzer.analyze(parse_one(_SQL))
+
+    # Assert
+    assert len(statement_analysis.joins) == 2
+    assert statement_analysis.ctes == []
+    assert sorted(statement_analysis.extras["tables"]) == [
+        "filtered_orders",
+        "orders",
+        "regions",
+        "tmp",
+        "users",
+        "vip_users",
+    ]
+    assert statement_analysis.extras["aggregates"] == ["SUM(amount)"]
+    with pytest.raises(ValueError, match="unique"):
+        SinglePassAnalyzer([*DEFAULT_EXTRACTORS, JOIN_EXTRACTOR])
+
+
+def test_sql_analyzer_prints_from_single_analysis() -> None:
+    # Arrange
+    analyzer = SQLAnalyzer(_SQL)
+    output = StringIO()
+
+    # Act
+    with redirect_stdout(output):
+        analyzer.analyze_ctes()
+        analyzer.analyze_joins()
+        analyzer.analyze_wheres()
+        analyzer.analyze_case_when()
+
+    # Assert
+    assert analyzer.analyze() is analyzer.analyze()
+    printed_lines = output.getvalue().splitlines()
+    assert "## CTE 2: `tmp`" in printed_lines
+    assert "- JOIN 2: `r.id = v.region_id`" in printed_lines
+    assert "- WHERE 1: `o.amount > 100`" in printed_lines
+    assert "- ELSE: `'other'`" in printed_lines
@@ -0,0 +1,203 @@
+import json
+from pathlib import Path
+
+import pyarrow.parquet as pq
+import pytest
+from pytest import MonkeyPatch
+from sqlglot import exp
+
+from workspace.sql_analyzer import sql_batch_analyzer
+from workspace.sql_analyzer.sql_analysis import (
+    DEFAULT_EXTRACTORS,
+    CaseBranch,
+    JoinAnalysis,
+    NodeExtractor,
+    StatementAnalysis,
+)
+from workspace.sql_analyzer.sql_batch_analyzer import (
+    SQLBatchAnalyzer,
+    analyze_sql_file,
+    iter_sql_paths,
+)
+
+_ORDERS_SQL = """
+WITH filtered_orders AS (
+    SELECT
+        o.user_id AS id,
+        CASE WHEN o.amount > 100 THEN 'high' ELSE 'low' END AS flag
+    FROM orders o
+    JOIN users u ON u.id = o.user_id
+    WHERE u.status = 'active'
+)
+SELECT id FROM filtered_orders;
+DELETE FROM orders WHERE amount < 0;
+"""
+
+
+def _extract_table_name(table: exp.Table) -> str:
+    return table.name
+
+
+_TABLE_EXTRACTOR = NodeExtractor("tables", (exp.Table,), _extract_table_name)
+
+
+def _write_sql_files(directory: Path) -> None:
+    (directory / "marts").mkdir()
+    (directory / "orders.sql").write_text(_ORDERS_SQL, encoding="utf-8")
+    (directory / "marts" / "users.sql").write_text(
+        "SELECT * FROM users", encoding="utf-8"
+    )
+    (directory / "broken.sql").write_text("SELECT (", encoding="utf-8")
+    (directory / "notes.txt").write_text("SELECT 1", encoding="utf-8")
+
+
+def test_analyze_sql_file_returns_structured_statements(
+    tmp_path: Path,
+) -> None:
+    # Arrange
+    _write_sql_files(tmp_path)
+
+    # Act
+    file_analysis = analyze_sql_file(tmp_path / "orders.sql")
+    broken_analysis = analyze_sql_file(tmp_path / "broken.sql")
+
+    # Assert
+    select_statement, delete_statement = file_analysis.statements
+    assert [cte.name for cte in select_statement.ctes] == ["filtered_orders"]
+    assert select_statement.joins == [
+        JoinAnalysis(
+            kind="INNER", table="users AS u", condition="u.id = o.user_id"
+        )
+    ]
+    assert select_statement.wheres == ["u.status = 'active'"]
+    (case_analysis,) = select_statement.cases
+    assert case_analysis.branches == [
+        CaseBranch(condition="o.amount > 100", value="'high'")
+    ]
+    assert case_analysis.default == "'low'"
+    assert (
+        delete_statement.statement_index,
+        delete_statement.statement_type,
+    ) == (
+        1,
+        "delete",
+    )
+    assert broken_analysis.error is not None
+    assert broken_analysis.statements == []
+
+
+def test_analyze_sql_file_records_unexpected_errors_per_file(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    # Arrange
+    _write_sql_files(tmp_path)
+
+    def exceed_recursion_limit(*_: object) -> StatementAnalysis:
+        raise RecursionError("maximum recursion depth exceeded")
+
+    monkeypatch.setattr(
+        sql_batch_analyzer.SinglePassAnalyzer,
+        "analyze",
+        exceed_recursion_limit,
+    )
+
+    # Act
+    file_analysis = analyze_sql_file(tmp_path / "orders.sql")
+
+    # Assert
+    assert file_analysis.error == (
+        "RecursionError: maximum recursion depth exceeded"
+    )
+    assert file_analysis.statements == []
+
+
+def test_iter_sql_paths_accepts_directories_and_globs(tmp_path: Path) -> None:
+    # Arrange
+    _write_sql_files(tmp_path)
+
+    # Act
+    directory_paths = list(iter_sql_paths(tmp_path))
+    glob_paths = list(iter_sql_paths(str(tmp_path / "marts" / "*.sql")))
+
+    # Assert
+    assert [path.name for path in directory_paths] == [
+        "broken.sql",
+        "users.sql",
+        "orders.sql",
+    ]
+    assert glob_paths == [tmp_path / "marts" / "users.sql"]
+
+
+def test_batch_analyzer_writes_jsonl_and_parquet(tmp_path: Path) -> None:
+    # Arrange
+    source_directory = tmp_path / "sql"
+    source_directory.mkdir()
+    _write_sql_files(source_directory)
+    batch_analyzer = SQLBatchAnalyzer(max_workers=2, files_per_task=1)
+
+    # Act
+    jsonl_stats = batch_analyzer.write_jsonl(
+        source_directory, tmp_path / "analysis.jsonl"
+    )
+    parquet_stats = batch_analyzer.write_parquet(
+        source_directory, tmp_path / "analysis.parquet"
+    )
+
+    # Assert
+    json_lines = (
+        (tmp_path / "analysis.jsonl").read_text(encoding="utf-8").splitlines()
+    )
+    records = [json.loads(json_line) for json_line in json_lines]
+    assert [Path(record["path"]).name for record in records] == [
+        "broken.sql",
+        "users.sql",
+        "orders.sql",
+    ]
+    assert records[2]["statements"][0]["ctes"][0]["name"] == "filtered_orders"
+    assert (jsonl_stats.file_count, jsonl_stats.statement_count) == (3, 3)
+    assert jsonl_stats.error_count == 1
+    assert jsonl_stats.files_per_second > 0
+    table = pq.read_table(tmp_path / "analysis.parquet")
+    assert table.num_rows == parquet_stats.file_count == 3
+    parquet_statements = table.column("statements").to_pylist()
+    assert parquet_statements[1][0]["statement_type"] == "select"
+    assert json.loads(parquet_statements[1][0]["extras_json"]) == {}
+    with pytest.raises(ValueError, match="files_per_task"):
+        SQLBatchAnalyzer(files_per_task=0)
+
+
+def test_batch_analyzer_runs_custom_extractors_through_parquet(
+    tmp_path: Path,
+) -> None:
+    # Arrange
+    source_directory = tmp_path / "sql"
+    source_directory.mkdir()
+    _write_sql_files(source_directory)
+    batch_analyzer = SQLBatchAnalyzer(
+        max_workers=1,
+        parse_cache_path=tmp_path / "parse_cache.sqlite3",
+        extractors=[*DEFAULT_EXTRACTORS, _TABLE_EXTRACTOR],
+    )
+
+    # Act
+    batch_analyzer.write_parquet(
+        source_directory, tmp_path / "analysis.parquet"
+    )
+    default_analysis = analyze_sql_file(source_directory / "orders.sql")
+
+    # Assert
+    parquet_statements = (
+        pq.read_table(tmp_path / "analysis.parquet")
+        .column("statements")
+        .to_pylist()
+    )
+    assert [
+        json.loads(statement["extras_json"])
+        for statement in parquet_statements[2]
+    ] == [
+        {"tables": ["filtered_orders", "orders", "users"]},
+        {"tables": ["orders"]},
+    ]
+    assert default_analysis.statements[0].extras == {}
+    with pytest.raises(ValueError, match="unique"):
+        SQLBatchAnalyzer(extractors=[_TABLE_EXTRACTOR, _TABLE_EXTRACTOR])
@@ -0,0 +1,153 @@
+from contextlib import redirect_stdout
+from io import StringIO
+
+from sqlglot import parse_one
+
+from workspace.sql_analyzer.sql_analyzer import SQLAnalyzer
+from workspace.sql_analyzer.sql_lineage import (
+    RESULT_RELATION,
+    UNKNOWN_RELATION,
+    ColumnReference,
+    extract_column_lineage,
+)
+
+_CTAS_SQL = """
+CREATE TABLE final_result AS
+WITH filtered_orders AS (
+    SELECT
+        o.user_id AS id,
+        o.amount,
+        CASE WHEN u.status = 'vip' THEN 'vip' ELSE 'other' END AS flag
+    FROM orders o
+    JOIN users u ON u.id = o.user_id
+),
+tmp AS (
+    SELECT id, amount FROM filtered_orders
+)
+SELECT id, SUM(amount) AS total_amount FROM tmp GROUP BY id
+"""
+
+
+def _qualified_names(
+    columns: frozenset[ColumnReference] | list[ColumnReference],
+) -> list[str]:
+    return [column.qualified_name for column in sorted(columns)]
+
+
+def test_column_lineage_resolves_aliases_through_ctes() -> None:
+    # Arrange
+    syntax_tree = parse_one(_CTAS_SQL)
+
+    # Act
+    column_lineage = extract_column_lineage(syntax_tree)
+
+    # Assert
+    assert column_lineage.target == "final_result"
+    assert _qualified_names(column_lineage.output_columns) == [
+        "final_result.id",
+        "final_result.total_amount",
+    ]
+    total_amount = ColumnReference("final_result", "total_amount")
+    assert _qualified_names(column_lineage.dependencies[total_amount]) == [
+        "tmp.amount"
+    ]
+    assert {
+        column.qualified_name: _qualified_names(source_columns)
+        for column, source_columns in (
+            column_lineage.resolved_dependencies().items()
+        )
+    } == {
+        "final_result.id": ["orders.user_id"],
+        "final_result.total_amount": ["orders.amount"],
+    }
+    flag = ColumnReference("filtered_orders", "flag")
+    assert _qualified_names(column_lineage.source_columns(flag)) == [
+        "users.status"
+    ]
+
+
+def test_column_lineage_follows_subqueries_and_set_operations() -> None:
+    # Arrange
+    select_sql = """
+    SELECT
+        a,
+        b.c,
+        (SELECT MAX(x) FROM z WHERE z.k = t.k) AS m
+    FROM t
+    JOIN (SELECT k, c FROM u) AS b ON b.k = t.k
+    """
+    insert_sql = (
+        "INSERT INTO db.t (p, q) "
+        "SELECT a, b FROM x UNION ALL SELECT c, d FROM y"
+    )
+
+    # Act
+    select_lineage = extract_column_lineage(parse_one(select_sql))
+    insert_lineage = extract_column_lineage(parse_one(insert_sql), 1)
+    delete_lineage = extract_column_lineage(parse_one("DELETE FROM x"))
+
+    # Assert
+    assert {
+        column.column: _qualified_names(source_columns)
+        for column, source_columns in (
+            select_lineage.resolved_dependencies().items()
+        )
+    } == {
+        "a": [f"{UNKNOWN_RELATION}.a"],
+        "c": ["u.c"],
+        "m": ["z.x"],
+    }
+    assert select_lineage.output_columns[0].relation == RESULT_RELATION
+    assert {
+        column.qualified_name: _qualified_names(source_columns)
+        for column, source_columns in (
+            insert_lineage.resolved_dependencies().items()
+        )
+    } == {"db.t.p": ["x.a", "y.c"], "db.t.q": ["x.b", "y.d"]}
+    assert delete_lineage.output_columns == []
+
+
+def test_sql_analyzer_prints_column_lineage() -> None:
+    # Arrange
+    analyzer = SQLAnalyzer(_CTAS_SQL)
+    output = StringIO()
+
+    # Act
+    with redirect_stdout(output):
+        analyzer.analyze_lineage()
+
+    # Assert
+    assert analyzer.column_lineage() is analyzer.column_lineage()
+    assert output.getvalue().splitlines() == [
+        "# [Column Lineage]",
+        "- `final_result.id` <- `orders.user_id`",
+        "- `final_result.total_amount` <- `orders.amount`",
+        "",
+    ]
+
+
+def test_column_lineage_ignores_unselected_ctes_for_unqualified_columns() -> (
+    None
+):
+    # Arrange
+    sql = """
+    WITH a AS (SELECT id FROM t),
+    b AS (
+        SELECT v, (SELECT MAX(k) FROM z) AS m FROM w
+    )
+    SELECT b.v, m FROM b
+    """
+
+    # Act
+    column_lineage = extract_column_lineage(parse_one(sql))
+
+    # Assert
+    assert {
+        column.qualified_name: _qualified_names(source_columns)
+        for column, source_columns in (
+            column_lineage.resolved_dependencies().items()
+        )
+    } == {
+        f"{RESULT_RELATION}.v": ["w.v"],
+        f"{RESULT_RELATION}.m": ["z.k"],
+    }
@@ -0,0 +1,146 @@
+import os
+from pathlib import Path
+
+from pytest import MonkeyPatch
+
+from workspace.sql_analyzer import sql_lineage_index
+from workspace.sql_analyzer.sql_lineage import ColumnReference
+from workspace.sql_analyzer.sql_lineage_index import (
+    ColumnLineageIndex,
+    extract_file_lineage,
+)
+from workspace.sql_analyzer.sql_parse_cache import ParseCache
+
+_STAGING_SQL = """
+CREATE TABLE staging_orders AS
+SELECT o.user_id, o.amount FROM raw_orders o;
+"""
+_MART_SQL = """
+INSERT INTO user_totals (user_id, total_amount)
+SELECT user_id, SUM(amount) FROM staging_orders GROUP BY user_id;
+"""
+
+
+def _write_sql_files(directory: Path) -> None:
+    (directory / "staging.sql").write_text(_STAGING_SQL, encoding="utf-8")
+    (directory / "mart.sql").write_text(_MART_SQL, encoding="utf-8")
+
+
+def test_lineage_index_resolves_columns_across_files(tmp_path: Path) -> None:
+    # Arrange
+    _write_sql_files(tmp_path)
+    lineage_index = ColumnLineageIndex(max_workers=1)
+
+    # Act
+    refresh_stats = lineage_index.refresh(tmp_path)
+
+    # Assert
+    assert (refresh_stats.added_count, refresh_stats.error_count) == (2, 0)
+    assert lineage_index.upstream_columns("user_totals", "total_amount") == {
+        ColumnReference("staging_orders", "amount"),
+        ColumnReference("raw_orders", "amount"),
+    }
+    assert lineage_index.downstream_columns("raw_orders", "user_id") == {
+        ColumnReference("staging_orders", "user_id"),
+        ColumnReference("user_totals", "user_id"),
+    }
+    assert lineage_index.upstream_columns("raw_orders", "amount") == set()
+
+
+def test_lineage_index_only_reanalyzes_changed_files(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    # Arrange
+    _write_sql_files(tmp_path)
+    (tmp_path / "unused.sql").write_text("SELECT 1", encoding="utf-8")
+    lineage_index = ColumnLineageIndex(max_workers=1)
+    lineage_index.refresh(tmp_path)
+    extracted_paths: list[str] = []
+    original_extract_file_lineage = extract_file_lineage
+
+    def _record_extract_file_lineage(
+        path: Path, read: str | None, parse_cache: ParseCache | None
+    ) -> sql_lineage_index.FileLineage:
+        extracted_paths.append(path.name)
+        return original_extract_file_lineage(path, read, parse_cache)
+
+    monkeypatch.setattr(
+        sql_lineage_index,
+        "extract_file_lineage",
+        _record_extract_file_lineage,
+    )
+    staging_path = tmp_path / "staging.sql"
+    staging_path.write_text(
+        _STAGING_SQL.replace("o.amount", "o.net_amount AS amount"),
+        encoding="utf-8",
+    )
+    os.utime(staging_path, ns=(0, 1))
+    (tmp_path / "unused.sql").unlink()
+
+    # Act
+    refresh_stats = lineage_index.refresh(tmp_path)
+
+    # Assert
+    assert extracted_paths == ["staging.sql"]
+    assert (
+        refresh_stats.added_count,
+        refresh_stats.updated_count,
+        refresh_stats.removed_count,
+        refresh_stats.unchanged_count,
+    ) == (0, 1, 1, 1)
+    assert ColumnReference(
+        "raw_orders", "net_amount"
+    ) in lineage_index.upstream_columns("user_totals", "total_amount")
+    assert lineage_index.file_lineage(tmp_path / "unused.sql") is None
+
+
+def test_extract_file_lineage_reuses_parse_cache(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    # Arrange
+    _write_sql_files(tmp_path)
+    (tmp_path / "broken.sql").write_text("SELECT (", encoding="utf-8")
+    with ParseCache(tmp_path / "parse_cache.sqlite3") as parse_cache:
+        first_lineage = extract_file_lineage(
+            tmp_path / "mart.sql", parse_cache=parse_cache
+        )
+
+        def _fail_parse(*_: object, **__: object) -> None:
+            raise AssertionError("unchanged files must not be parsed")
+
+        monkeypatch.setattr(sql_lineage_index.sqlglot, "parse", _fail_parse)
+
+        # Act
+        second_lineage = extract_file_lineage(
+            tmp_path / "mart.sql", parse_cache=parse_cache
+        )
+        monkeypatch.undo()
+        broken_lineage = extract_file_lineage(tmp_path / "broken.sql")
+
+    # Assert
+    assert second_lineage == first_lineage
+    assert second_lineage.lineages[0].target == "user_totals"
+    assert broken_lineage.error is not None
+
+
+def test_extract_file_lineage_records_unexpected_errors(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    # Arrange
+    _write_sql_files(tmp_path)
+
+    def exceed_recursion_limit(*_: object) -> None:
+        raise RecursionError("maximum recursion depth exceeded")
+
+    monkeypatch.setattr(
+        sql_lineage_index, "extract_column_lineage", exceed_recursion_limit
+    )
+
+    # Act
+    file_lineage = extract_file_lineage(tmp_path / "mart.sql")
+
+    # Assert
+    assert file_lineage.error == (
+        "RecursionError: maximum recursion depth exceeded"
+    )
+    assert file_lineage.lineages == []
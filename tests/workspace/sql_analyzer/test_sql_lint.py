@@ -0,0 +1,162 @@
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from pytest import MonkeyPatch
+
+from workspace.sql_analyzer import sql_lint
+from workspace.sql_analyzer.sql_analyzer import SQLAnalyzer
+from workspace.sql_analyzer.sql_lint import SQLLinter
+
+_REVIEW_SQL = """
+SELECT
+    o.user_id,
+    CASE
+        WHEN u.status = 'active' AND o.amount > 100 THEN 'active_high'
+        WHEN u.status = 'vip' THEN 'vip'
+        ELSE 'other'
+    END AS flag
+FROM orders o
+JOIN users u ON u.id = o.user_id
+WHERE (o.amount > 100 AND u.status = 'active')
+    OR u.status = 'vip'
+    OR o.priority = 'high'
+"""
+
+
+def test_linter_flags_or_heavy_predicates_repeated_in_case() -> None:
+    # Arrange
+    linter = SQLLinter()
+
+    # Act
+    (report,) = linter.lint_sql(_REVIEW_SQL)
+
+    # Assert
+    assert [finding.rule for finding in report.findings] == [
+        "or_heavy_predicate",
+        "case_repeats_where",
+        "case_repeats_where",
+    ]
+    assert report.findings[1].sql == "u.status = 'active' AND o.amount > 100"
+    assert report.complexity_score == report.structural_score + 9
+    assert report.to_dict()["complexity_score"] == report.complexity_score
+    (lenient_report,) = SQLLinter(or_predicate_threshold=3).lint_sql(
+        _REVIEW_SQL
+    )
+    assert lenient_report.findings[0].rule == "case_repeats_where"
+    with pytest.raises(ValueError, match="or_predicate_threshold"):
+        SQLLinter(or_predicate_threshold=0)
+
+
+def test_linter_detects_joins_predicates_ctes_and_subqueries() -> None:
+    # Arrange
+    linter = SQLLinter()
+    sql = """
+    SELECT * FROM a, b;
+    SELECT a.x FROM a, b WHERE a.id = b.a_id;
+    WITH c AS (SELECT * FROM t) SELECT x FROM c;
+    SELECT u.id FROM users u
+    WHERE LOWER(u.email) = 'x'
+        AND u.name LIKE '%son'
+        AND u.created_at >= '2024-01-01'
+        AND EXISTS (SELECT 1 FROM orders o WHERE o.user_id = u.id);
+    SELECT a FROM t WHERE a IN (SELECT b FROM u WHERE c = 1);
+    """
+
+    # Act
+    reports = linter.lint_sql(sql)
+
+    # Assert
+    assert [
+        [(finding.rule, finding.sql) for finding in report.findings]
+        for report in reports
+    ] == [
+        [("cartesian_join", ", b")],
+        [],
+        [("select_star_in_cte", "SELECT * FROM t")],
+        [
+            ("non_sargable_predicate", "LOWER(u.email) = 'x'"),
+            ("non_sargable_predicate", "u.name LIKE '%son'"),
+            (
+                "correlated_subquery",
+                "SELECT 1 FROM orders AS o WHERE o.user_id = u.id",
+            ),
+        ],
+        [],
+    ]
+
+
+def test_linter_flags_constant_joins_but_not_bare_column_predicates() -> None:
+    # Arrange
+    linter = SQLLinter()
+    sql = """
+    SELECT a.x FROM a JOIN b ON TRUE;
+    SELECT a.x FROM a JOIN b ON 1 = 1;
+    SELECT a.x FROM a JOIN b ON a.id = b.a_id WHERE a.x = b.y + 1;
+    SELECT a.x FROM a WHERE a.x + 1 = 2
+    """
+
+    # Act
+    reports = linter.lint_sql(sql)
+
+    # Assert
+    assert [
+        [(finding.rule, finding.sql) for finding in report.findings]
+        for report in reports
+    ] == [
+        [("cartesian_join", "JOIN b ON TRUE")],
+        [("cartesian_join", "JOIN b ON 1 = 1")],
+        [],
+        [("non_sargable_predicate", "a.x + 1 = 2")],
+    ]
+
+
+def test_linter_ranks_statements_across_files(tmp_path: Path) -> None:
+    # Arrange
+    (tmp_path / "review.sql").write_text(_REVIEW_SQL, encoding="utf-8")
+    (tmp_path / "simple.sql").write_text(
+        "SELECT 1; SELECT * FROM a, b", encoding="utf-8"
+    )
+    (tmp_path / "broken.sql").write_text("SELECT (", encoding="utf-8")
+    analyzer = SQLAnalyzer(_REVIEW_SQL)
+    output = StringIO()
+
+    # Act
+    ranked_statements = SQLLinter().rank(tmp_path, limit=2)
+    with redirect_stdout(output):
+        analyzer.analyze_lint()
+
+    # Assert
+    assert [
+        (Path(ranked.path).name, ranked.report.statement_index)
+        for ranked in ranked_statements
+    ] == [("review.sql", 0), ("simple.sql", 1)]
+    printed_lines = output.getvalue().splitlines()
+    assert printed_lines[1] == (
+        f"- Complexity score: {analyzer.lint().complexity_score}"
+    )
+    assert printed_lines[2].startswith("- [or_heavy_predicate] WHERE")
+
+
+def test_linter_records_unexpected_errors_per_file(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    # Arrange
+    (tmp_path / "review.sql").write_text(_REVIEW_SQL, encoding="utf-8")
+
+    def exceed_recursion_limit(*_: object) -> None:
+        raise RecursionError("maximum recursion depth exceeded")
+
+    monkeypatch.setattr(
+        sql_lint, "_find_correlated_subqueries", exceed_recursion_limit
+    )
+
+    # Act
+    (file_report,) = SQLLinter().iter_file_reports(tmp_path)
+
+    # Assert
+    assert file_report.error == (
+        "RecursionError: maximum recursion depth exceeded"
+    )
+    assert file_report.reports == []
@@ -0,0 +1,134 @@
+from pathlib import Path
+
+import pytest
+from pytest import MonkeyPatch
+
+from workspace.sql_analyzer import sql_batch_analyzer, sql_parse_cache
+from workspace.sql_analyzer.sql_analyzer import SQLAnalyzer
+from workspace.sql_analyzer.sql_batch_analyzer import (
+    SQLBatchAnalyzer,
+    analyze_sql_file,
+)
+from workspace.sql_analyzer.sql_parse_cache import (
+    ParseCache,
+    create_parse_cache_key,
+)
+
+_SQL = "SELECT o.id FROM orders o JOIN users u ON u.id = o.user_id"
+
+
+def test_parse_cache_reuses_syntax_trees_across_instances(
+    tmp_path: Path,
+) -> None:
+    # Arrange
+    cache_path = tmp_path / "parse_cache.sqlite3"
+    with ParseCache(cache_path) as first_cache:
+        first_analyzer = SQLAnalyzer(_SQL, parse_cache=first_cache)
+
+    # Act
+    with ParseCache(cache_path) as second_cache:
+        second_analyzer = SQLAnalyzer(_SQL, parse_cache=second_cache)
+        SQLAnalyzer(_SQL, read="mysql", parse_cache=second_cache)
+        stats = second_cache.stats()
+
+    # Assert
+    assert second_analyzer.analyze() == first_analyzer.analyze()
+    assert (stats.hit_count, stats.miss_count, stats.size) == (1, 1, 2)
+    assert create_parse_cache_key("syntax_tree", _SQL) != (
+        create_parse_cache_key("syntax_tree", _SQL, "postgres")
+    )
+
+
+def test_parse_cache_evicts_least_recently_used_entries(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    # Arrange
+    now = [1000.0]
+    monkeypatch.setattr(sql_parse_cache.time, "time", lambda: now[0])
+    parse_cache = ParseCache(
+        tmp_path / "parse_cache.sqlite3",
+        max_entries=2,
+        access_time_resolution_seconds=0.0,
+    )
+    parse_cache.put("test", "SELECT 1", 1)
+    now[0] += 1
+    parse_cache.put("test", "SELECT 2", 2)
+    now[0] += 1
+    parse_cache.get("test", "SELECT 1")
+    now[0] += 1
+
+    # Act
+    parse_cache.put("test", "SELECT 3", 3)
+
+    # Assert
+    assert parse_cache.get("test", "SELECT 1") == 1
+    assert parse_cache.get("test", "SELECT 2") is None
+    assert parse_cache.get("test", "SELECT 3") == 3
+    assert parse_cache.stats().eviction_count == 1
+    with pytest.raises(ValueError, match="None"):
+        parse_cache.put("test", "SELECT 4", None)
+    with pytest.raises(ValueError, match="max_bytes"):
+        ParseCache(tmp_path / "invalid.sqlite3", max_bytes=0)
+    parse_cache.close()
+
+
+def test_parse_cache_tracks_totals_and_evicts_by_bytes(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    # Arrange
+    now = [1000.0]
+    monkeypatch.setattr(sql_parse_cache.time, "time", lambda: now[0])
+    cache_path = tmp_path / "parse_cache.sqlite3"
+    parse_cache = ParseCache(cache_path, max_bytes=2500)
+    for sql in ["SELECT 1", "SELECT 2", "SELECT 3"]:
+        parse_cache.put("test", sql, "x" * 600)
+        now[0] += 1
+    parse_cache.put("test", "SELECT 1", "x" * 100)
+    now[0] += 1
+
+    # Act
+    parse_cache.put("test", "SELECT 4", "x" * 1200)
+    stats = parse_cache.stats()
+    parse_cache.close()
+
+    # Assert
+    with ParseCache(cache_path) as reopened_cache:
+        assert reopened_cache.get("test", "SELECT 2") is None
+        assert reopened_cache.get("test", "SELECT 3") == "x" * 600
+        assert reopened_cache.get("test", "SELECT 1") == "x" * 100
+        reopened_stats = reopened_cache.stats()
+    assert (stats.size, stats.eviction_count) == (3, 1)
+    assert stats.total_bytes <= 2500
+    assert (reopened_stats.size, reopened_stats.total_bytes) == (
+        stats.size,
+        stats.total_bytes,
+    )
+
+
+def test_batch_analyzer_skips_parsing_unchanged_files(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    # Arrange
+    cache_path = tmp_path / "parse_cache.sqlite3"
+    source_directory = tmp_path / "sql"
+    source_directory.mkdir()
+    (source_directory / "orders.sql").write_text(_SQL, encoding="utf-8")
+    SQLBatchAnalyzer(max_workers=1, parse_cache_path=cache_path).write_jsonl(
+        source_directory, tmp_path / "analysis.jsonl"
+    )
+
+    def _fail_parse(*_: object, **__: object) -> None:
+        raise AssertionError("unchanged files must not be parsed")
+
+    monkeypatch.setattr(sql_batch_analyzer.sqlglot, "parse", _fail_parse)
+
+    # Act
+    with ParseCache(cache_path) as parse_cache:
+        file_analysis = analyze_sql_file(
+            source_directory / "orders.sql", parse_cache=parse_cache
+        )
+
+    # Assert
+    (statement,) = file_analysis.statements
+    assert statement.joins[0].condition == "u.id = o.user_id"
+    assert file_analysis.analysis_seconds == 0.0
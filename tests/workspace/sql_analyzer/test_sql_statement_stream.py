@@ -0,0 +1,90 @@
+from pathlib import Path
+
+from workspace.sql_analyzer.sql_statement_stream import (
+    StreamingSQLAnalyzer,
+    split_sql_statements,
+)
+
+_POSTGRES_DUMP = """
+SELECT ';' AS a, "x;y" FROM t -- trailing; comment
+; /* block ; comment */ INSERT INTO t VALUES ('it''s;', 'café');
+CREATE FUNCTION f() RETURNS INT AS $body$
+BEGIN RETURN 1; END;
+$body$ LANGUAGE plpgsql;
+SELECT $$a;b$$;
+   ;
+""".encode()
+
+
+def test_split_sql_statements_ignores_quoted_and_commented_semicolons() -> (
+    None
+):
+    # Arrange / Act
+    statements = list(split_sql_statements(_POSTGRES_DUMP, "postgres"))
+
+    # Assert
+    assert [statement.sql.strip() for statement in statements] == [
+        "SELECT ';' AS a, \"x;y\" FROM t -- trailing; comment",
+        "/* block ; comment */ INSERT INTO t VALUES ('it''s;', 'café')",
+        "CREATE FUNCTION f() RETURNS INT AS $body$\nBEGIN RETURN 1; END;\n"
+        "$body$ LANGUAGE plpgsql",
+        "SELECT $$a;b$$",
+    ]
+    insert_statement = statements[1]
+    assert (
+        _POSTGRES_DUMP[
+            insert_statement.start_offset : insert_statement.end_offset
+        ]
+        == insert_statement.sql.encode()
+    )
+
+
+def test_split_sql_statements_follows_dialect_quoting_rules() -> None:
+    # Arrange
+    mysql_dump = b"SELECT 'a\\';b' FROM `x;y`; SELECT 2 # comment;\n"
+    tsql_dump = b"SELECT [a;b] FROM t; SELECT 'C:\\'; SELECT 3"
+
+    # Act
+    mysql_statements = list(split_sql_statements(mysql_dump, "mysql"))
+    tsql_statements = list(split_sql_statements(tsql_dump, "tsql"))
+
+    # Assert
+    assert [statement.sql.strip() for statement in mysql_statements] == [
+        "SELECT 'a\\';b' FROM `x;y`",
+        "SELECT 2 # comment;",
+    ]
+    assert [statement.sql.strip() for statement in tsql_statements] == [
+        "SELECT [a;b] FROM t",
+        "SELECT 'C:\\'",
+        "SELECT 3",
+    ]
+
+
+def test_streaming_analyzer_yields_analyses_lazily(tmp_path: Path) -> None:
+    # Arrange
+    dump_path = tmp_path / "dump.sql"
+    dump_path.write_bytes(
+        _POSTGRES_DUMP + b"SELECT (;\nDELETE FROM t WHERE id = 1;\n"
+    )
+    (tmp_path / "empty.sql").write_bytes(b"")
+    streaming_analyzer = StreamingSQLAnalyzer("postgres")
+
+    # Act
+    streamed_analyses = list(streaming_analyzer.iter_analyses(dump_path))
+    lazy_analyses = streaming_analyzer.iter_analyses(dump_path)
+    first_analysis = next(lazy_analyses)
+    lazy_analyses.close()
+
+    # Assert
+    assert [
+        None
+        if streamed_analysis.analysis is None
+        else streamed_analysis.analysis.statement_type
+        for streamed_analysis in streamed_analyses
+    ] == ["select", "insert", "create", "select", None, "delete"]
+    assert streamed_analyses[4].error is not None
+    assert streamed_analyses[5].to_dict()["analysis"]["statement_index"] == 4
+    assert streamed_analyses[5].analysis is not None
+    assert streamed_analyses[5].analysis.wheres == ["id = 1"]
+    assert first_analysis == streamed_analyses[0]
+    assert list(streaming_analyzer.iter_analyses(tmp_path / "empty.sql")) == []